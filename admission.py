@@ -0,0 +1,142 @@
+"""
+Admission control pentru endpoint-urile scumpe ale API-ului (agent: YouTube + Gemini).
+
+Fără limite, un vârf de trafic pornea oricâte analize simultan: quota se epuiza și
+latența tuturor cererilor creștea împreună. Acum o cerere trece prin:
+
+  1. token bucket per client (X-Client-Id sau IP): peste rată -> 429 + Retry-After;
+  2. răspunsurile deja calculate (`AnswerCache`, fără niciun apel extern) sar peste limită și coadă;
+  3. limita de cereri în lucru (`max_inflight`); peste ea cererea așteaptă într-o coadă scurtă
+     (`max_queue` locuri, cel mult `queue_timeout` secunde). Stilurile cu rezultatul YouTube
+     proaspăt în `tool_cache` (doar apeluri Gemini) au o bandă separată, tot limitată
+     (`STYLX_CACHED_INFLIGHT`), ca să nu aștepte în spatele cererilor care cheamă YouTube;
+  4. coadă plină sau timeout -> 503 imediat, cu Retry-After estimat din durata medie.
+
+Cererile admise au deci latența serviciului la `max_inflight` cereri simultane, nu la
+toată suprasarcina; restul primesc repede un răspuns din care clientul știe când să revină.
+Controller-ul și bucket-urile sunt per proces (asyncio), apelate din handler-ele async ale
+FastAPI: cu N workeri gunicorn, limitele efective sunt de N ori mai mari (nu sunt globale).
+
+Configurare (env):
+  STYLX_MAX_INFLIGHT     cereri scumpe simultane (default 8)
+  STYLX_MAX_QUEUE        cereri care pot aștepta un loc (default 16)
+  STYLX_CACHED_INFLIGHT  cereri simultane cu rezultat de tool în cache (default 8; coadă STYLX_MAX_QUEUE)
+  STYLX_QUEUE_TIMEOUT    secunde de așteptare în coadă (default 5)
+  STYLX_CLIENT_RATE      cereri / secundă per client (default 1)
+  STYLX_CLIENT_BURST     rafală permisă per client (default 5)
+  STYLX_MAX_QUEUED_JOBS  job-uri în așteptare peste care POST /jobs e refuzat (default 200)
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from instrumentation import incr, observe
+
+MAX_INFLIGHT = int(os.getenv("STYLX_MAX_INFLIGHT", "8"))
+MAX_QUEUE = int(os.getenv("STYLX_MAX_QUEUE", "16"))
+CACHED_INFLIGHT = int(os.getenv("STYLX_CACHED_INFLIGHT", "8"))
+QUEUE_TIMEOUT = float(os.getenv("STYLX_QUEUE_TIMEOUT", "5"))
+CLIENT_RATE = float(os.getenv("STYLX_CLIENT_RATE", "1"))
+CLIENT_BURST = float(os.getenv("STYLX_CLIENT_BURST", "5"))
+MAX_QUEUED_JOBS = int(os.getenv("STYLX_MAX_QUEUED_JOBS", "200"))
+MAX_CLIENTS = 10000  # bucket-uri păstrate (LRU)
+
+
+class Rejected(Exception):
+    """Cerere refuzată de admission control; `status` 429 (rată) sau 503 (suprasarcină)."""
+
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class ClientBuckets:
+    """Token bucket per client: `rate` tokeni / secundă, maxim `burst`."""
+
+    def __init__(self, rate: float = CLIENT_RATE, burst: float = CLIENT_BURST, max_clients: int = MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()  # client -> [tokeni, ultima actualizare]
+
+    def take(self, client: str):
+        """Consumă un token sau ridică Rejected(429) cu timpul până la următorul token."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(client, None) or [self.burst, now]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets[client] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            wait = (1 - bucket[0]) / self.rate
+        incr("requests_shed", reason="client_rate")
+        raise Rejected(429, "Client rate limit exceeded", wait)
+
+
+class AdmissionController:
+    """Limita (per proces) de cereri scumpe în lucru, cu o coadă scurtă și shedding pe lungimea ei."""
+
+    def __init__(self, max_inflight: int = MAX_INFLIGHT, max_queue: int = MAX_QUEUE, queue_timeout: float = QUEUE_TIMEOUT):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.waiting = 0
+        self.avg_seconds = 1.0  # medie exponențială a duratei unei cereri admise
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def retry_after(self) -> float:
+        """Cât ar dura golirea cozii curente la capacitatea actuală."""
+        return (self.waiting + 1) / max(self.max_inflight, 1) * self.avg_seconds
+
+    @asynccontextmanager
+    async def admit(self, route: str):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            incr("requests_shed", reason="queue_full", route=route)
+            raise Rejected(503, "Server overloaded", self.retry_after())
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            incr("requests_shed", reason="queue_timeout", route=route)
+            raise Rejected(503, "Server overloaded", self.retry_after())
+        finally:
+            self.waiting -= 1
+        observe(f"admission.wait {route}", time.perf_counter() - queued_at)
+
+        self.inflight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+            self.avg_seconds = 0.9 * self.avg_seconds + 0.1 * (time.perf_counter() - start)
+            incr("requests_admitted", route=route)
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "avg_seconds": round(self.avg_seconds, 3),
+        }
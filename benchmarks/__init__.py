@@ -0,0 +1 @@
+"""Benchmark-uri pentru pipeline-ul de trenduri (rulează din rădăcina proiectului cu `python -m benchmarks.<nume>`)."""
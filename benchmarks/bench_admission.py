@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test de încărcare pentru admission control (`admission.py`), contra stand-in-ului local.
+
+Upstream-ul (Gemini REST prin `http_standin`) are capacitate limitată (`--capacity` răspunsuri
+simultane, `--latency-ms` fiecare), iar cererile sosesc în buclă deschisă cu `--rate` pe
+secundă, peste capacitate. Aceeași sarcină rulează de două ori:
+
+  unbounded  - fiecare cerere merge direct la upstream (comportamentul fără admission control)
+  admission  - ClientBuckets + AdmissionController, ca în `fashion_youtube_api`; o fracțiune
+               `--cache-hit-rate` din cereri sunt cache hits și sar peste limită
+
+Se raportează p50 / p99 pentru cererile servite, cât de repede primesc răspuns cele refuzate
+(503 / 429) și goodput-ul.
+
+  python -m benchmarks.bench_admission
+  python -m benchmarks.bench_admission --rate 120 --capacity 8 --latency-ms 200 --seconds 15
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from admission import AdmissionController, ClientBuckets, Rejected
+from gemini_client import GeminiClient
+from http_standin import StandIn, serve_in_thread
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _load(opts, base_url: str, controlled: bool) -> Dict:
+    client = GeminiClient("bench", base_url=f"{base_url}/v1", pool_size=1024, max_retries=0)
+    executor = ThreadPoolExecutor(1024)
+    loop = asyncio.get_running_loop()
+    admission = AdmissionController(opts.max_inflight, opts.max_queue, opts.queue_timeout)
+    buckets = ClientBuckets(opts.client_rate, opts.client_burst)
+    rng = random.Random(opts.seed)
+    served: List[float] = []
+    hits: List[float] = []
+    shed: List[float] = []
+    outcomes: Counter = Counter()
+
+    async def one(i: int, client_id: str, cache_hit: bool):
+        start = time.perf_counter()
+        try:
+            if controlled:
+                buckets.take(client_id)
+                if cache_hit:
+                    hits.append(time.perf_counter() - start)
+                    outcomes["cache_hit"] += 1
+                    return
+                async with admission.admit("bench"):
+                    await loop.run_in_executor(executor, client.generate, f"Analiza #{i}", "gemini-2.5-flash")
+            elif cache_hit:
+                hits.append(time.perf_counter() - start)
+                outcomes["cache_hit"] += 1
+                return
+            else:
+                await loop.run_in_executor(executor, client.generate, f"Analiza #{i}", "gemini-2.5-flash")
+        except Rejected as exc:
+            shed.append(time.perf_counter() - start)
+            outcomes[exc.status] += 1
+            return
+        except Exception:
+            outcomes["error"] += 1
+            return
+        served.append(time.perf_counter() - start)
+        outcomes[200] += 1
+
+    tasks = []
+    start = time.perf_counter()
+    total = int(opts.rate * opts.seconds)
+    for i in range(total):
+        # sosiri Poisson; clientul "hot" trimite --hot-share din trafic
+        await asyncio.sleep(rng.expovariate(opts.rate))
+        client_id = "hot" if rng.random() < opts.hot_share else f"client-{rng.randrange(opts.clients)}"
+        tasks.append(asyncio.create_task(one(i, client_id, rng.random() < opts.cache_hit_rate)))
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+    executor.shutdown(wait=False)
+    client.close()
+    return {"served": served, "hits": hits, "shed": shed, "outcomes": outcomes, "seconds": seconds}
+
+
+def _report(name: str, r: Dict):
+    o = r["outcomes"]
+    print(
+        f"  {name:<10} served {o[200]:>5} ({o[200] / r['seconds']:.1f}/s) | "
+        f"p50 {_percentile(r['served'], 0.5) * 1000:>6.0f} ms | p99 {_percentile(r['served'], 0.99) * 1000:>6.0f} ms | "
+        f"cache hits {o['cache_hit']} (p99 {_percentile(r['hits'], 0.99) * 1000:.1f} ms) | "
+        f"503 {o[503]} / 429 {o[429]} (p99 {_percentile(r['shed'], 0.99) * 1000:.0f} ms) | errors {o['error']}"
+    )
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Overload test for admission control against the replay stand-in")
+    p.add_argument("--rate", type=float, default=100, help="Offered load, requests/s (default: 100)")
+    p.add_argument("--seconds", type=float, default=10, help="Test duration (default: 10)")
+    p.add_argument("--capacity", type=int, default=8, help="Upstream concurrent responses (default: 8)")
+    p.add_argument("--latency-ms", type=float, default=200, help="Upstream latency per response (default: 200)")
+    p.add_argument("--max-inflight", type=int, default=8)
+    p.add_argument("--max-queue", type=int, default=16)
+    p.add_argument("--queue-timeout", type=float, default=2.0)
+    p.add_argument("--clients", type=int, default=50, help="Distinct well-behaved clients (default: 50)")
+    p.add_argument("--hot-share", type=float, default=0.2, help="Traffic share of one abusive client (default: 0.2)")
+    p.add_argument("--client-rate", type=float, default=1.0)
+    p.add_argument("--client-burst", type=float, default=5.0)
+    p.add_argument("--cache-hit-rate", type=float, default=0.2)
+    p.add_argument("--seed", type=int, default=42)
+    return p.parse_args()
+
+
+def main():
+    opts = parse_args()
+    os.environ.setdefault("GOOGLE_API_KEY", "bench")
+    cassettes = tempfile.mkdtemp()
+    standin = StandIn(
+        "replay",
+        cassette_dir=cassettes,
+        latency_ms=opts.latency_ms,
+        synthetic=True,
+        capacity=opts.capacity,
+    )
+    server, base_url = serve_in_thread(standin)
+    capacity_rps = opts.capacity / (opts.latency_ms / 1000)
+    print(
+        f"Offered {opts.rate:g} req/s for {opts.seconds:g}s; upstream capacity ~{capacity_rps:.0f} req/s "
+        f"({opts.capacity} x {opts.latency_ms:g} ms); admission: {opts.max_inflight} in flight, "
+        f"queue {opts.max_queue}, {opts.client_rate:g} req/s per client (burst {opts.client_burst:g})"
+    )
+    try:
+        for name, controlled in (("unbounded", False), ("admission", True)):
+            _report(name, asyncio.run(_load(opts, base_url, controlled)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(cassettes, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Scalarea clusterizării de aliasuri (`trend_aliases`) pe sute de mii de nume brute distincte.
+
+Se generează nume de bază aleatoare ("vibrakocore", "sheer dalu") și variante tipice de LLM
+("... trend", plural, "... aesthetic", cratimă, typo). Se raportează timpul primei rulări
+(toate numele noi), al unei rulări incrementale (1% nume noi), puritatea clusterelor și
+cât din variante / typo-uri ajung în clusterul formei de bază.
+
+  python -m benchmarks.bench_aliases                 # 200k nume
+  python -m benchmarks.bench_aliases --names 500000
+"""
+import argparse
+import random
+import sqlite3
+import time
+from collections import Counter, defaultdict
+
+from benchmarks.synthetic_data import FASHION_TERMS, NEW_AESTHETICS
+from trend_aliases import DEFAULT_THRESHOLD, resolve_aliases
+
+ADJECTIVES = [
+    "oversized", "cropped", "boxy", "sheer", "baggy", "slouchy", "tailored", "pleated", "quilted", "ruched",
+    "linen", "leather", "denim", "satin", "velvet", "suede", "mesh", "knit", "wool", "corduroy",
+    "cherry", "butter", "mocha", "sage", "cobalt", "burgundy", "chrome", "pastel", "neon", "ivory",
+]
+NOUNS = [
+    "blazer", "trench", "cardigan", "maxi skirt", "midi dress", "cargo pant", "loafer", "ballet flat", "mule",
+    "tote", "vest", "corset", "bomber", "kilt", "jumpsuit", "scarf", "beanie", "boot", "sneaker", "jort",
+]
+SYLLABLES = [
+    "ba", "ko", "mi", "ra", "te", "lu", "so", "ne", "vi", "da", "fe", "go", "ha", "ji", "ka", "lo", "mo", "nu",
+    "pa", "qui", "ri", "sa", "to", "ul", "ve", "wa", "xi", "yo", "ze", "bri", "cla", "dro", "fle", "gru",
+]
+VARIANTS = ["{}", "{} trend", "{}s", "{} aesthetic", "{} style", "the {} look"]
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+
+
+def generate_names(count: int, seed: int = 42):
+    """(mention_counts, nume -> grup de bază) cu ~`count` nume distincte."""
+    rng = random.Random(seed)
+    bases = {t for t in FASHION_TERMS + NEW_AESTHETICS}
+    while len(bases) * (len(VARIANTS) + 1) < count:
+        # Cuvânt nou inventat (ca "mermaidcore" la apariție) + opțional un adjectiv / o piesă
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        roll = rng.random()
+        if roll < 0.3:
+            bases.add(f"{word}core")
+        elif roll < 0.65:
+            bases.add(f"{rng.choice(ADJECTIVES)} {word}")
+        else:
+            bases.add(f"{word} {rng.choice(NOUNS)}")
+    counts: Counter = Counter()
+    group = {}
+    for base in sorted(bases):
+        for template in VARIANTS:
+            name = template.format(base)
+            counts[name] += rng.randint(1, 20)
+            group[name] = base
+        typo = _typo(rng, base)
+        counts[typo] += 1
+        group[typo] = base
+        if len(counts) >= count:
+            break
+    return dict(counts), group
+
+
+def purity(mapping, group) -> float:
+    """Fracțiunea de nume al căror cluster conține în majoritate același grup de bază."""
+    clusters = defaultdict(list)
+    for name, canonical in mapping.items():
+        clusters[canonical].append(group[name])
+    pure = sum(Counter(members).most_common(1)[0][1] for members in clusters.values())
+    return pure / len(mapping)
+
+
+def recall(mapping, group, names) -> float:
+    """Fracțiunea din `names` ajunsă în același cluster cu forma de bază a trendului."""
+    names = list(names)
+    return sum(1 for n in names if mapping[n] == mapping[group[n]]) / len(names)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark MinHash/LSH trend alias clustering")
+    p.add_argument("--names", type=int, default=200_000, help="Distinct raw trend names (default: 200000)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Jaccard merge threshold")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    counts, group = generate_names(args.names, args.seed)
+    names = list(counts)
+    holdout = set(names[:: 100])
+    first_batch = {n: c for n, c in counts.items() if n not in holdout}
+
+    conn = sqlite3.connect(":memory:")
+    start = time.perf_counter()
+    first = resolve_aliases(conn, first_batch, args.threshold)
+    first_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mapping = resolve_aliases(conn, counts, args.threshold)
+    incremental_seconds = time.perf_counter() - start
+
+    clusters = len(set(mapping.values()))
+    print(f"Names: {len(counts):,} distinct raw names from {len(set(group.values())):,} base trends")
+    print(f"  first run:        {first_seconds:>7.1f}s ({len(first) / first_seconds:,.0f} names/s)")
+    print(f"  incremental (1%): {incremental_seconds:>7.1f}s for {len(holdout):,} new names")
+    typos = [n for n in counts if not any(n == t.format(group[n]) for t in VARIANTS)]
+    variants = [n for n in counts if n != group[n] and n not in set(typos)]
+    print(f"  clusters: {clusters:,} | purity: {purity(mapping, group):.1%}")
+    print(
+        f"  merged with base form: variants {recall(mapping, group, variants):.1%}, "
+        f"typos {recall(mapping, group, typos):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Verifică faptul că cititorii nu se blochează pe scriitorul de ingestie.
+
+Un thread scrie continuu videouri sintetice (tranzacții de `--batch` rânduri) în timp ce
+`--readers` thread-uri rulează interogările din view_trends. Se raportează latența
+citirilor (p50 / p99 / max) și erorile "database is locked".
+
+  python -m benchmarks.bench_concurrency                # db_connection (WAL + read-only readers)
+  python -m benchmarks.bench_concurrency --legacy       # sqlite3.connect default (rollback journal)
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import List
+
+from benchmarks.synthetic_data import cached_database, generate_videos, video_row
+from db_connection import connect_reader, connect_writer
+
+READ_QUERIES = (
+    "SELECT name, score, num_videos, total_views, avg_views FROM trends ORDER BY score DESC LIMIT 20",
+    "SELECT COUNT(*), MAX(publish_date) FROM videos",
+)
+
+
+def _legacy_connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    return conn
+
+
+def writer_loop(db_path: str, legacy: bool, batch: int, stop: threading.Event, stats: dict):
+    conn = _legacy_connect(db_path) if legacy else connect_writer(db_path)
+    rows = generate_videos(10**9, seed=7)
+    while not stop.is_set():
+        chunk = [video_row(next(rows)) for _ in range(batch)]
+        try:
+            conn.executemany("INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", chunk)
+            conn.commit()
+            stats["written"] += len(chunk)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            stats["write_errors"] += 1
+    conn.close()
+
+
+def reader_loop(db_path: str, legacy: bool, stop: threading.Event, latencies: List[float], stats: dict):
+    conn = _legacy_connect(db_path) if legacy else connect_reader(db_path)
+    while not stop.is_set():
+        for query in READ_QUERIES:
+            start = time.perf_counter()
+            try:
+                conn.execute(query).fetchall()
+                latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                stats["read_errors"] += 1
+    conn.close()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Measure reader latency while an ingestion writer is active")
+    p.add_argument("--rows", type=int, default=100000, help="Synthetic database size (default: 100000)")
+    p.add_argument("--data-dir", default="bench_data", help="Where synthetic databases are cached (default: bench_data)")
+    p.add_argument("--readers", type=int, default=4, help="Reader threads (default: 4)")
+    p.add_argument("--batch", type=int, default=500, help="Rows per writer transaction (default: 500)")
+    p.add_argument("--seconds", type=float, default=10, help="Duration (default: 10)")
+    p.add_argument("--legacy", action="store_true", help="Use plain sqlite3.connect with the rollback journal")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "concurrency.db")
+        shutil.copyfile(cached_database(args.data_dir, args.rows), db_path)
+        setup = connect_writer(db_path)
+        setup.execute(
+            "CREATE TABLE IF NOT EXISTS trends (name TEXT PRIMARY KEY, score REAL, num_videos INTEGER, "
+            "total_views INTEGER, avg_views REAL, first_seen_at TEXT, last_seen_at TEXT, detected_at TEXT)"
+        )
+        if args.legacy:
+            setup.execute("PRAGMA journal_mode = DELETE")
+        setup.commit()
+        setup.close()
+
+        stop = threading.Event()
+        stats = {"written": 0, "write_errors": 0, "read_errors": 0}
+        latencies: List[float] = []
+        threads = [threading.Thread(target=writer_loop, args=(db_path, args.legacy, args.batch, stop, stats))]
+        threads += [
+            threading.Thread(target=reader_loop, args=(db_path, args.legacy, stop, latencies, stats))
+            for _ in range(args.readers)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    mode = "legacy (rollback journal)" if args.legacy else "db_connection (WAL)"
+    print(f"Mode: {mode}")
+    print(f"  writer: {stats['written']:,} rows, {stats['write_errors']} errors")
+    print(f"  reads:  {len(latencies):,} ok, {stats['read_errors']} 'database is locked' errors")
+    print(
+        f"  read latency ms: p50={_percentile(latencies, 0.5) * 1000:.2f} "
+        f"p99={_percentile(latencies, 0.99) * 1000:.2f} max={max(latencies or [0]) * 1000:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline, determinist, pentru ingestie și apelurile agentului / newsletter-ului,
+prin `http_standin` în modul replay (cassette-uri înregistrate și/sau răspunsuri sintetice).
+
+  ingestion  - `youtube_to_sqlite.run` cu `--queries` query-uri într-un DB temporar; erorile
+               injectate sunt reîncercate (youtube_retry, Retry-After), iar un crawl rămas
+               incomplet oprește benchmark-ul
+  gemini     - `GeminiClient.generate` (același client ca `call_gemini`), `--requests` cereri
+               pe `--concurrency` thread-uri; erorile injectate testează retry-ul
+  agent_tool - `get_fashion_youtube_trends` + tokenii payload-ului complet vs compact
+               (necesită dependențele agentului)
+
+Latența și erorile sunt injectate de stand-in, deci rezultatele sunt comparabile între
+commit-uri fără chei și fără rețea.
+
+  python -m benchmarks.bench_replay
+  python -m benchmarks.bench_replay --latency-ms 120 --jitter-ms 60 --error-rate 0.05
+  python -m benchmarks.bench_replay --cassettes cassettes/ --no-synthetic   # doar răspunsuri înregistrate
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Cheile sunt cerute la import; stand-in-ul nu le verifică
+os.environ.setdefault("YOUTUBE_API_KEY", "replay")
+os.environ.setdefault("GOOGLE_API_KEY", "replay")
+
+from crawl_checkpoints import CrawlCheckpoints
+from gemini_client import GeminiClient, GeminiError
+from http_standin import StandIn, serve_in_thread
+
+SUITES = ["ingestion", "gemini", "agent_tool"]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _latency_summary(latencies: List[float]) -> str:
+    return (
+        f"p50 {_percentile(latencies, 0.5) * 1000:.0f} ms | p99 {_percentile(latencies, 0.99) * 1000:.0f} ms | "
+        f"max {max(latencies, default=0) * 1000:.0f} ms"
+    )
+
+
+def bench_ingestion(opts) -> Dict:
+    import youtube_to_sqlite
+
+    queries = [f"fashion query {i}" for i in range(opts.queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "replay.db")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            youtube_to_sqlite.run(queries, [], db_path, max_per_query=opts.max)
+        seconds = time.perf_counter() - start
+        conn = youtube_to_sqlite.init_db(db_path)
+        rows = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        incomplete = CrawlCheckpoints(conn).has_crawl()
+        conn.close()
+    if incomplete:
+        # Un crawl parțial ar raporta un videos/s fără sens: erorile au rămas după toate retry-urile
+        raise SystemExit(f"  ingestion: crawl ended incomplete ({rows:,} videos stored); benchmark invalid")
+    print(f"  ingestion: {rows:,} videos from {len(queries)} queries in {seconds:.2f}s ({rows / seconds:,.0f} videos/s)")
+    return {"rows": rows, "seconds": seconds}
+
+
+def bench_gemini(opts, base_url: str) -> Dict:
+    client = GeminiClient("replay", base_url=f"{base_url}/v1", pool_size=opts.concurrency, backoff=0.05)
+    latencies: List[float] = []
+    failures = 0
+
+    def one(i: int):
+        start = time.perf_counter()
+        client.generate(f"Newsletter prompt #{i}", "gemini-2.5-flash")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(opts.concurrency) as pool:
+        for future in [pool.submit(one, i) for i in range(opts.requests)]:
+            try:
+                latencies.append(future.result())
+            except GeminiError:
+                failures += 1
+    seconds = time.perf_counter() - start
+    client.close()
+    print(
+        f"  gemini: {opts.requests} requests x{opts.concurrency} in {seconds:.2f}s "
+        f"({opts.requests / seconds:.1f} req/s) | {_latency_summary(latencies)} | failed {failures}"
+    )
+    return {"seconds": seconds, "p50": _percentile(latencies, 0.5), "p99": _percentile(latencies, 0.99), "failed": failures}
+
+
+def bench_agent_tool(opts) -> Dict:
+    try:
+        from fashion_youtube_agent_core import compact_tool_payload, estimate_tokens, get_fashion_youtube_trends
+    except ImportError as exc:
+        print(f"  agent_tool: skipped ({exc})")
+        return {}
+    styles = ["streetwear", "quiet luxury", "gorpcore", "y2k", "boho chic"]
+    latencies = []
+    full_tokens = compact_tokens = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(opts.requests):
+            start = time.perf_counter()
+            result = get_fashion_youtube_trends(styles[i % len(styles)])
+            latencies.append(time.perf_counter() - start)
+            full_tokens += estimate_tokens(json.dumps(result, ensure_ascii=False))
+            compact_tokens += estimate_tokens(json.dumps(compact_tool_payload(result), ensure_ascii=False))
+    print(
+        f"  agent_tool: {opts.requests} calls | {_latency_summary(latencies)} | "
+        f"payload ~{full_tokens / opts.requests:.0f} -> ~{compact_tokens / opts.requests:.0f} tokens (compact)"
+    )
+    return {
+        "p50": _percentile(latencies, 0.5),
+        "p99": _percentile(latencies, 0.99),
+        "payload_tokens": full_tokens / opts.requests,
+        "compact_payload_tokens": compact_tokens / opts.requests,
+    }
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Offline ingestion / Gemini benchmarks against the replay stand-in")
+    p.add_argument("--suites", nargs="*", choices=SUITES, default=SUITES)
+    p.add_argument("--cassettes", default=None, help="Cassette directory (default: empty temp dir)")
+    p.add_argument("--no-synthetic", action="store_true", help="Only serve recorded cassettes")
+    p.add_argument("--latency-ms", type=float, default=50, help="Injected latency per response (default: 50)")
+    p.add_argument("--jitter-ms", type=float, default=25, help="Injected random extra latency (default: 25)")
+    p.add_argument("--error-rate", type=float, default=0.02, help="Injected 503 rate (default: 0.02)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--queries", type=int, default=20, help="Ingestion: search queries (default: 20)")
+    p.add_argument("--max", type=int, default=100, help="Ingestion: videos per query (default: 100)")
+    p.add_argument("--requests", type=int, default=100, help="Gemini / agent tool requests (default: 100)")
+    p.add_argument("--concurrency", type=int, default=8, help="Gemini concurrent requests (default: 8)")
+    return p.parse_args()
+
+
+def main():
+    opts = parse_args()
+    with contextlib.ExitStack() as stack:
+        cassettes = opts.cassettes or stack.enter_context(tempfile.TemporaryDirectory())
+        standin = StandIn(
+            "replay",
+            cassette_dir=cassettes,
+            latency_ms=opts.latency_ms,
+            jitter_ms=opts.jitter_ms,
+            error_rate=opts.error_rate,
+            synthetic=not opts.no_synthetic,
+            seed=opts.seed,
+        )
+        server, base_url = serve_in_thread(standin)
+        stack.callback(server.shutdown)
+        os.environ["YOUTUBE_API_ROOT"] = base_url
+        os.environ["GEMINI_API_BASE_URL"] = f"{base_url}/v1"
+
+        print(
+            f"Replay stand-in {base_url}: latency {opts.latency_ms:g}+{opts.jitter_ms:g} ms, "
+            f"error rate {opts.error_rate:.0%}, seed {opts.seed}"
+        )
+        if "ingestion" in opts.suites:
+            bench_ingestion(opts)
+        if "gemini" in opts.suites:
+            bench_gemini(opts, base_url)
+        if "agent_tool" in opts.suites:
+            bench_agent_tool(opts)
+        print(f"  stand-in: {dict(sorted(standin.stats.items()))}")
+
+
+if __name__ == "__main__":
+    main()
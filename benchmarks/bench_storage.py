@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compară formatul clasic (tags JSON + descrieri brute) cu formatul compact din `video_storage`:
+mărimea fișierului și viteza lookup-ului după tag.
+
+  python -m benchmarks.bench_storage                 # 1M videouri sintetice
+  python -m benchmarks.bench_storage --rows 100000
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.synthetic_data import TAG_POOL, cached_database
+from video_storage import migrate, videos_with_tag
+
+LOOKUP_TAGS = TAG_POOL[:5]
+
+
+def _time_lookups(fn, repeat: int) -> float:
+    """Timp mediu (ms) per lookup."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for tag in LOOKUP_TAGS:
+            fn(tag)
+    return (time.perf_counter() - start) / (repeat * len(LOOKUP_TAGS)) * 1000
+
+
+def _table_sizes(conn: sqlite3.Connection) -> dict:
+    """MB per tabel/index (prin dbstat, dacă SQLite e compilat cu el)."""
+    try:
+        rows = conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY 2 DESC").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {name: size / 1e6 for name, size in rows if size >= 100_000}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Compare DB size and tag lookups: JSON tags vs normalized tags")
+    p.add_argument("--rows", type=int, default=1_000_000, help="Synthetic database size (default: 1000000)")
+    p.add_argument("--data-dir", default="bench_data", help="Where synthetic databases are cached (default: bench_data)")
+    p.add_argument("--repeat", type=int, default=3, help="Lookup repetitions per tag (default: 3)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    source = cached_database(args.data_dir, args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        compact_db = os.path.join(tmp, "compact.db")
+        shutil.copyfile(source, legacy_db)
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("VACUUM")
+        conn.close()
+        shutil.copyfile(legacy_db, compact_db)
+
+        start = time.perf_counter()
+        migrate(compact_db, compress_descriptions=True)
+        migrate_seconds = time.perf_counter() - start
+
+        legacy = sqlite3.connect(legacy_db)
+        compact = sqlite3.connect(compact_db)
+
+        def legacy_lookup(tag):
+            pattern = "%" + json.dumps(tag) + "%"
+            return [r[0] for r in legacy.execute("SELECT video_id FROM videos WHERE tags LIKE ?", (pattern,))]
+
+        # Aceleași rezultate în ambele formate
+        for tag in LOOKUP_TAGS:
+            assert sorted(legacy_lookup(tag)) == sorted(videos_with_tag(compact, tag)), tag
+
+        legacy_ms = _time_lookups(legacy_lookup, args.repeat)
+        compact_ms = _time_lookups(lambda tag: videos_with_tag(compact, tag), args.repeat)
+        legacy_size = os.path.getsize(legacy_db)
+        compact_size = os.path.getsize(compact_db)
+        compact_tables = _table_sizes(compact)
+        legacy.close()
+        compact.close()
+
+    print(f"Rows: {args.rows:,} (migration took {migrate_seconds:.1f}s)")
+    print(f"  DB size:     JSON {legacy_size / 1e6:>8.1f} MB | compact {compact_size / 1e6:>8.1f} MB "
+          f"({compact_size / legacy_size:.0%})")
+    print(f"  tag lookup:  JSON {legacy_ms:>8.2f} ms | compact {compact_ms:>8.2f} ms "
+          f"({legacy_ms / compact_ms if compact_ms else 0:.1f}x faster)")
+    if compact_tables:
+        print("  compact breakdown: " + ", ".join(f"{name} {mb:.1f} MB" for name, mb in compact_tables.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Măsoară scalarea `calculate_trends_simple --processes N` pe o bază de date existentă.
+
+Fiecare rulare lucrează pe o copie temporară a DB-ului (tabelul `trends` e rescris),
+iar output-ul scriptului e suprimat; se afișează doar timpii și speedup-ul față de 1 proces.
+
+Usage:
+  python -m benchmarks.bench_trend_processes --db youtube_videos.db
+  python -m benchmarks.bench_trend_processes --db big.db --max-processes 8 --repeat 3
+  python -m benchmarks.bench_trend_processes --rows 1000000    # DB sintetic (benchmarks.synthetic_data)
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic_data import cached_database
+from calculate_trends_simple import calculate_trends_simple
+
+
+def time_run(db_path: str, processes: int, repeat: int) -> float:
+    """Returnează cel mai bun timp (secunde) din `repeat` rulări."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            calculate_trends_simple(db_path=db_path, processes=processes)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark keyword extraction scaling across processes")
+    p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
+    p.add_argument("--rows", type=int, help="Use a synthetic database with this many videos instead of --db")
+    p.add_argument("--data-dir", default="bench_data", help="Where synthetic databases are cached (default: bench_data)")
+    p.add_argument("--max-processes", type=int, default=os.cpu_count() or 1, help="Highest process count to try (default: CPU count)")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per process count; best time is reported (default: 3)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = os.path.join(tmp, "bench.db")
+        source = cached_database(args.data_dir, args.rows) if args.rows else args.db
+        shutil.copyfile(source, db_copy)
+
+        print(f"{'processes':>9} | {'seconds':>8} | {'speedup':>7}")
+        baseline = None
+        for processes in range(1, args.max_processes + 1):
+            elapsed = time_run(db_copy, processes, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{processes:>9} | {elapsed:>8.3f} | {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmark-uri pentru ingestie, extragere, scoring și citiri pe date sintetice.
+
+Suite:
+  ingestion   - `youtube_to_sqlite.upsert_video` într-un DB gol (pe un eșantion, commit per rând)
+  extraction  - `calculate_trends_simple.extract_keywords_from_video` pe toate rândurile
+  scoring     - `calculate_trends_simple.calculate_trends_simple` pe DB-ul sintetic
+  reads       - `view_trends.view_trends` + `view_trend_details` (repetat)
+
+Rezultatele sunt scrise în JSON (cu commit-ul git curent) ca să poată fi comparate între commit-uri.
+
+Usage:
+  python -m benchmarks.run_benchmarks                           # 10k, 100k, 1M rânduri
+  python -m benchmarks.run_benchmarks --rows 10000 --suites scoring reads
+  python -m benchmarks.run_benchmarks --rows 100000 --compare bench_results/abc1234.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# `youtube_to_sqlite` cere cheia la import; benchmark-ul nu face niciun apel către API
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+
+from benchmarks.synthetic_data import GENERATOR_VERSION, cached_database, generate_videos
+from calculate_trends_simple import calculate_trends_simple, extract_keywords_from_video
+from view_trends import view_trend_details, view_trends
+from youtube_to_sqlite import init_db, upsert_video
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+SUITES = ["ingestion", "extraction", "scoring", "reads"]
+
+
+def _quiet(fn: Callable, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def bench_ingestion(rows: int, seed: int, db_path: str, opts) -> Dict:
+    sample = min(rows, opts.ingest_sample)
+    videos = list(generate_videos(sample, seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "ingest.db"))
+        start = time.perf_counter()
+        for v in videos:
+            upsert_video(conn, v)
+        elapsed = time.perf_counter() - start
+        conn.close()
+    return {"rows": sample, "seconds": elapsed}
+
+
+def bench_extraction(rows: int, seed: int, db_path: str, opts) -> Dict:
+    elapsed = 0.0
+    mentions = 0
+    chunk: List[Dict] = []
+
+    def run_chunk():
+        nonlocal elapsed, mentions
+        start = time.perf_counter()
+        for video in chunk:
+            mentions += len(extract_keywords_from_video(video))
+        elapsed += time.perf_counter() - start
+
+    # Generăm pe bucăți ca să nu ținem 1M dict-uri în memorie; doar extragerea e cronometrată
+    for v in generate_videos(rows, seed):
+        chunk.append(v)
+        if len(chunk) >= 10000:
+            run_chunk()
+            chunk = []
+    run_chunk()
+    return {"rows": rows, "seconds": elapsed, "mentions": mentions}
+
+
+def bench_scoring(rows: int, seed: int, db_path: str, opts) -> Dict:
+    start = time.perf_counter()
+    _quiet(
+        calculate_trends_simple,
+        db_path=db_path,
+        min_videos=1,
+        min_views=0,
+        max_views=10**15,
+        days_window=10**6,
+        processes=opts.processes,
+    )
+    return {"rows": rows, "seconds": time.perf_counter() - start, "processes": opts.processes}
+
+
+def bench_reads(rows: int, seed: int, db_path: str, opts) -> Dict:
+    # Citirile au nevoie de tabelul `trends` populat
+    _quiet(calculate_trends_simple, db_path=db_path, min_videos=1, min_views=0, max_views=10**15, days_window=10**6)
+    start = time.perf_counter()
+    for _ in range(opts.read_repeat):
+        _quiet(view_trends, db_path, 20, "json")
+        _quiet(view_trend_details, db_path, "streetwear")
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": elapsed, "calls": opts.read_repeat * 2}
+
+
+SUITE_FUNCS = {
+    "ingestion": bench_ingestion,
+    "extraction": bench_extraction,
+    "scoring": bench_scoring,
+    "reads": bench_reads,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(rows_list: List[int], suites: List[str], opts) -> Dict:
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": opts.seed,
+        "generator_version": GENERATOR_VERSION,
+        "results": [],
+    }
+    for rows in rows_list:
+        print(f"▶ {rows:,} rows: preparing synthetic database...")
+        db_path = cached_database(opts.data_dir, rows, opts.seed)
+        for suite in suites:
+            r = SUITE_FUNCS[suite](rows, opts.seed, db_path, opts)
+            r["suite"] = suite
+            r["rows_per_sec"] = r["rows"] / r["seconds"] if r["seconds"] else None
+            results["results"].append(r)
+            print(f"  {suite:<10} {r['rows']:>9,} rows  {r['seconds']:>9.3f}s")
+    return results
+
+
+def compare(current: Dict, previous: Dict):
+    """Afișează diferențele de timp față de un fișier de rezultate anterior."""
+    prev = {(r["suite"], r["rows"]): r for r in previous.get("results", [])}
+    print(f"\nComparison vs {previous.get('commit', '?')}:")
+    for r in current["results"]:
+        old = prev.get((r["suite"], r["rows"]))
+        if not old:
+            continue
+        delta = (r["seconds"] - old["seconds"]) / old["seconds"] * 100 if old["seconds"] else 0.0
+        print(f"  {r['suite']:<10} {r['rows']:>9,} rows  {old['seconds']:>9.3f}s -> {r['seconds']:>9.3f}s  ({delta:+.1f}%)")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run ingestion/extraction/scoring/read benchmarks on synthetic data")
+    p.add_argument("--rows", type=int, nargs="*", default=DEFAULT_ROWS, help="Dataset sizes (default: 10000 100000 1000000)")
+    p.add_argument("--suites", nargs="*", choices=SUITES, default=SUITES, help="Suites to run (default: all)")
+    p.add_argument("--seed", type=int, default=42, help="Synthetic data seed (default: 42)")
+    p.add_argument("--data-dir", default="bench_data", help="Where synthetic databases are cached (default: bench_data)")
+    p.add_argument("--output", help="Results JSON path (default: bench_results/<commit>.json)")
+    p.add_argument("--compare", help="Previous results JSON to compare against")
+    p.add_argument("--processes", type=int, default=1, help="Processes for the scoring suite (default: 1)")
+    p.add_argument("--ingest-sample", type=int, default=10000, help="Max rows upserted by the ingestion suite (default: 10000)")
+    p.add_argument("--read-repeat", type=int, default=200, help="Read iterations in the reads suite (default: 200)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = run_benchmarks(args.rows, args.suites, args)
+
+    output = args.output or os.path.join("bench_results", f"{results['commit']}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Generator determinist (seeded) de rânduri `videos` pentru benchmark-uri la scară de producție.
+
+Rândurile au forma returnată de `youtube_to_sqlite.fetch_video_details`: titluri cu
+termeni fashion amestecați cu zgomot, tags, publish dates concentrate în ultimele
+săptămâni și view counts cu distribuție log-normală (coadă lungă, câteva virale).
+
+Usage:
+  python -m benchmarks.synthetic_data --rows 100000 --db bench_data/videos_100k.db
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+from typing import Dict, Iterator, List
+
+from db_connection import connect_writer
+
+# Ancoră fixă ca datele să fie identice între rulări / commit-uri
+DEFAULT_ANCHOR = "2025-11-15T00:00:00+00:00"
+# Parte din cheia cache-ului `cached_database`: se incrementează la orice schimbare a rândurilor
+# generate, altfel benchmark-urile de pe commit-uri noi refolosesc DB-uri vechi din bench_data/
+GENERATOR_VERSION = 2
+
+FASHION_TERMS = [
+    "vintage fashion", "y2k fashion", "grunge", "cottagecore", "dark academia",
+    "clean girl", "mob wife", "quiet luxury", "old money", "preppy",
+    "mermaidcore", "harajuku", "boho chic", "balletcore", "coastal cowgirl",
+    "gorpcore", "athleisure", "streetwear", "indie sleaze", "techwear",
+    "pastel goth", "minimalist style", "maximalist style", "tomato girl",
+]
+NEW_AESTHETICS = ["office siren", "boho revival", "cherry red", "eclectic grandpa", "quiet outdoors"]
+FORMATS = [
+    "{term} outfit ideas", "how to style {term}", "{term} haul {year}", "{term} lookbook",
+    "{term} vs {other}", "is {term} over?", "{term} capsule wardrobe", "thrift flip: {term}",
+    "{term} try on haul", "my {term} era", "{term} on a budget", "GRWM {term} edition",
+]
+FILLER = [
+    "get ready with me", "vlog", "day in my life", "unboxing", "review", "shopping",
+    "makeup tutorial", "weekly reset", "room tour", "q&a", "storytime", "travel diary",
+]
+TAG_POOL = [
+    "fashion", "outfit", "style", "ootd", "haul", "lookbook", "trend", "thrift", "aesthetic",
+    "tiktok", "shopping", "wardrobe", "styling", "moda", "outfits", "fall", "winter", "summer",
+]
+CHANNELS = [f"Style Channel {i}" for i in range(500)]
+
+
+def _video_id(rng: random.Random) -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(11))
+
+
+def _title(rng: random.Random, year: int) -> str:
+    roll = rng.random()
+    if roll < 0.45:
+        # Coadă lungă: câțiva termeni apar mult mai des (distribuție Zipf aproximativă)
+        term = FASHION_TERMS[min(int(rng.paretovariate(1.2)) - 1, len(FASHION_TERMS) - 1)]
+    elif roll < 0.55:
+        term = rng.choice(NEW_AESTHETICS)
+    else:
+        return f"{rng.choice(FILLER)} #{rng.randint(1, 300)}"
+    fmt = rng.choice(FORMATS)
+    title = fmt.format(term=term, other=rng.choice(FASHION_TERMS), year=year)
+    return title.upper() if rng.random() < 0.1 else title.title()
+
+
+def _description(rng: random.Random, title: str, channel: str) -> str:
+    """Descriere: titlul, câteva rânduri libere și footer-ul fix al canalului (linkuri, hashtag-uri)."""
+    handle = channel.lower().replace(" ", "")
+    body = " ".join(rng.choice(FILLER + TAG_POOL) for _ in range(rng.randint(5, 60)))
+    footer = (
+        f"Follow me on Instagram @{handle} and TikTok @{handle}\n"
+        f"Business inquiries: {handle}@example.com\n"
+        f"Shop my looks: https://example.com/{handle}/shop\n"
+        f"#fashion #style #outfit #{handle}"
+    )
+    return f"{title}\n\n{body}\n\n{footer}" if rng.random() < 0.8 else body
+
+
+def _tags(rng: random.Random, title: str, year: int) -> List[str]:
+    """Tags ca pe YouTube: câteva generice, fraze derivate din titlu și câteva foarte specifice."""
+    tags = rng.sample(TAG_POOL, rng.randint(0, 6))
+    words = title.lower().split()
+    if len(words) >= 2:
+        tags.append(" ".join(words[:3]))
+        tags.append(f"{' '.join(words[:2])} {year}")
+    term = rng.choice(FASHION_TERMS)
+    tags += [f"{term} outfits", f"{term} aesthetic", f"how to dress {term}"][: rng.randint(0, 3)]
+    # Tags de nișă (coadă lungă, se repetă rar)
+    tags += [f"{rng.choice(TAG_POOL)} {rng.randint(1, 5000)}" for _ in range(rng.randint(0, 3))]
+    return tags
+
+
+def generate_videos(rows: int, seed: int = 42, anchor: str = DEFAULT_ANCHOR, span_days: int = 365) -> Iterator[Dict]:
+    """Generează `rows` dict-uri video, deterministe pentru același (seed, anchor)."""
+    rng = random.Random(seed)
+    anchor_dt = datetime.datetime.fromisoformat(anchor)
+    seen_ids = set()
+
+    for _ in range(rows):
+        vid = _video_id(rng)
+        while vid in seen_ids:
+            vid = _video_id(rng)
+        seen_ids.add(vid)
+
+        # Mai multe videouri recente: vârsta e exponențială, tăiată la span_days
+        age_days = min(rng.expovariate(1 / 45), span_days)
+        published = anchor_dt - datetime.timedelta(days=age_days, seconds=rng.randint(0, 86399))
+        views = int(min(rng.lognormvariate(9.5, 1.8), 50_000_000))
+        title = _title(rng, published.year)
+        channel = rng.choice(CHANNELS)
+
+        yield {
+            "video_id": vid,
+            "title": title,
+            "description": _description(rng, title, channel),
+            "channel": channel,
+            "url": f"https://www.youtube.com/watch?v={vid}",
+            "published_at": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "view_count": views,
+            "like_count": int(views * rng.uniform(0.005, 0.06)),
+            "tags": _tags(rng, title, published.year),
+        }
+
+
+def video_row(v: Dict) -> tuple:
+    """Tuplu în ordinea coloanelor din tabelul `videos`."""
+    return (
+        v["video_id"], v["title"], v["description"], v["channel"], v["url"], v["published_at"],
+        v["view_count"], v["like_count"], json.dumps(v["tags"]), v["published_at"],
+    )
+
+
+def build_database(db_path: str, rows: int, seed: int = 42, batch_size: int = 10000) -> str:
+    """Scrie un DB cu `rows` videouri sintetice (bulk insert, o tranzacție per batch)."""
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = connect_writer(db_path)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            title TEXT,
+            description TEXT,
+            channel TEXT,
+            url TEXT,
+            publish_date TEXT,
+            view_count INTEGER,
+            like_count INTEGER,
+            tags TEXT,
+            inserted_at TEXT
+        )
+        """
+    )
+    batch: List[tuple] = []
+    for v in generate_videos(rows, seed):
+        batch.append(video_row(v))
+        if len(batch) >= batch_size:
+            conn.executemany("INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            conn.commit()
+            batch = []
+    if batch:
+        conn.executemany("INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        conn.commit()
+    conn.close()
+    return db_path
+
+
+def cached_database(data_dir: str, rows: int, seed: int = 42) -> str:
+    """Returnează calea unui DB sintetic din `data_dir`, generându-l doar dacă lipsește."""
+    db_path = os.path.join(data_dir, f"videos_{rows}_seed{seed}_v{GENERATOR_VERSION}.db")
+    if not os.path.exists(db_path):
+        tmp_path = db_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        build_database(tmp_path, rows, seed)
+        os.replace(tmp_path, db_path)
+    return db_path
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Generate a synthetic `videos` database for benchmarks")
+    p.add_argument("--rows", type=int, default=10000, help="Number of videos to generate (default: 10000)")
+    p.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    p.add_argument("--db", required=True, help="Output SQLite database path")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    build_database(args.db, args.rows, args.seed)
+    print(f"✓ Wrote {args.rows:,} synthetic videos to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
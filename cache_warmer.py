@@ -0,0 +1,224 @@
+"""
+Încălzirea predictivă a cache-urilor agentului pentru stilurile aflate în trend.
+
+Primul utilizator care întreabă de un stil fierbinte plătea toată latența agentului
+(YouTube search + videos + Gemini). `CacheWarmer` rulează într-un thread de fundal al
+procesului FastAPI și, de fiecare dată când se schimbă rularea de trenduri
+(`trends_version`), citește top N din `trends` și precalculează:
+
+  - rezultatele `get_fashion_youtube_trends` în `tool_cache`, în limita unui buget de quota
+    YouTube per rulare de trenduri (search 100 + videos 1 unități per stil); stilurile deja
+    proaspete în cache nu consumă quota;
+  - opțional, răspunsurile agentului (`AnswerCache`) din rezultatele de tool deja încălzite,
+    deci fără quota YouTube în plus (doar apeluri Gemini).
+
+Warm hit = cerere servită dintr-o intrare pusă de warmer; `CacheWarmer.stats()` (expus la
+`GET /cache/stats`) raportează rata lor.
+
+Configurare (env):
+  STYLX_WARM_TOP       câte trenduri se încălzesc (default 10; 0 = warmer oprit)
+  STYLX_WARM_QUOTA     buget de quota YouTube per rulare de trenduri (default 1010)
+  STYLX_WARM_ANSWERS   1 = precalculează și răspunsurile agentului (default 0)
+  STYLX_WARM_INTERVAL  secunde între verificările tabelului `trends` (default 60)
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from crawl_planner import QUOTA_COST
+from db_connection import get_pool
+from fashion_youtube_agent_core import (
+    TOOL_CACHE_TTL,
+    ToolResultCache,
+    cached_fashion_youtube_trends,
+    normalize_style,
+    run_fashion_agent,
+    style_prompt,
+    tool_cache,
+)
+from instrumentation import incr, span
+from shared_cache import get_store
+from view_trends import load_top_trends, trends_version
+
+WARM_TOP = int(os.getenv("STYLX_WARM_TOP", "10"))
+WARM_QUOTA = int(os.getenv("STYLX_WARM_QUOTA", "1010"))
+WARM_ANSWERS = os.getenv("STYLX_WARM_ANSWERS", "").lower() in ("1", "true", "yes")
+WARM_INTERVAL = float(os.getenv("STYLX_WARM_INTERVAL", "60"))
+
+# Marcajele rulărilor de încălzire terminate / începute (namespace-uri în store), per trends_version
+WARM_RUNS = "warm_runs"
+WARM_STARTED = "warm_started"
+WARM_RUNS_TTL = 30 * 24 * 3600
+# Lease-ul rulării de încălzire; reînnoit înainte de fiecare stil, deci trebuie să acopere un singur stil
+WARM_LEASE_SECONDS = 300.0
+
+# Un apel de tool = search.list + videos.list
+TOOL_QUOTA_COST = QUOTA_COST["search"] + QUOTA_COST["videos"]
+
+
+class AnswerCache:
+    """
+    Răspunsuri /analyze-fashion precalculate de warmer, per stil, până la următoarea rulare
+    de trenduri; în store-ul partajat, deci vizibile din toți workerii. Statisticile sunt per worker.
+    """
+
+    namespace = "answer"
+
+    def __init__(self, ttl: float = TOOL_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, style: str) -> Optional[str]:
+        hit = get_store().get(self.namespace, normalize_style(style))
+        with self._lock:
+            self.stats["misses" if hit is None else "hits"] += 1
+        incr("cache_misses" if hit is None else "cache_hits", cache="answer")
+        return None if hit is None else hit[0]
+
+    def contains(self, style: str) -> bool:
+        """Verificare fără efect pe statistici (admission control dă prioritate cache hit-urilor)."""
+        return get_store().get(self.namespace, normalize_style(style)) is not None
+
+    def put(self, style: str, answer: str):
+        get_store().put(self.namespace, normalize_style(style), answer, self.ttl, warmed=True)
+
+    def invalidate(self):
+        get_store().clear(self.namespace)
+
+
+class CacheWarmer:
+    def __init__(
+        self,
+        db_path: str,
+        answer_cache: AnswerCache,
+        top_n: int = WARM_TOP,
+        quota_budget: int = WARM_QUOTA,
+        warm_answers: bool = WARM_ANSWERS,
+        interval: float = WARM_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.answer_cache = answer_cache
+        self.top_n = top_n
+        self.quota_budget = quota_budget
+        self.warm_answers = warm_answers
+        self.interval = interval
+        self.version: Optional[str] = None
+        self.last_run: Dict = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.top_n <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as exc:  # warmer-ul nu trebuie să oprească niciodată API-ul
+                incr("warmer_errors")
+                print(f"[WARN] Cache warmer: {exc}")
+            self._stop.wait(self.interval)
+
+    def check(self) -> bool:
+        """
+        Încălzește cache-urile dacă a apărut o rulare nouă de trenduri; True dacă a rulat.
+        Cu mai mulți workeri, o singură încălzire per rulare: primul worker ia lease-ul (reînnoit
+        cât timp încălzește), ceilalți găsesc apoi marcajul rulării în store și doar îl preiau.
+        Dacă workerul moare la jumătate, cel care preia lease-ul găsește marcajul de start și
+        continuă fără să mai invalideze răspunsurile deja încălzite pentru aceeași rulare.
+        """
+        try:
+            with get_pool(self.db_path).connection() as conn:
+                version = trends_version(conn)
+                if version is None or version == self.version:
+                    return False
+                styles = [t["name"] for t in load_top_trends(conn, self.top_n)]
+        except sqlite3.OperationalError:
+            return False  # DB-ul lipsește sau e blocat; reîncercăm la următorul interval
+        store = get_store()
+        done = store.get(WARM_RUNS, version)
+        if done is not None:
+            self.version, self.last_run = version, done[0]
+            return False
+        with store.single_flight(WARM_RUNS, version, wait=0, lease=WARM_LEASE_SECONDS) as leader:
+            if not leader:
+                return False  # alt worker încălzește acum; marcajul apare la următoarea verificare
+            self.version = version
+            if store.get(WARM_STARTED, version) is None:
+                store.put(WARM_STARTED, version, {"worker": os.getpid(), "at": time.time()}, ttl=WARM_RUNS_TTL)
+                self.answer_cache.invalidate()
+            run = self.warm(styles, renew=lambda: store.renew_lease(WARM_RUNS, version, WARM_LEASE_SECONDS))
+            if run.get("lease_lost"):
+                return True  # alt worker a preluat rularea și îi scrie marcajul
+            store.put(WARM_RUNS, version, run, ttl=WARM_RUNS_TTL)
+        return True
+
+    def warm(self, styles: List[str], renew: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Precalculează rezultatele de tool (și opțional răspunsurile) pentru `styles`, în ordine.
+        `renew` e apelat înainte de fiecare stil (reînnoiește lease-ul); False = lease pierdut, oprire.
+        """
+        run = {
+            "version": self.version,
+            "styles": len(styles),
+            "tools_warmed": 0,
+            "already_fresh": 0,
+            "skipped_quota": 0,
+            "answers_warmed": 0,
+            "quota_used": 0,
+        }
+        start = time.perf_counter()
+        with span("warmer.run", styles=len(styles)):
+            for style in styles:
+                if self._stop.is_set():
+                    break
+                if renew is not None and not renew():
+                    run["lease_lost"] = True
+                    incr("warmer_lease_lost")
+                    break
+                if tool_cache.fresh(ToolResultCache.key(style)):
+                    run["already_fresh"] += 1
+                elif run["quota_used"] + TOOL_QUOTA_COST <= self.quota_budget:
+                    cached_fashion_youtube_trends(style, warmed=True)
+                    run["tools_warmed"] += 1
+                    run["quota_used"] += TOOL_QUOTA_COST
+                    incr("warmer_quota", TOOL_QUOTA_COST)
+                else:
+                    run["skipped_quota"] += 1
+                    continue
+                if self.warm_answers and not self.answer_cache.contains(style):
+                    with tool_cache.uncounted():
+                        answer = run_fashion_agent(style_prompt(style), style=style)
+                    self.answer_cache.put(style, answer)
+                    run["answers_warmed"] += 1
+        run["seconds"] = round(time.perf_counter() - start, 3)
+        incr("warmer_runs")
+        self.last_run = run
+        print(
+            f"[WARMER] {run['tools_warmed']} tool results + {run['answers_warmed']} answers warmed "
+            f"for {len(styles)} trending styles ({run['already_fresh']} already fresh, "
+            f"{run['skipped_quota']} over quota; {run['quota_used']}/{self.quota_budget} units) "
+            f"in {run['seconds']:.1f}s"
+        )
+        return run
+
+    def stats(self) -> Dict:
+        tool = dict(tool_cache.stats)
+        lookups = tool["hits"] + tool["misses"]
+        answers = dict(self.answer_cache.stats)
+        answer_lookups = answers["hits"] + answers["misses"]
+        return {
+            "enabled": self.top_n > 0,
+            "last_run": self.last_run,
+            "tool_cache": {**tool, "warm_hit_rate": tool["warm_hits"] / lookups if lookups else 0.0},
+            "answer_cache": {**answers, "warm_hit_rate": answers["hits"] / answer_lookups if answer_lookups else 0.0},
+        }
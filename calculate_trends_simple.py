@@ -5,16 +5,43 @@ Mult mai rapid, nu necesită API Gemini.
 
 Usage:
   python3 calculate_trends_simple.py --db youtube_videos.db
+  python3 calculate_trends_simple.py --db youtube_videos.db --processes 8   # arhive foarte mari
 """
 import sqlite3
 import argparse
 import datetime
 import json
 import math
+import multiprocessing
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from collections import defaultdict
 
+from db_connection import connect_reader, connect_writer
+from instrumentation import incr, log_summary, span
+from ngram_discovery import DEFAULT_RECENT_DAYS, discover_from_db, tokenize
+from profiling import add_profile_args, profiled
+from trend_export import add_export_args, export_after_run
+from trend_store import init_trend_videos_table, replace_trend_videos
+from video_archive import VideoArchive, has_archive, window_rows
+
+
+# Fashion keywords comune (DOAR acestea vor apărea în top)
+FASHION_TERMS = (
+    "vintage fashion", "y2k fashion", "grunge", "cottagecore",
+    "dark academia", "light academia", "clean girl", "soft girl",
+    "mob wife", "quiet luxury", "old money", "preppy",
+    "mermaidcore", "fairycore", "royalcore", "kawaii fashion",
+    "harajuku", "boho chic", "balletcore", "eclectic grandpa",
+    "coastal cowgirl", "blokette", "gorpcore", "athleisure",
+    "normcore", "streetwear", "skater style", "indie sleaze",
+    "tomato girl", "retro futurism", "cyberpunk", "steampunk",
+    "techwear", "weirdcore", "pastel goth", "goth",
+    "apres ski", "mod revival", "maximalist style", "minimalist style",
+    "countryside chic",
+)
+VIDEO_COLUMNS = ("video_id", "title", "publish_date", "view_count")
+
 
 def normalize_trend_name(name: str) -> str:
     """Normalizează numele trendului: lowercase, fără emoji, spații extra."""
@@ -35,57 +62,270 @@ def normalize_trend_name(name: str) -> str:
     return cleaned
 
 
-def extract_keywords_from_video(video: Dict) -> List[str]:
-    """Extrage keywords din tags și titlu (fără AI)."""
+def extract_keywords_from_video(video: Dict, extra_terms: Tuple[str, ...] = ()) -> List[str]:
+    """Extrage keywords din tags și titlu (fără AI). `extra_terms` = termeni descoperiți (--discover)."""
     keywords = []
     
     # Keywords din titlu (2+ words phrases)
     title = video.get("title") or ""
     title_lower = title.lower()
     
-    # Fashion keywords comune (DOAR acestea vor apărea în top)
-    fashion_terms = [
-        "vintage fashion", "y2k fashion", "grunge", "cottagecore", 
-        "dark academia", "light academia", "clean girl", "soft girl",
-        "mob wife", "quiet luxury", "old money", "preppy",
-        "mermaidcore", "fairycore", "royalcore", "kawaii fashion",
-        "harajuku", "boho chic", "balletcore", "eclectic grandpa",
-        "coastal cowgirl", "blokette", "gorpcore", "athleisure",
-        "normcore", "streetwear", "skater style", "indie sleaze",
-        "tomato girl", "retro futurism", "cyberpunk", "steampunk",
-        "techwear", "weirdcore", "pastel goth", "goth",
-        "apres ski", "mod revival", "maximalist style", "minimalist style",
-        "countryside chic"
-]
-    
-    for term in fashion_terms:
+    for term in FASHION_TERMS:
         if term in title_lower:
             keywords.append(normalize_trend_name(term))
     
+    # Termenii descoperiți sunt n-grame de cuvinte întregi: potrivire pe aceiași tokeni ca
+    # ngram_discovery, altfel "red" s-ar potrivi în "reddit" sau "inspired"
+    if extra_terms:
+        padded = " " + " ".join(tokenize(title)) + " "
+        for term in extra_terms:
+            if f" {term} " in padded:
+                keywords.append(normalize_trend_name(term))
+    
     return list(set(keywords))  # unique
 
 
 def calculate_days_since(date_str: str, now: datetime.datetime) -> float:
     """Calculează diferența în zile între date_str (ISO format) și now."""
     try:
-        dt = datetime.datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        # `now` e UTC naiv; fără replace(tzinfo=None) scăderea dădea TypeError -> mereu 1.0
+        dt = datetime.datetime.fromisoformat(date_str.replace("Z", "+00:00")).replace(tzinfo=None)
         delta = now - dt
         return max(delta.total_seconds() / 86400, 0.1)
     except:
         return 1.0
 
 
+def _empty_aggregate() -> Dict:
+    return {
+        "num_videos": 0,
+        "total_views": 0,
+        "weighted_views": 0.0,
+        "first_seen_at": None,
+        "last_seen_at": None,
+    }
+
+
+def aggregate_video_keywords(videos, now: datetime.datetime, extra_terms: Tuple[str, ...] = ()):
+    """
+    Extrage keywords din videouri și le agregă parțial pe trend.
+
+    Agregatele (num_videos, total_views, weighted_views, first/last seen) pot fi combinate
+    cu `merge_aggregates`, deci fiecare shard poate fi procesat separat. Sunt O(trenduri):
+    lista de videouri se strânge separat, doar pentru trendurile salvate (`collect_trend_videos`).
+    Returnează (agregate, număr_mențiuni).
+    """
+    aggregates: Dict[str, Dict] = defaultdict(_empty_aggregate)
+    mentions = 0
+
+    for video in videos:
+        keywords = extract_keywords_from_video(video, extra_terms)
+        for keyword in keywords:
+            if not keyword or len(keyword) <= 2:  # Skip very short keywords
+                continue
+            mentions += 1
+
+            # Filtrează DOAR clipurile din 2025 (ignore tot din 2024 și mai vechi)
+            pub_date = video["publish_date"]
+            if not pub_date or not pub_date.startswith("2025"):
+                continue
+
+            view_count = video["view_count"] or 0
+
+            # Score cu pondere pe lună (clipuri din noiembrie > octombrie > etc)
+            # Extrage luna din format ISO: "2025-11-15T..." -> luna = 11
+            try:
+                month = int(pub_date[5:7])
+            except:
+                month = 1
+
+            # Pondere: noiembrie (11) = 1.0, octombrie (10) = 0.9, septembrie = 0.8, etc.
+            month_weight = (month / 11.0) if month <= 11 else 1.0
+
+            # Decay suplimentar în funcție de zile în cadrul lunii
+            video_days_old = calculate_days_since(pub_date, now)
+            day_weight = math.exp(-video_days_old / 7)
+
+            agg = aggregates[keyword]
+            agg["num_videos"] += 1
+            agg["total_views"] += view_count
+            agg["weighted_views"] += view_count * month_weight * day_weight
+            if agg["first_seen_at"] is None or pub_date < agg["first_seen_at"]:
+                agg["first_seen_at"] = pub_date
+            if agg["last_seen_at"] is None or pub_date > agg["last_seen_at"]:
+                agg["last_seen_at"] = pub_date
+
+    return dict(aggregates), mentions
+
+
+def merge_aggregates(target: Dict[str, Dict], partial: Dict[str, Dict]):
+    """Combină agregatele parțiale ale unui shard în `target` (in-place)."""
+    for name, agg in partial.items():
+        if name not in target:
+            target[name] = dict(agg)
+            continue
+        merged = target[name]
+        merged["num_videos"] += agg["num_videos"]
+        merged["total_views"] += agg["total_views"]
+        merged["weighted_views"] += agg["weighted_views"]
+        merged["first_seen_at"] = min(merged["first_seen_at"], agg["first_seen_at"])
+        merged["last_seen_at"] = max(merged["last_seen_at"], agg["last_seen_at"])
+
+
+def collect_trend_videos(videos, names, extra_terms: Tuple[str, ...] = ()) -> Dict[str, List[Tuple[str, int, str]]]:
+    """
+    A doua trecere, doar pentru trendurile `names`: trend -> [(video_id, view_count, publish_date)],
+    cu aceeași extragere și același filtru de dată ca `aggregate_video_keywords`.
+    """
+    mapping: Dict[str, List[Tuple[str, int, str]]] = defaultdict(list)
+    for video in videos:
+        pub_date = video["publish_date"]
+        if not pub_date or not pub_date.startswith("2025"):
+            continue
+        for keyword in extract_keywords_from_video(video, extra_terms):
+            if keyword in names:
+                mapping[keyword].append((video["video_id"], video["view_count"] or 0, pub_date))
+    return dict(mapping)
+
+
+def _rowid_range_rows(db_path: str, lo: int, hi: int):
+    conn = connect_reader(db_path, row_factory=sqlite3.Row)
+    try:
+        cur = conn.execute(
+            f"SELECT {', '.join(VIDEO_COLUMNS)} FROM videos WHERE rowid BETWEEN ? AND ?",
+            (lo, hi),
+        )
+        yield from map(dict, cur)
+    finally:
+        conn.close()
+
+
+def _collect_rowid_range(task):
+    """Worker: maparea trend -> videouri pentru shard-ul [lo, hi]."""
+    db_path, lo, hi, names, extra_terms = task
+    return collect_trend_videos(_rowid_range_rows(db_path, lo, hi), set(names), extra_terms)
+
+
+def _aggregate_rowid_range(task):
+    """Worker: deschide o conexiune read-only proprie și agregă shard-ul [lo, hi]."""
+    db_path, lo, hi, now_iso, extra_terms = task
+    rows = _rowid_range_rows(db_path, lo, hi)
+    return aggregate_video_keywords(rows, datetime.datetime.fromisoformat(now_iso), extra_terms)
+
+
+def _rowid_shards(conn: sqlite3.Connection, num_shards: int) -> List[Tuple[int, int]]:
+    """Împarte intervalul de rowid din `videos` în `num_shards` bucăți egale."""
+    lo, hi = conn.execute("SELECT MIN(rowid), MAX(rowid) FROM videos").fetchone()
+    if lo is None:
+        return []
+    step = max(1, -(-(hi - lo + 1) // num_shards))
+    return [(start, min(start + step - 1, hi)) for start in range(lo, hi + 1, step)]
+
+
+def aggregate_parallel(
+    db_path: str,
+    conn: sqlite3.Connection,
+    processes: int,
+    now: datetime.datetime,
+    extra_terms: Tuple[str, ...] = (),
+):
+    """Rulează `aggregate_video_keywords` pe shard-uri de rowid într-un process pool."""
+    # Mai multe shard-uri decât procese ca să echilibrăm încărcarea
+    shards = _rowid_shards(conn, processes * 4)
+    tasks = [(db_path, lo, hi, now.isoformat(), extra_terms) for lo, hi in shards]
+
+    aggregates: Dict[str, Dict] = {}
+    mentions = 0
+    with multiprocessing.Pool(processes) as pool:
+        for partial, partial_mentions in pool.imap_unordered(_aggregate_rowid_range, tasks):
+            merge_aggregates(aggregates, partial)
+            mentions += partial_mentions
+    return aggregates, mentions
+
+
+def _window_start(now: datetime.datetime, days_window: int) -> str:
+    return (now - datetime.timedelta(days=days_window + 1)).strftime("%Y-%m-%d")
+
+
+def aggregate_window(
+    conn: sqlite3.Connection,
+    days_window: int,
+    now: datetime.datetime,
+    extra_terms: Tuple[str, ...] = (),
+):
+    """
+    Agregare pe fereastra [now - days_window - 1 zi, now] pentru DB-uri cu arhivă (video_archive):
+    citește doar partiția activă și partițiile care se suprapun cu fereastra.
+
+    Un trend trece filtrul `days_since <= days_window` doar dacă toate mențiunile lui sunt în
+    fereastră, deci pentru el agregatul e identic cu cel dintr-o scanare completă. Pentru restul,
+    `first_seen_at` e mutat la prima apariție dinainte de fereastră (indexul de termeni al
+    arhivei), ca filtrul să le elimine exact ca la scanarea completă.
+    """
+    window_start = _window_start(now, days_window)
+    rows = window_rows(conn, VIDEO_COLUMNS, start=window_start)
+    aggregates, mentions = aggregate_video_keywords((dict(zip(VIDEO_COLUMNS, row)) for row in rows), now, extra_terms)
+
+    def first_seen(rows):
+        partial, _ = aggregate_video_keywords((dict(zip(VIDEO_COLUMNS, row)) for row in rows), now, extra_terms)
+        return {name: agg["first_seen_at"] for name, agg in partial.items()}
+
+    vocabulary = {normalize_trend_name(term) for term in FASHION_TERMS + tuple(extra_terms)}
+    history = VideoArchive(conn).first_seen_before(aggregates, window_start, VIDEO_COLUMNS, first_seen, vocabulary)
+    for name, seen in history.items():
+        aggregates[name]["first_seen_at"] = min(aggregates[name]["first_seen_at"], seen)
+    return aggregates, mentions
+
+
+def trend_videos_mapping(
+    db_path: str,
+    conn: sqlite3.Connection,
+    names,
+    processes: int,
+    archived: bool,
+    days_window: int,
+    now: datetime.datetime,
+    extra_terms: Tuple[str, ...] = (),
+) -> Dict[str, List[Tuple[str, int, str]]]:
+    """
+    Maparea trend -> videouri pentru trendurile salvate, pe aceeași sursă ca extragerea: fereastra
+    (cu arhivă, unde sunt toate mențiunile trendurilor emergente), shard-uri de rowid sau `videos`.
+    """
+    names = set(names)
+    if not names:
+        return {}
+    if archived:
+        rows = window_rows(conn, VIDEO_COLUMNS, start=_window_start(now, days_window))
+        return collect_trend_videos((dict(zip(VIDEO_COLUMNS, row)) for row in rows), names, extra_terms)
+    if processes <= 1:
+        cur = conn.execute(f"SELECT {', '.join(VIDEO_COLUMNS)} FROM videos")
+        return collect_trend_videos(map(dict, cur), names, extra_terms)
+
+    tasks = [(db_path, lo, hi, tuple(names), extra_terms) for lo, hi in _rowid_shards(conn, processes * 4)]
+    mapping: Dict[str, List[Tuple[str, int, str]]] = defaultdict(list)
+    with multiprocessing.Pool(processes) as pool:
+        for partial in pool.imap_unordered(_collect_rowid_range, tasks):
+            for name, videos in partial.items():
+                mapping[name].extend(videos)
+    return dict(mapping)
+
+
 def calculate_trends_simple(
     db_path: str,
     days_window: int = 7,
     min_videos: int = 3,
     min_views: int = 10000,
     max_views: int = 500000,
+    processes: int = 1,
+    discover: bool = False,
+    discover_top: int = 20,
 ):
-    """Calculează trenduri din videouri existente fără AI."""
+    """
+    Calculează trenduri din videouri existente fără AI. Cu `discover`, n-gramele aflate în
+    creștere bruscă (ngram_discovery) se adaugă la lista fixă de termeni fashion.
+    """
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = connect_writer(db_path, row_factory=sqlite3.Row)
     cur = conn.cursor()
     
     # Creează tabelul trends
@@ -103,111 +343,79 @@ def calculate_trends_simple(
         )
         """
     )
+    init_trend_videos_table(conn)
     conn.commit()
     
     print("📊 Calculating trends from existing videos (no AI needed)...\n")
     
-    # 1. Citește toate videouri
-    cur.execute("SELECT * FROM videos ORDER BY publish_date DESC")
-    videos = [dict(row) for row in cur.fetchall()]
-    print(f"✓ Found {len(videos)} videos in database")
+    # 1. Numără videouri (partiția activă + partițiile arhivate)
+    cur.execute("SELECT COUNT(*) FROM videos")
+    num_total = cur.fetchone()[0]
+    archived = has_archive(conn)
+    if archived:
+        num_total += sum(shard["rows"] for shard in VideoArchive(conn).shards())
+    print(f"✓ Found {num_total} videos in database")
     
-    if not videos:
+    if not num_total:
         print("No videos in database.")
         conn.close()
         return
     
-    # 2. Extrage keywords din fiecare video
-    print("✓ Extracting keywords from titles and tags...")
-    video_trends = []
-    
-    for video in videos:
-        keywords = extract_keywords_from_video(video)
-        for keyword in keywords:
-            if keyword and len(keyword) > 2:  # Skip very short keywords
-                video_trends.append({
-                    "video_id": video["video_id"],
-                    "trend_name": keyword,
-                    "publish_date": video["publish_date"],
-                    "view_count": video.get("view_count") or 0,
-                })
-    
-    print(f"✓ Extracted {len(video_trends)} trend mentions from videos\n")
+    # 2. Termeni noi descoperiți statistic (opțional), apoi extrage keywords și agregă pe trend
+    now = datetime.datetime.utcnow()
+    extra_terms: Tuple[str, ...] = ()
+    if discover:
+        discovered = discover_from_db(db_path, top=discover_top, recent_days=min(days_window, DEFAULT_RECENT_DAYS))
+        extra_terms = tuple(t["term"] for t in discovered if len(t["term"]) > 2)
+        print(f"✓ Discovered {len(extra_terms)} bursting n-grams: {', '.join(extra_terms) or '-'}")
+    with span("trends_simple.extract", processes=processes) as extract_span:
+        if archived:
+            # Cu arhivă, doar fereastra: partițiile vechi răspund din indexul de termeni
+            print(f"✓ Extracting keywords from the last {days_window} days (archived shards pruned)...")
+            aggregates, mentions = aggregate_window(conn, days_window, now, extra_terms)
+        elif processes > 1:
+            print(f"✓ Extracting keywords from titles and tags ({processes} processes)...")
+            aggregates, mentions = aggregate_parallel(db_path, conn, processes, now, extra_terms)
+        else:
+            print("✓ Extracting keywords from titles and tags...")
+            cur.execute(f"SELECT {', '.join(VIDEO_COLUMNS)} FROM videos")
+            aggregates, mentions = aggregate_video_keywords(map(dict, cur), now, extra_terms)
+        extract_span["rows"] = num_total
+        extract_span["mentions"] = mentions
+    incr("rows_processed", stage="trends_simple.extract", value=num_total)
     
-    # 3. Grupează după trend_name
-    trend_groups = defaultdict(list)
-    for vt in video_trends:
-        trend_groups[vt["trend_name"]].append(vt)
+    print(f"✓ Extracted {mentions} trend mentions from videos\n")
     
-    now = datetime.datetime.utcnow()
+    # 3. Calculează metrici din agregate
     trend_metrics = []
     
-    for trend_name, occurrences in trend_groups.items():
-        # Filtrează DOAR clipurile din 2025 (ignore tot din 2024 și mai vechi)
-        recent_occurrences = []
-        for occ in occurrences:
-            pub_date = occ["publish_date"]
-            if pub_date and pub_date.startswith("2025"):
-                recent_occurrences.append(occ)
-        
-        # Dacă nu mai rămân clipuri din 2025, skip acest trend
-        if not recent_occurrences:
-            continue
-        
-        num_videos = len(recent_occurrences)
-        total_views = sum(occ["view_count"] for occ in recent_occurrences)
-        avg_views = total_views / num_videos if num_videos > 0 else 0
-        
-        dates = [occ["publish_date"] for occ in recent_occurrences if occ["publish_date"]]
-        if not dates:
-            continue
-        
-        dates_sorted = sorted(dates)
-        first_seen_at = dates_sorted[0]
-        last_seen_at = dates_sorted[-1]
-        
-        days_since = calculate_days_since(first_seen_at, now)
-        
-        # Score cu pondere pe lună (clipuri din noiembrie > octombrie > etc)
-        # 1. Weighted views: pondere bazată pe lună din 2025
-        weighted_views = 0
-        for occ in recent_occurrences:
-            pub_date = occ["publish_date"]
-            # Extrage luna din format ISO: "2025-11-15T..." -> luna = 11
-            try:
-                month = int(pub_date[5:7])  # extrage "11" din "2025-11-15"
-            except:
-                month = 1
+    with span("trends_simple.score", trends=len(aggregates)):
+        for trend_name, agg in aggregates.items():
+            num_videos = agg["num_videos"]
+            total_views = agg["total_views"]
+            avg_views = total_views / num_videos if num_videos > 0 else 0
+            first_seen_at = agg["first_seen_at"]
+            last_seen_at = agg["last_seen_at"]
             
-            # Pondere: noiembrie (11) = 1.0, octombrie (10) = 0.9, septembrie = 0.8, etc.
-            # Formula: (month / 11) pentru ca noiembrie să fie 1.0
-            month_weight = (month / 11.0) if month <= 11 else 1.0
+            days_since = calculate_days_since(first_seen_at, now)
             
-            # Decay suplimentar în funcție de zile în cadrul lunii
-            video_days_old = calculate_days_since(pub_date, now)
-            day_weight = math.exp(-video_days_old / 7)
+            # 2. Trend age penalty: MAXIM PENALTY pentru trenduri vechi
+            # Orice trend mai vechi de câteva zile e ELIMINAT virtual
+            trend_age_factor = math.exp(-days_since / 3.5)  # după 3.5 zile factor = 0.37
             
-            # Weight final = pondere lună × decay zile
-            weight = month_weight * day_weight
-            weighted_views += occ["view_count"] * weight
-        
-        # 2. Trend age penalty: MAXIM PENALTY pentru trenduri vechi
-        # Orice trend mai vechi de câteva zile e ELIMINAT virtual
-        trend_age_factor = math.exp(-days_since / 3.5)  # după 3.5 zile factor = 0.37
-        
-        # Score final = num_videos * log(1 + weighted_views) * trend_age_factor / zile
-        score = (num_videos * math.log(1 + weighted_views) * trend_age_factor) / max(days_since, 1)
-        
-        trend_metrics.append({
-            "name": trend_name,
-            "score": score,
-            "num_videos": num_videos,
-            "total_views": total_views,
-            "avg_views": avg_views,
-            "first_seen_at": first_seen_at,
-            "last_seen_at": last_seen_at,
-            "days_since": days_since,
-        })
+            # Score final = num_videos * log(1 + weighted_views) * trend_age_factor / zile
+            score = (num_videos * math.log(1 + agg["weighted_views"]) * trend_age_factor) / max(days_since, 1)
+            
+            trend_metrics.append({
+                "name": trend_name,
+                "score": score,
+                "num_videos": num_videos,
+                "total_views": total_views,
+                "avg_views": avg_views,
+                "first_seen_at": first_seen_at,
+                "last_seen_at": last_seen_at,
+                "days_since": days_since,
+            })
     
     # 4. Filtrează emerging trends
     emerging = []
@@ -225,29 +433,39 @@ def calculate_trends_simple(
     print(f"🔥 Found {len(emerging)} EMERGING TRENDS (filtered)\n")
     print(f"{'='*100}\n")
     
-    # 5. Salvează în DB
-    cur.execute("DELETE FROM trends")
-    detected_at = now.isoformat()
-    
-    for trend in emerging:
-        cur.execute(
-            """
-            INSERT INTO trends (name, score, num_videos, total_views, avg_views, first_seen_at, last_seen_at, detected_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                trend["name"],
-                trend["score"],
-                trend["num_videos"],
-                trend["total_views"],
-                trend["avg_views"],
-                trend["first_seen_at"],
-                trend["last_seen_at"],
-                detected_at,
-            ),
+    # Maparea trend -> videouri (a doua trecere, doar pentru trendurile salvate), înainte de
+    # tranzacția de scriere: cu arhivă, citirea face ATTACH, care nu e permis într-o tranzacție
+    with span("trends_simple.trend_videos", trends=len(emerging)):
+        mapping = trend_videos_mapping(
+            db_path, conn, (t["name"] for t in emerging), processes, archived, days_window, now, extra_terms
         )
     
-    conn.commit()
+    # 5. Salvează în DB
+    with span("trends_simple.save", trends=len(emerging)):
+        cur.execute("DELETE FROM trends")
+        detected_at = now.isoformat()
+        
+        for trend in emerging:
+            cur.execute(
+                """
+                INSERT INTO trends (name, score, num_videos, total_views, avg_views, first_seen_at, last_seen_at, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    trend["name"],
+                    trend["score"],
+                    trend["num_videos"],
+                    trend["total_views"],
+                    trend["avg_views"],
+                    trend["first_seen_at"],
+                    trend["last_seen_at"],
+                    detected_at,
+                ),
+            )
+        
+        # Maparea trend -> videouri, pentru view_trends --trend și /trends/{name}/videos
+        replace_trend_videos(conn, mapping)
+        conn.commit()
     conn.close()
     
     # 6. Afișează top trenduri
@@ -265,6 +483,7 @@ def calculate_trends_simple(
     
     print(f"\n{'='*100}")
     print(f"✓ Saved {len(emerging)} trends to database: {db_path}")
+    log_summary("calculate_trends_simple")
 
 
 def parse_args():
@@ -274,18 +493,28 @@ def parse_args():
     p.add_argument("--min-videos", type=int, default=3, help="Minimum videos mentioning trend (default: 3)")
     p.add_argument("--min-views", type=int, default=10000, help="Minimum total views (default: 10000)")
     p.add_argument("--max-views", type=int, default=500000, help="Maximum total views (default: 500000)")
+    p.add_argument("--processes", type=int, default=1, help="Worker processes for keyword extraction (default: 1)")
+    p.add_argument("--discover", action="store_true", help="Also track bursting title/tag n-grams (count-min sketches)")
+    p.add_argument("--discover-top", type=int, default=20, help="Max discovered terms added to the keyword list (default: 20)")
+    add_export_args(p)
+    add_profile_args(p)
     return p.parse_args()
 
 
 def main():
     args = parse_args()
-    calculate_trends_simple(
-        db_path=args.db,
-        days_window=args.days,
-        min_videos=args.min_videos,
-        min_views=args.min_views,
-        max_views=args.max_views,
-    )
+    with profiled("calculate_trends_simple", args.profile, args.profile_dir):
+        calculate_trends_simple(
+            db_path=args.db,
+            days_window=args.days,
+            min_videos=args.min_videos,
+            min_views=args.min_views,
+            max_views=args.max_views,
+            processes=args.processes,
+            discover=args.discover,
+            discover_top=args.discover_top,
+        )
+        export_after_run(args.db, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+"""
+Crawl incremental pe canale prin playlist-ul de uploads, în loc de `search.list`.
+
+- `search.list` costă 100 unități de quota per pagină; `playlistItems.list` și
+  `channels.list` costă 1 unitate.
+- ID-ul playlist-ului de uploads se rezolvă o singură dată (`channels.list`, până la
+  50 de canale per apel) și se păstrează în tabelul `channels`.
+- Playlist-ul e parcurs de la cel mai nou upload, pagină cu pagină, până la ultimul
+  video văzut la rularea anterioară (sau până la capătul playlist-ului).
+- Markerul (`last_seen_*`) avansează doar când parcurgerea a ajuns la el sau la capăt.
+  Dacă se oprește înainte (`max_videos`, eroare API), se salvează un punct de reluare:
+  pagina de unde continuă (`resume_page_token`) și cel mai nou video citit, care devine
+  marker abia după ce golul până la markerul vechi e parcurs la crawl-urile următoare.
+
+    crawler = ChannelCrawler(youtube, conn)
+    ids = crawler.new_video_ids("UC...", max_videos=200)
+    ...                                   # fetch_video_details + upsert
+    crawler.mark_seen("UC...")            # abia după ce videourile sunt salvate
+"""
+import datetime
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import googleapiclient.errors
+
+from instrumentation import incr, span
+from youtube_retry import execute_with_retry
+
+PAGE_SIZE = 50
+
+
+def init_channels_table(conn: sqlite3.Connection):
+    """Creează tabelul channels (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS channels (
+            channel_id TEXT PRIMARY KEY,
+            uploads_playlist_id TEXT NOT NULL,
+            last_seen_video_id TEXT,
+            last_seen_published_at TEXT,
+            last_crawled_at TEXT,
+            resume_page_token TEXT,
+            resume_newest_video_id TEXT,
+            resume_newest_published_at TEXT
+        ) WITHOUT ROWID
+        """
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(channels)")}
+    for column in ("resume_page_token", "resume_newest_video_id", "resume_newest_published_at"):
+        if column not in columns:  # tabele create înainte de punctele de reluare
+            conn.execute(f"ALTER TABLE channels ADD COLUMN {column} TEXT")
+
+
+class ChannelCrawler:
+    def __init__(self, youtube, conn: sqlite3.Connection):
+        self.youtube = youtube
+        self.conn = conn
+        # canal -> {"last_seen": (video_id, published_at) | None, "resume": (token, video_id, published_at) | None}
+        self._pending: Dict[str, Dict] = {}
+        init_channels_table(conn)
+        conn.commit()
+
+    def _resolve_handle(self, handle: str) -> Optional[Dict]:
+        try:
+            with span("ingest.channels_api", handle=handle):
+                incr("api_calls", api="youtube", endpoint="channels")
+                resp = execute_with_retry(
+                    self.youtube.channels().list(part="contentDetails", forHandle=handle), endpoint="channels"
+                )
+        except googleapiclient.errors.HttpError as e:
+            incr("api_errors", api="youtube", endpoint="channels")
+            print(f"Channels API error for {handle}: {e}")
+            return None
+        items = resp.get("items", [])
+        return items[0] if items else None
+
+    def uploads_playlists(self, channels: Iterable[str]) -> Dict[str, str]:
+        """
+        Canal -> ID playlist de uploads. Canalele necunoscute se rezolvă în loturi de 50
+        (1 unitate de quota per lot); handle-urile (`@nume`) câte unul. Rezultatul e salvat.
+        """
+        channels = list(dict.fromkeys(channels))
+        result: Dict[str, str] = {}
+        for ch in channels:
+            row = self.conn.execute(
+                "SELECT uploads_playlist_id FROM channels WHERE channel_id = ?", (ch,)
+            ).fetchone()
+            if row:
+                result[ch] = row[0]
+
+        resolved = []
+        missing_ids = [ch for ch in channels if ch not in result and not ch.startswith("@")]
+        for i in range(0, len(missing_ids), PAGE_SIZE):
+            batch = missing_ids[i : i + PAGE_SIZE]
+            try:
+                with span("ingest.channels_api", ids=len(batch)):
+                    incr("api_calls", api="youtube", endpoint="channels")
+                    resp = execute_with_retry(
+                        self.youtube.channels().list(part="contentDetails", id=",".join(batch)), endpoint="channels"
+                    )
+            except googleapiclient.errors.HttpError as e:
+                incr("api_errors", api="youtube", endpoint="channels")
+                print(f"Channels API error: {e}")
+                continue
+            resolved += [(item["id"], item) for item in resp.get("items", [])]
+        for handle in (ch for ch in channels if ch not in result and ch.startswith("@")):
+            item = self._resolve_handle(handle)
+            if item:
+                resolved.append((handle, item))
+
+        for key, item in resolved:
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if not uploads:
+                continue
+            result[key] = uploads
+            self.conn.execute(
+                """
+                INSERT INTO channels (channel_id, uploads_playlist_id) VALUES (?, ?)
+                ON CONFLICT(channel_id) DO UPDATE SET uploads_playlist_id = excluded.uploads_playlist_id
+                """,
+                (key, uploads),
+            )
+        self.conn.commit()
+        for ch in channels:
+            if ch not in result:
+                print(f"Channel not found: {ch}")
+        return result
+
+    def _walk(
+        self,
+        channel: str,
+        playlist_id: str,
+        page_token: Optional[str],
+        stop_id: Optional[str],
+        stop_published: Optional[str],
+        budget: int,
+    ) -> Tuple[List[str], Optional[tuple], bool, Optional[str], int]:
+        """
+        Parcurge playlist-ul de la `page_token` (None = cel mai nou upload) până la `stop_id`, un
+        upload mai vechi decât el (dacă a fost șters) sau capătul playlist-ului.
+        Întoarce (ids, cel mai nou (id, published), complet, pagina de reluare, pagini citite).
+        """
+        ids: List[str] = []
+        newest = None
+        pages = 0
+        token = page_token
+        while True:
+            if len(ids) >= budget:
+                return ids, newest, False, token, pages
+            params = dict(part="contentDetails", playlistId=playlist_id, maxResults=PAGE_SIZE)
+            if token:
+                params["pageToken"] = token
+            try:
+                incr("api_calls", api="youtube", endpoint="playlistItems")
+                resp = execute_with_retry(self.youtube.playlistItems().list(**params), endpoint="playlistItems")
+            except googleapiclient.errors.HttpError as e:
+                incr("api_errors", api="youtube", endpoint="playlistItems")
+                print(f"PlaylistItems API error for channel {channel}: {e}")
+                return ids, newest, False, token, pages
+            pages += 1
+
+            items = resp.get("items", [])
+            for index, item in enumerate(items):
+                details = item.get("contentDetails", {})
+                vid = details.get("videoId")
+                published = details.get("videoPublishedAt")
+                if not vid:
+                    continue
+                if vid == stop_id or (stop_published and published and published < stop_published):
+                    return ids, newest, True, None, pages
+                if newest is None or (published or "") > (newest[1] or ""):
+                    newest = (vid, published)
+                ids.append(vid)
+                if len(ids) >= budget and index < len(items) - 1:
+                    # Restul paginii rămâne pentru data viitoare (dublurile sunt deduplicate de CrawlPlan)
+                    return ids, newest, False, token, pages
+
+            token = resp.get("nextPageToken")
+            if not token:
+                return ids, newest, True, None, pages
+
+    def new_video_ids(self, channel: str, max_videos: int, playlist_id: str = None) -> List[str]:
+        """
+        ID-urile uploadurilor necitite, cel mult `max_videos`: întâi golul rămas de la un crawl
+        întrerupt (de la punctul de reluare până la marker), apoi uploadurile noi de la cel mai
+        nou până la marker. Starea nouă se salvează abia la `mark_seen`.
+        """
+        if playlist_id is None:
+            playlist_id = self.uploads_playlists([channel]).get(channel)
+            if playlist_id is None:
+                return []
+        row = self.conn.execute(
+            """
+            SELECT last_seen_video_id, last_seen_published_at,
+                   resume_page_token, resume_newest_video_id, resume_newest_published_at
+            FROM channels WHERE channel_id = ?
+            """,
+            (channel,),
+        ).fetchone()
+        last_id, last_published, resume_token, resume_id, resume_published = row if row else (None,) * 5
+
+        ids: List[str] = []
+        pending = {"last_seen": None, "resume": None}
+        pages = 0
+        with span("ingest.channel_crawl", channel=channel) as s:
+            if resume_id is not None:
+                gap, _, complete, token, walked = self._walk(
+                    channel, playlist_id, resume_token, last_id, last_published, max_videos
+                )
+                ids += gap
+                pages += walked
+                if complete:
+                    # Golul e închis: cel mai nou video al crawl-ului întrerupt devine marker
+                    last_id, last_published = resume_id, resume_published
+                    pending["last_seen"] = (resume_id, resume_published)
+                else:
+                    pending["resume"] = (token, resume_id, resume_published)
+
+            if pending["resume"] is None:
+                new, newest, complete, token, walked = self._walk(
+                    channel, playlist_id, None, last_id, last_published, max_videos - len(ids)
+                )
+                ids += new
+                pages += walked
+                if newest is not None and complete:
+                    pending["last_seen"] = newest
+                elif newest is not None:
+                    pending["resume"] = (token, newest[0], newest[1])
+            s["pages"] = pages
+            s["new_ids"] = len(ids)
+            s["complete"] = pending["resume"] is None
+
+        if pending["last_seen"] is not None or pending["resume"] is not None:
+            self._pending[channel] = pending
+        return ids
+
+    def mark_seen(self, channel: str):
+        """
+        Salvează starea crawl-ului curent: markerul nou (dacă parcurgerea a ajuns la cel vechi sau
+        la capăt) și / sau punctul de reluare. Se apelează abia după ce videourile sunt salvate.
+        """
+        pending = self._pending.pop(channel, None)
+        now = datetime.datetime.utcnow().isoformat()
+        if pending is None:
+            self.conn.execute("UPDATE channels SET last_crawled_at = ? WHERE channel_id = ?", (now, channel))
+            self.conn.commit()
+            return
+        if pending["last_seen"] is not None:
+            self.conn.execute(
+                "UPDATE channels SET last_seen_video_id = ?, last_seen_published_at = ? WHERE channel_id = ?",
+                (*pending["last_seen"], channel),
+            )
+        self.conn.execute(
+            """
+            UPDATE channels
+            SET resume_page_token = ?, resume_newest_video_id = ?, resume_newest_published_at = ?, last_crawled_at = ?
+            WHERE channel_id = ?
+            """,
+            (*(pending["resume"] or (None, None, None)), now, channel),
+        )
+        self.conn.commit()
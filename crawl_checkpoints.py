@@ -0,0 +1,126 @@
+"""
+Checkpoint-uri persistente pentru crawl-uri reluabile (`youtube_to_sqlite.py --resume`).
+
+Tabele:
+  crawl_checkpoints(source, position, max_results, page_token, pages, video_ids, status)
+      - o linie per query din crawl-ul curent; `page_token` e următoarea pagină de cerut,
+        `video_ids` ID-urile strânse până acum (JSON)
+      - status: searching (în curs) -> searched (toate paginile) -> planned (ID-urile au
+        intrat în crawl_pending)
+  crawl_pending(video_id)
+      - ID-urile planificate pentru `videos.list` care n-au fost încă salvate; se șterg
+        lot cu lot, după upsert. Un crawl nou (fără --resume) le păstrează și le cere
+        împreună cu ale lui: markerele canalelor pot fi deja trecute de ele.
+
+Checkpoint-ul unei pagini se scrie imediat după răspunsul ei, deci un crash sau quota
+epuizată pierde cel mult pagina în curs. Canalele nu au checkpoint: paginile de uploads
+costă 1 unitate, iar ultimul video văzut se salvează doar când niciun ID al canalului
+nu mai e în crawl_pending.
+"""
+import datetime
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+
+def init_checkpoint_tables(conn: sqlite3.Connection):
+    """Creează tabelele crawl_checkpoints și crawl_pending (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            source TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            max_results INTEGER NOT NULL,
+            page_token TEXT,
+            pages INTEGER NOT NULL DEFAULT 0,
+            video_ids TEXT NOT NULL DEFAULT '[]',
+            status TEXT NOT NULL DEFAULT 'searching',   -- searching | searched | planned
+            updated_at TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS crawl_pending (
+            video_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+class CrawlCheckpoints:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        init_checkpoint_tables(conn)
+        conn.commit()
+
+    def has_crawl(self) -> bool:
+        """Există un crawl neterminat (query-uri sau loturi de detalii rămase)?"""
+        return bool(
+            self.conn.execute("SELECT 1 FROM crawl_checkpoints LIMIT 1").fetchone()
+            or self.conn.execute("SELECT 1 FROM crawl_pending LIMIT 1").fetchone()
+        )
+
+    def start(self, schedule: Dict[str, int]):
+        """
+        Începe un crawl nou: înlocuiește query-urile (query -> max_results). `crawl_pending` rămâne:
+        videourile planificate de un crawl neterminat sunt cerute și de cel nou.
+        """
+        self.conn.execute("DELETE FROM crawl_checkpoints")
+        now = datetime.datetime.utcnow().isoformat()
+        self.conn.executemany(
+            "INSERT INTO crawl_checkpoints (source, position, max_results, updated_at) VALUES (?, ?, ?, ?)",
+            [(q, i, limit, now) for i, (q, limit) in enumerate(schedule.items()) if limit > 0],
+        )
+        self.conn.commit()
+
+    def schedule(self) -> Dict[str, int]:
+        """Query-urile crawl-ului salvat, cu limita lor (pentru --resume)."""
+        return dict(self.conn.execute("SELECT source, max_results FROM crawl_checkpoints ORDER BY position"))
+
+    def get(self, source: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT page_token, pages, video_ids, status FROM crawl_checkpoints WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"page_token": row[0], "pages": row[1], "video_ids": json.loads(row[2]), "status": row[3]}
+
+    def save_page(self, source: str, video_ids: List[str], next_page_token: Optional[str], done: bool):
+        """Checkpoint după fiecare pagină de search (commit imediat)."""
+        self.conn.execute(
+            """
+            UPDATE crawl_checkpoints
+            SET page_token = ?, pages = pages + 1, video_ids = ?, status = ?, updated_at = ?
+            WHERE source = ?
+            """,
+            (
+                None if done else next_page_token,
+                json.dumps(video_ids),
+                "searched" if done else "searching",
+                datetime.datetime.utcnow().isoformat(),
+                source,
+            ),
+        )
+        self.conn.commit()
+
+    def add_pending(self, video_ids: Iterable[str]):
+        """Adaugă ID-urile planificate și marchează query-urile terminate ca `planned` (o tranzacție)."""
+        self.conn.executemany("INSERT OR IGNORE INTO crawl_pending (video_id) VALUES (?)", ((v,) for v in video_ids))
+        self.conn.execute("UPDATE crawl_checkpoints SET status = 'planned' WHERE status = 'searched'")
+        self.conn.commit()
+
+    def pending(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT video_id FROM crawl_pending")]
+
+    def batch_done(self, video_ids: List[str]):
+        """Scoate un lot din pending după ce detaliile lui au fost salvate."""
+        self.conn.executemany("DELETE FROM crawl_pending WHERE video_id = ?", ((v,) for v in video_ids))
+        self.conn.commit()
+
+    def finish_if_complete(self) -> bool:
+        """Șterge checkpoint-urile dacă toate query-urile sunt planificate și nu mai e nimic pending."""
+        incomplete = self.conn.execute(
+            "SELECT COUNT(*) FROM crawl_checkpoints WHERE status != 'planned'"
+        ).fetchone()[0]
+        if incomplete or self.conn.execute("SELECT 1 FROM crawl_pending LIMIT 1").fetchone():
+            return False
+        self.conn.execute("DELETE FROM crawl_checkpoints")
+        self.conn.commit()
+        return True
@@ -0,0 +1,101 @@
+"""
+Planificarea unui crawl: ID-urile din toate query-urile și canalele sunt strânse mai întâi,
+deduplicate global și filtrate de cele deja în DB, apoi cerute la `videos.list` în loturi
+pline de 50.
+
+Fără planner, fiecare query își cerea separat detaliile, deci un video găsit de 5 query-uri
+suprapuse ("fashion haul", "fashion haul 2025", ...) era descărcat și scris de 5 ori, iar
+ultimul lot al fiecărui query era aproape gol.
+
+    plan = CrawlPlan()
+    plan.add("fashion haul", ids)
+    plan.skip_known(plan.find_known(conn))
+    details = fetch_video_details(youtube, plan.ids)   # loturi de VIDEOS_BATCH
+    print(plan.report())
+"""
+import math
+import sqlite3
+from typing import Dict, Iterable, List
+
+from video_archive import VideoArchive, has_archive
+
+VIDEOS_BATCH = 50
+# Cost în unități de quota YouTube Data API v3 per apel
+QUOTA_COST = {"search": 100, "videos": 1, "playlistItems": 1, "channels": 1}
+
+
+class CrawlPlan:
+    def __init__(self):
+        self.ids: List[str] = []
+        self._seen = set()
+        self.collected = 0
+        self.duplicates = 0
+        self.known = 0
+        self.per_source: Dict[str, int] = {}
+
+    def add(self, source: str, video_ids: Iterable[str]) -> int:
+        """Adaugă rezultatele unui query / canal; întoarce câte ID-uri erau noi în crawl."""
+        added = 0
+        total = 0
+        for vid in video_ids:
+            total += 1
+            if vid in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(vid)
+            self.ids.append(vid)
+            added += 1
+        self.collected += total
+        self.per_source[source] = self.per_source.get(source, 0) + total
+        return added
+
+    def find_known(self, conn: sqlite3.Connection, chunk: int = 500) -> set:
+        """
+        ID-urile din plan care există deja în `videos` sau în partițiile arhivate (video_archive),
+        prin lookup pe cheia primară, în loturi.
+        """
+        known = set()
+        for i in range(0, len(self.ids), chunk):
+            batch = self.ids[i : i + chunk]
+            placeholders = ",".join("?" * len(batch))
+            known.update(
+                r[0] for r in conn.execute(f"SELECT video_id FROM videos WHERE video_id IN ({placeholders})", batch)
+            )
+        if has_archive(conn):
+            known |= VideoArchive(conn).known_ids(vid for vid in self.ids if vid not in known)
+        return known
+
+    def skip_known(self, known: set):
+        """Scoate din plan ID-urile deja salvate (rezultatul lui `find_known`)."""
+        self.ids = [vid for vid in self.ids if vid not in known]
+        self.known = len(known)
+
+    def batches(self) -> List[List[str]]:
+        return [self.ids[i : i + VIDEOS_BATCH] for i in range(0, len(self.ids), VIDEOS_BATCH)]
+
+    def stats(self) -> Dict:
+        """
+        Apeluri `videos.list` planificate față de varianta fără planner (câte un set de
+        loturi per query / canal, cu duplicate și videouri deja cunoscute incluse).
+        """
+        naive_calls = sum(math.ceil(n / VIDEOS_BATCH) for n in self.per_source.values())
+        calls = math.ceil(len(self.ids) / VIDEOS_BATCH)
+        return {
+            "collected": self.collected,
+            "duplicates": self.duplicates,
+            "known": self.known,
+            "to_fetch": len(self.ids),
+            "videos_calls": calls,
+            "naive_videos_calls": naive_calls,
+            "quota_saved": (naive_calls - calls) * QUOTA_COST["videos"],
+            "batch_fill": len(self.ids) / (calls * VIDEOS_BATCH) if calls else 1.0,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (
+            f"Crawl plan: {s['collected']} IDs collected, {s['duplicates']} duplicates across queries/channels, "
+            f"{s['known']} already in DB -> {s['to_fetch']} to fetch in {s['videos_calls']} videos.list calls "
+            f"(batch fill {s['batch_fill']:.0%}; {s['naive_videos_calls']} calls without planning, "
+            f"quota saved: {s['quota_saved']} units)"
+        )
@@ -0,0 +1,172 @@
+"""
+Conexiuni SQLite comune pentru toate scripturile: WAL, pragma-uri tunate, conexiuni
+read-only pentru cititori și un pool thread-safe pentru procesul FastAPI.
+
+    from db_connection import connect_writer, connect_reader, get_pool
+
+    conn = connect_writer("youtube_videos.db")          # ingestie / trend runs
+    conn = connect_reader("youtube_videos.db")          # view_trends, workers
+    with get_pool("youtube_videos.db").connection() as conn:   # API
+        ...
+
+În WAL cititorii nu blochează scriitorul și nici invers; `busy_timeout` acoperă
+restul cazurilor (doi scriitori simultani) în loc de "database is locked" imediat.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+BUSY_TIMEOUT_MS = 10000
+CACHE_SIZE_KIB = 64 * 1024  # 64 MiB page cache per conexiune
+MMAP_SIZE = 256 * 1024 * 1024
+WAIT_POLL_SECONDS = 0.1  # pool plin: cât de des se reverifică locurile libere
+
+# Pragma-uri aplicate pe fiecare conexiune (nu sunt persistente în fișier)
+CONNECTION_PRAGMAS = (
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KIB}",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def _apply_pragmas(conn: sqlite3.Connection):
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
+def connect_writer(db_path: str, row_factory=None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Conexiune read-write. Trece baza în WAL (persistent în fișier) cu synchronous=NORMAL:
+    durabil la crash-ul aplicației, fără fsync la fiecare commit.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=check_same_thread)
+    _apply_pragmas(conn)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+
+def reader_uri(db_path: str) -> str:
+    return Path(db_path).resolve().as_uri() + "?mode=ro"
+
+
+def connect_reader(db_path: str, row_factory=None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Conexiune read-only (URI mode=ro): nu poate crea fișierul, nu poate scrie și nu ține
+    lock-uri de scriere. Ridică sqlite3.OperationalError dacă baza nu există.
+    """
+    conn = sqlite3.connect(
+        reader_uri(db_path), uri=True, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=check_same_thread
+    )
+    _apply_pragmas(conn)
+    conn.execute("PRAGMA query_only = ON")
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+
+class ConnectionPool:
+    """
+    Pool thread-safe de conexiuni (implicit read-only), creat leneș până la `size`.
+    `_created` numără toate conexiunile vii (libere + împrumutate), deci nu trece de `size`
+    nici după `close()`: conexiunile împrumutate atunci sunt închise la `release()`.
+    """
+
+    def __init__(self, db_path: str, size: int = 8, readonly: bool = True, row_factory=sqlite3.Row):
+        self.db_path = db_path
+        self.size = size
+        self.readonly = readonly
+        self.row_factory = row_factory
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._in_use: set = set()
+        self._retired: set = set()  # împrumutate la `close()`; se închid când revin
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> sqlite3.Connection:
+        factory = connect_reader if self.readonly else connect_writer
+        return factory(self.db_path, row_factory=self.row_factory, check_same_thread=False)
+
+    def acquire(self, timeout: float = None) -> sqlite3.Connection:
+        conn = self._acquire(timeout)
+        with self._lock:
+            self._in_use.add(conn)
+        return conn
+
+    def _acquire(self, timeout: float = None) -> sqlite3.Connection:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    try:
+                        return self._new_connection()
+                    except Exception:
+                        self._created -= 1
+                        raise
+            # Așteptare pe coadă, cu reverificare: o conexiune retrasă de `close()` eliberează un loc fără put()
+            wait = WAIT_POLL_SECONDS if deadline is None else min(WAIT_POLL_SECONDS, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def release(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._in_use.discard(conn)
+            retired = conn in self._retired
+            if retired:
+                self._retired.discard(conn)
+                self._created -= 1
+        if retired:
+            conn.close()
+            return
+        if not self.readonly and conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Închide conexiunile libere; cele împrumutate sunt închise când revin (nu se refolosesc)."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._created -= 1
+            self._retired |= self._in_use
+
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, readonly: bool = True, size: int = 8) -> ConnectionPool:
+    """Pool partajat per (db_path, readonly) în procesul curent."""
+    key = (str(Path(db_path).resolve()), readonly)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path, size=size, readonly=readonly)
+        return pool
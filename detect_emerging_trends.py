@@ -5,7 +5,8 @@ Detectează trenduri emergente din videouri YouTube salvate în baza de date.
 Algoritm:
 1. Citește toate videouri din tabelul `videos`
 2. Extrage trenduri din fiecare video folosind Gemini AI
-3. Grupează după trend_name normalizat (lowercase, fără emoji)
+3. Grupează după trend_name normalizat (lowercase, fără emoji), cu variantele de nume
+   ("oversized blazer trend" / "oversized blazers") unite prin MinHash/LSH (trend_aliases)
 4. Calculează metrici: num_videos, total_views, avg_views, first_seen_at, last_seen_at
 5. Score = num_videos * log(1 + total_views) / zile_de_când_a_apărut
 6. Filtrează "emerging": num_videos >= 3, total_views între 10k-500k, first_seen_at în ultimele 7-10 zile
@@ -27,6 +28,14 @@ from collections import defaultdict
 from dotenv import load_dotenv, find_dotenv
 import google.generativeai as genai
 
+from db_connection import connect_writer
+from instrumentation import incr, log_summary, span
+from profiling import add_profile_args, profiled
+from trend_aliases import DEFAULT_THRESHOLD, resolve_aliases
+from trend_export import add_export_args, export_after_run
+from trend_store import init_trend_videos_table, replace_trend_videos
+from video_storage import hydrate_videos
+
 load_dotenv(find_dotenv())
 
 GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -73,6 +82,7 @@ def init_trends_table(conn: sqlite3.Connection):
         )
         """
     )
+    init_trend_videos_table(conn)
     conn.commit()
 
 
@@ -83,11 +93,12 @@ def extract_trends_from_video(video: Dict[str, Any], model: genai.GenerativeMode
     """
     title = video.get("title") or ""
     description = video.get("description") or ""
-    tags_json = video.get("tags") or "[]"
-    try:
-        tags = json.loads(tags_json)
-    except:
-        tags = []
+    tags = video.get("tags") or []
+    if isinstance(tags, str):  # rând brut din `videos` (JSON)
+        try:
+            tags = json.loads(tags)
+        except:
+            tags = []
 
     prompt = f"""Analizează acest video YouTube din domeniul fashion/lifestyle și extrage trendurile sau stilurile menționate.
 
@@ -102,7 +113,9 @@ Dacă nu găsești trenduri clare, returnează o listă goală: []
 """
 
     try:
-        response = model.generate_content(prompt)
+        with span("detect.gemini_api", video_id=video.get("video_id")):
+            incr("api_calls", api="gemini", endpoint="generate_content")
+            response = model.generate_content(prompt)
         text = response.text.strip()
         
         # Extrage JSON din răspuns (poate fi înconjurat de ```json ... ```)
@@ -113,6 +126,7 @@ Dacă nu găsești trenduri clare, returnează o listă goală: []
                 return [str(t).strip() for t in trends if t]
         return []
     except Exception as e:
+        incr("api_errors", api="gemini", endpoint="generate_content")
         print(f"  [WARN] Failed to extract trends for video {video.get('video_id')}: {e}")
         return []
 
@@ -133,11 +147,11 @@ def detect_emerging_trends(
     min_videos: int = 3,
     min_views: int = 10000,
     max_views: int = 500000,
+    alias_threshold: float = DEFAULT_THRESHOLD,
 ):
     """Pipeline principal pentru detectarea trendurilor emergente."""
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = connect_writer(db_path, row_factory=sqlite3.Row)
     cur = conn.cursor()
     
     init_trends_table(conn)
@@ -145,7 +159,7 @@ def detect_emerging_trends(
     # 1. Citește toate videouri
     print("1. Fetching all videos from database...")
     cur.execute("SELECT * FROM videos ORDER BY publish_date DESC")
-    videos = [dict(row) for row in cur.fetchall()]
+    videos = hydrate_videos(conn, [dict(row) for row in cur.fetchall()])
     print(f"   Found {len(videos)} videos")
     
     if not videos:
@@ -162,61 +176,82 @@ def detect_emerging_trends(
     
     video_trends = []  # listă de (video, trend_name_normalized, publish_date, views)
     
-    for i, video in enumerate(videos):
-        if i % 10 == 0:
-            print(f"   Processing video {i+1}/{len(videos)}...")
-        
-        raw_trends = extract_trends_from_video(video, model)
-        for trend in raw_trends:
-            normalized = normalize_trend_name(trend)
-            if normalized:
-                video_trends.append({
-                    "video_id": video["video_id"],
-                    "trend_name": normalized,
-                    "publish_date": video["publish_date"],
-                    "view_count": video.get("view_count") or 0,
-                })
+    with span("detect.extract", rows=len(videos)):
+        for i, video in enumerate(videos):
+            if i % 10 == 0:
+                print(f"   Processing video {i+1}/{len(videos)}...")
+            
+            raw_trends = extract_trends_from_video(video, model)
+            for trend in raw_trends:
+                normalized = normalize_trend_name(trend)
+                if normalized:
+                    video_trends.append({
+                        "video_id": video["video_id"],
+                        "trend_name": normalized,
+                        "publish_date": video["publish_date"],
+                        "view_count": video.get("view_count") or 0,
+                    })
     
+    incr("rows_processed", stage="detect.extract", value=len(videos))
     print(f"   Extracted {len(video_trends)} trend mentions")
     
-    # 3. Grupează după trend_name
+    # 3. Grupează după trend_name (canonic)
     print("3. Grouping trends and calculating metrics...")
+    if alias_threshold < 1:
+        with span("detect.aliases") as alias_span:
+            mention_counts = defaultdict(int)
+            for vt in video_trends:
+                mention_counts[vt["trend_name"]] += 1
+            aliases = resolve_aliases(conn, mention_counts, threshold=alias_threshold)
+            conn.commit()
+            alias_span["raw_names"] = len(aliases)
+            alias_span["canonical"] = len(set(aliases.values()))
+        print(f"   Merged {len(aliases)} raw trend names into {len(set(aliases.values()))} canonical trends")
+        for vt in video_trends:
+            vt["trend_name"] = aliases[vt["trend_name"]]
+
     trend_groups = defaultdict(list)
+    seen_mentions = set()
     for vt in video_trends:
+        # Un video care menționează două variante ale aceluiași trend contează o singură dată
+        if (vt["trend_name"], vt["video_id"]) in seen_mentions:
+            continue
+        seen_mentions.add((vt["trend_name"], vt["video_id"]))
         trend_groups[vt["trend_name"]].append(vt)
     
     now = datetime.datetime.utcnow()
     trend_metrics = []
     
-    for trend_name, occurrences in trend_groups.items():
-        num_videos = len(occurrences)
-        total_views = sum(occ["view_count"] for occ in occurrences)
-        avg_views = total_views / num_videos if num_videos > 0 else 0
+    with span("detect.score", trends=len(trend_groups)):
+        for trend_name, occurrences in trend_groups.items():
+            num_videos = len(occurrences)
+            total_views = sum(occ["view_count"] for occ in occurrences)
+            avg_views = total_views / num_videos if num_videos > 0 else 0
+            
+            dates = [occ["publish_date"] for occ in occurrences if occ["publish_date"]]
+            if not dates:
+                continue
+            
+            dates_sorted = sorted(dates)
+            first_seen_at = dates_sorted[0]
+            last_seen_at = dates_sorted[-1]
+            
+            days_since = calculate_days_since(first_seen_at, now)
+            
+            # Score = num_videos * log(1 + total_views) / zile
+            score = (num_videos * math.log(1 + total_views)) / days_since
+            
+            trend_metrics.append({
+                "name": trend_name,
+                "score": score,
+                "num_videos": num_videos,
+                "total_views": total_views,
+                "avg_views": avg_views,
+                "first_seen_at": first_seen_at,
+                "last_seen_at": last_seen_at,
+                "days_since": days_since,
+            })
         
-        dates = [occ["publish_date"] for occ in occurrences if occ["publish_date"]]
-        if not dates:
-            continue
-        
-        dates_sorted = sorted(dates)
-        first_seen_at = dates_sorted[0]
-        last_seen_at = dates_sorted[-1]
-        
-        days_since = calculate_days_since(first_seen_at, now)
-        
-        # Score = num_videos * log(1 + total_views) / zile
-        score = (num_videos * math.log(1 + total_views)) / days_since
-        
-        trend_metrics.append({
-            "name": trend_name,
-            "score": score,
-            "num_videos": num_videos,
-            "total_views": total_views,
-            "avg_views": avg_views,
-            "first_seen_at": first_seen_at,
-            "last_seen_at": last_seen_at,
-            "days_since": days_since,
-        })
-    
     # 4. Filtrează emerging trends
     print("4. Filtering emerging trends...")
     emerging = []
@@ -235,28 +270,37 @@ def detect_emerging_trends(
     
     # 5. Salvează în tabelul trends
     print("5. Saving to trends table...")
-    cur.execute("DELETE FROM trends")  # Clear previous results
-    
-    detected_at = now.isoformat()
-    for trend in emerging:
-        cur.execute(
-            """
-            INSERT INTO trends (name, score, num_videos, total_views, avg_views, first_seen_at, last_seen_at, detected_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                trend["name"],
-                trend["score"],
-                trend["num_videos"],
-                trend["total_views"],
-                trend["avg_views"],
-                trend["first_seen_at"],
-                trend["last_seen_at"],
-                detected_at,
-            ),
-        )
-    
-    conn.commit()
+    with span("detect.save", trends=len(emerging)):
+        cur.execute("DELETE FROM trends")  # Clear previous results
+        
+        detected_at = now.isoformat()
+        for trend in emerging:
+            cur.execute(
+                """
+                INSERT INTO trends (name, score, num_videos, total_views, avg_views, first_seen_at, last_seen_at, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    trend["name"],
+                    trend["score"],
+                    trend["num_videos"],
+                    trend["total_views"],
+                    trend["avg_views"],
+                    trend["first_seen_at"],
+                    trend["last_seen_at"],
+                    detected_at,
+                ),
+            )
+        
+        # Maparea trend -> videouri, pentru view_trends --trend și /trends/{name}/videos
+        replace_trend_videos(conn, {
+            trend["name"]: [
+                (occ["video_id"], occ["view_count"], occ["publish_date"])
+                for occ in trend_groups[trend["name"]]
+            ]
+            for trend in emerging
+        })
+        conn.commit()
     conn.close()
     
     print(f"\n✓ Saved {len(emerging)} emerging trends to database")
@@ -271,6 +315,8 @@ def detect_emerging_trends(
             print(f"     Score: {trend['score']:.2f} | Videos: {trend['num_videos']} | Views: {trend['total_views']:,}")
             print(f"     First seen: {trend['first_seen_at'][:10]} | Days ago: {trend['days_since']:.1f}")
 
+    log_summary("detect_emerging_trends")
+
 
 def parse_args():
     p = argparse.ArgumentParser(description="Detect emerging fashion trends from YouTube videos")
@@ -279,18 +325,27 @@ def parse_args():
     p.add_argument("--min-videos", type=int, default=3, help="Minimum videos mentioning trend (default: 3)")
     p.add_argument("--min-views", type=int, default=10000, help="Minimum total views (default: 10000)")
     p.add_argument("--max-views", type=int, default=500000, help="Maximum total views (default: 500000)")
+    p.add_argument(
+        "--alias-threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Shingle Jaccard needed to merge trend name variants; 1 disables (default: {DEFAULT_THRESHOLD})",
+    )
+    add_export_args(p)
+    add_profile_args(p)
     return p.parse_args()
 
 
 def main():
     args = parse_args()
-    detect_emerging_trends(
-        db_path=args.db,
-        days_window=args.days,
-        min_videos=args.min_videos,
-        min_views=args.min_views,
-        max_views=args.max_views,
-    )
+    with profiled("detect_emerging_trends", args.profile, args.profile_dir):
+        detect_emerging_trends(
+            db_path=args.db,
+            days_window=args.days,
+            min_videos=args.min_videos,
+            min_views=args.min_views,
+            max_views=args.max_views,
+            alias_threshold=args.alias_threshold,
+        )
+        export_after_run(args.db, args)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,20 @@
+import json
 import os
+import threading
+from contextlib import contextmanager
 import requests
 from dotenv import load_dotenv, find_dotenv
 import google.generativeai as genai
 from google.generativeai import protos
 
+from instrumentation import incr, span
+from shared_cache import get_store
+
 # Auto-load a .env file if present in this directory or any parent directory.
 # This allows local `.env` files (project root or subfolder) to provide
 # `GOOGLE_API_KEY` and `YOUTUBE_API_KEY` without exporting them manually.
 load_dotenv(find_dotenv())
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 # ================== CONFIG ==================
 
@@ -22,10 +28,20 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 if not YOUTUBE_API_KEY:
     raise ValueError("Cheia YOUTUBE_API_KEY nu este setată!")
 
-YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
-YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+# YOUTUBE_API_ROOT permite redirecționarea către un stand-in local (http_standin.py)
+YOUTUBE_API_ROOT = os.getenv("YOUTUBE_API_ROOT", "https://www.googleapis.com").rstrip("/")
+YOUTUBE_SEARCH_URL = f"{YOUTUBE_API_ROOT}/youtube/v3/search"
+YOUTUBE_VIDEOS_URL = f"{YOUTUBE_API_ROOT}/youtube/v3/videos"
 REQUEST_TIMEOUT = 10
 
+# Bugetul (estimat) de tokeni al rezultatului de tool trimis înapoi modelului
+TOOL_TOKEN_BUDGET = int(os.getenv("STYLX_TOOL_TOKEN_BUDGET", "300"))
+TOOL_TOP_K = int(os.getenv("STYLX_TOOL_TOP_K", "6"))
+TOOL_TITLE_CHARS = 60
+TOOL_MIN_TITLE_CHARS = 32
+# Cât timp rămâne valabil un rezultat de tool în cache (secunde)
+TOOL_CACHE_TTL = float(os.getenv("STYLX_TOOL_CACHE_TTL", str(6 * 3600)))
+
 # ================== TOOL ==================
 
 def _offline_fallback(style: str, reason: str) -> Dict[str, Any]:
@@ -33,6 +49,7 @@ def _offline_fallback(style: str, reason: str) -> Dict[str, Any]:
     Returnează date mock astfel încât agentul să poată funcționa
     atunci când nu avem acces la API-ul YouTube (de ex. offline / sandbox).
     """
+    incr("offline_fallbacks", reason=reason)
     sample_videos = [
         {
             "video_id": "mock1",
@@ -64,6 +81,7 @@ def _offline_fallback(style: str, reason: str) -> Dict[str, Any]:
         "style": style,
         "videos": sample_videos,
         "note": f"Date mock (nu am putut accesa API-ul YouTube: {reason})",
+        "offline": True,
     }
 
 
@@ -94,12 +112,15 @@ def get_fashion_youtube_trends(
     }
 
     try:
-        search_resp = requests.get(
-            YOUTUBE_SEARCH_URL, params=search_params, timeout=REQUEST_TIMEOUT
-        )
-        search_resp.raise_for_status()
-        items = search_resp.json().get("items", [])
+        with span("agent.youtube_search", style=style):
+            incr("api_calls", api="youtube", endpoint="search")
+            search_resp = requests.get(
+                YOUTUBE_SEARCH_URL, params=search_params, timeout=REQUEST_TIMEOUT
+            )
+            search_resp.raise_for_status()
+            items = search_resp.json().get("items", [])
     except requests.RequestException as exc:
+        incr("api_errors", api="youtube", endpoint="search")
         print(f"[WARN] Nu putem interoga YouTube Search API: {exc}")
         return _offline_fallback(style, "eroare conexiune search")
 
@@ -115,12 +136,15 @@ def get_fashion_youtube_trends(
     }
 
     try:
-        videos_resp = requests.get(
-            YOUTUBE_VIDEOS_URL, params=videos_params, timeout=REQUEST_TIMEOUT
-        )
-        videos_resp.raise_for_status()
-        videos_data = videos_resp.json()
+        with span("agent.youtube_videos", ids=len(video_ids)):
+            incr("api_calls", api="youtube", endpoint="videos")
+            videos_resp = requests.get(
+                YOUTUBE_VIDEOS_URL, params=videos_params, timeout=REQUEST_TIMEOUT
+            )
+            videos_resp.raise_for_status()
+            videos_data = videos_resp.json()
     except requests.RequestException as exc:
+        incr("api_errors", api="youtube", endpoint="videos")
         print(f"[WARN] Nu putem interoga YouTube Videos API: {exc}")
         return _offline_fallback(style, "eroare conexiune detalii video")
 
@@ -158,6 +182,166 @@ def get_fashion_youtube_trends(
     }
 
 
+# ================== TOOL CACHE ==================
+
+def normalize_style(style: str) -> str:
+    """Cheia unui stil în cache-uri și în deduplicarea job-urilor ("Quiet  Luxury" == "quiet luxury")."""
+    return " ".join(str(style).lower().split())
+
+
+class ToolResultCache:
+    """
+    Rezultate `get_fashion_youtube_trends` per (stil, max_results, regiune), cu TTL, în
+    store-ul partajat (`shared_cache.py`), deci comune tuturor workerilor API-ului.
+    Intrările puse de warmer (`cache_warmer.py`) sunt marcate, ca să știm câte cereri
+    au fost servite din încălzire (warm hits). Statisticile sunt per worker.
+    """
+
+    namespace = "tool"
+
+    def __init__(self, ttl: float = TOOL_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"hits": 0, "warm_hits": 0, "misses": 0}
+
+    @property
+    def store(self):
+        return get_store()
+
+    @contextmanager
+    def uncounted(self):
+        """Lookup-urile din thread-ul curent nu intră în statistici (ex. warmer-ul care generează răspunsuri)."""
+        self._local.uncounted = True
+        try:
+            yield
+        finally:
+            self._local.uncounted = False
+
+    @staticmethod
+    def key(style: str, max_results: int = 8, region_code: str = "US") -> str:
+        try:
+            max_results = max(1, int(max_results))
+        except (TypeError, ValueError):
+            max_results = 5  # aceeași normalizare ca în get_fashion_youtube_trends
+        return f"{normalize_style(style)}|{max_results}|{region_code}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        hit = self.store.get(self.namespace, key)
+        if getattr(self._local, "uncounted", False):
+            return None if hit is None else hit[0]
+        with self._lock:
+            if hit is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+                self.stats["warm_hits"] += hit[1]
+        if hit is None:
+            incr("cache_misses", cache="tool")
+            return None
+        incr("cache_hits", cache="tool", warmed=hit[1])
+        return hit[0]
+
+    def fresh(self, key: str) -> bool:
+        return self.store.get(self.namespace, key) is not None
+
+    def put(self, key: str, result: Dict[str, Any], warmed: bool = False):
+        if result.get("offline"):
+            return  # datele mock nu se păstrează: următoarea cerere reîncearcă API-ul
+        self.store.put(self.namespace, key, result, self.ttl, warmed=warmed)
+
+
+tool_cache = ToolResultCache()
+
+
+def cached_fashion_youtube_trends(style: str, max_results: int = 8, region_code: str = "US", warmed: bool = False):
+    """
+    `get_fashion_youtube_trends` prin `tool_cache`; `warmed=True` e folosit de warmer.
+    La miss, un singur worker / thread cheamă YouTube pentru aceeași cheie, ceilalți îi
+    așteaptă rezultatul (`single_flight`).
+    """
+    key = ToolResultCache.key(style, max_results, region_code)
+    result = None if warmed else tool_cache.get(key)
+    if result is not None:
+        return result
+    with tool_cache.store.single_flight(ToolResultCache.namespace, key) as leader:
+        if not leader:
+            hit = tool_cache.store.get(ToolResultCache.namespace, key)
+            if hit is not None:
+                incr("single_flight_waits", cache="tool")
+                return hit[0]
+        result = get_fashion_youtube_trends(style, max_results=max_results, region_code=region_code)
+        tool_cache.put(key, result, warmed=warmed)
+    return result
+
+
+# ================== COMPACT TOOL PAYLOAD ==================
+
+def estimate_tokens(text: str) -> int:
+    """Estimare rapidă (~4 caractere / token), suficientă pentru buget; valorile exacte vin în usage_metadata."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def compact_number(n: int) -> str:
+    """125000 -> '125K', 1250000 -> '1.2M'."""
+    for threshold, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if n >= threshold:
+            value = n / threshold
+            return f"{value:.1f}".rstrip("0").rstrip(".") + suffix if value < 10 else f"{value:.0f}{suffix}"
+    return str(n)
+
+
+def _truncate(text: Optional[str], limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def compact_tool_payload(
+    result: Dict[str, Any],
+    token_budget: int = TOOL_TOKEN_BUDGET,
+    top_k: int = TOOL_TOP_K,
+) -> Dict[str, Any]:
+    """
+    Varianta compactă a rezultatului `get_fashion_youtube_trends` pentru FunctionResponse:
+    top-k videouri după views, ca rânduri sub `cols` (fără chei repetate), titluri trunchiate,
+    views ca 125K / 1.2M, doar luna publicării și fără URL-uri (linkul = youtu.be/<id>).
+
+    Dacă estimarea depășește `token_budget`, titlurile se scurtează până la TOOL_MIN_TITLE_CHARS,
+    apoi se renunță la videourile cu cele mai puține views (rămâne cel puțin unul).
+    """
+    videos = sorted(result.get("videos", []), key=lambda v: v.get("view_count") or 0, reverse=True)[:top_k]
+
+    def build(title_chars: int, count: int) -> Dict[str, Any]:
+        rows = [
+            [
+                v.get("video_id"),
+                _truncate(v.get("title"), title_chars),
+                _truncate(v.get("channel"), 24),
+                compact_number(v.get("view_count") or 0),
+                (v.get("published_at") or "")[:7],
+            ]
+            for v in videos[:count]
+        ]
+        return {
+            "style": result.get("style"),
+            "note": result.get("note"),
+            "cols": ["id", "title", "channel", "views", "month"],
+            "rows": rows,
+        }
+
+    title_chars, count = TOOL_TITLE_CHARS, len(videos)
+    payload = build(title_chars, count)
+    while estimate_tokens(json.dumps(payload, ensure_ascii=False)) > token_budget:
+        if title_chars > TOOL_MIN_TITLE_CHARS:
+            title_chars = max(TOOL_MIN_TITLE_CHARS, title_chars - 8)
+        elif count > 1:
+            count -= 1
+        else:
+            break
+        payload = build(title_chars, count)
+    return payload
+
+
 # ================== AGENT CONFIG ==================
 
 SYSTEM_PROMPT = """
@@ -172,8 +356,21 @@ Răspuns structurat:
 1) Rezumat trend
 2) Idei de outfit-uri
 3) Videouri recomandate: Titlu + Canal + Link + Popularitate
+
+Rezultatul tool-ului vine compact: `rows` cu coloanele din `cols`;
+linkul unui video este https://youtu.be/<id>.
 """
 
+TOOL_NAME = "get_fashion_youtube_trends"
+
+
+def style_prompt(style: str) -> str:
+    """Mesajul trimis agentului pentru analiza unui stil (API + warmer, ca răspunsurile să fie interschimbabile)."""
+    return (
+        f"Analizează trendurile pentru stilul '{style}' "
+        f"și generează idei de outfit + videouri YouTube."
+    )
+
 tools_list = [
     get_fashion_youtube_trends
 ]
@@ -187,34 +384,86 @@ model = genai.GenerativeModel(
 
 # ================== CORE RUNNER ==================
 
-def run_fashion_agent(user_message: str) -> str:
-
-    chat = model.start_chat()
-    response = chat.send_message(user_message)
-
-    parts = response.candidates[0].content.parts
-    part = parts[0]
-
-    while getattr(part, "function_call", None):
-        func = part.function_call
-        args = dict(func.args)
-
-        print(f"[AGENT] Gemini cere apelarea: {func.name}(**{args})")
+USAGE_FIELDS = {
+    "prompt_token_count": "prompt_tokens",
+    "candidates_token_count": "output_tokens",
+    "cached_content_token_count": "cached_tokens",
+    "total_token_count": "total_tokens",
+}
+
+
+def _send(chat, content, usage: Dict[str, int]):
+    with span("agent.gemini_api"):
+        incr("api_calls", api="gemini", endpoint="send_message")
+        response = chat.send_message(content)
+    usage["model_calls"] = usage.get("model_calls", 0) + 1
+    metadata = getattr(response, "usage_metadata", None)
+    for field, name in USAGE_FIELDS.items():
+        tokens = getattr(metadata, field, 0) or 0
+        usage[name] = usage.get(name, 0) + tokens
+        if tokens:
+            incr("gemini_tokens", tokens, kind=name)
+    return response
+
+
+def _tool_response(name: str, args: Dict[str, Any], usage: Dict[str, int]) -> List:
+    print(f"[AGENT] Gemini cere apelarea: {name}(**{args})")
+    with span("agent.tool", tool=name):
+        payload = compact_tool_payload(cached_fashion_youtube_trends(**args))
+    tokens = estimate_tokens(json.dumps(payload, ensure_ascii=False))
+    usage["tool_payload_tokens"] = usage.get("tool_payload_tokens", 0) + tokens
+    incr("tool_payload_tokens", tokens, tool=name)
+    return [
+        protos.Part(
+            function_response=protos.FunctionResponse(name=name, response={"result": payload})
+        )
+    ]
 
-        result = get_fashion_youtube_trends(**args)
 
-        response = chat.send_message(
-            content=[
-                protos.Part(
-                    function_response=protos.FunctionResponse(
-                        name=func.name,
-                        response={"result": result},
-                    )
-                )
-            ]
-        )
+def _template_history(user_message: str, style: str) -> List:
+    """
+    Istoric pregătit pentru cererile cu stil cunoscut: mesajul userului + apelul de tool pe care
+    modelul l-ar cere oricum. Primul send e direct rezultatul tool-ului, deci un apel Gemini
+    (cu system prompt + declarații de tool) mai puțin per cerere.
+    """
+    call = protos.FunctionCall(name=TOOL_NAME, args={"style": style})
+    return [
+        protos.Content(role="user", parts=[protos.Part(text=user_message)]),
+        protos.Content(role="model", parts=[protos.Part(function_call=call)]),
+    ]
 
-        parts = response.candidates[0].content.parts
-        part = parts[0]
 
-    return part.text
\ No newline at end of file
+def run_fashion_agent(
+    user_message: str,
+    style: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None,
+) -> str:
+    """
+    Rulează agentul pe un mesaj. Cu `style`, chat-ul pornește din `_template_history`.
+    `usage` (opțional) primește tokenii consumați de cerere: prompt / output / cached / total,
+    numărul de apeluri Gemini și tokenii estimați ai rezultatelor de tool.
+    """
+    usage = {} if usage is None else usage
+
+    with span("agent.run") as run_span:
+        tool_calls = 0
+        if style:
+            chat = model.start_chat(history=_template_history(user_message, style))
+            response = _send(chat, _tool_response(TOOL_NAME, {"style": style}, usage), usage)
+            tool_calls += 1
+        else:
+            chat = model.start_chat()
+            response = _send(chat, user_message, usage)
+
+        part = response.candidates[0].content.parts[0]
+
+        while getattr(part, "function_call", None):
+            func = part.function_call
+            response = _send(chat, _tool_response(func.name, dict(func.args), usage), usage)
+            tool_calls += 1
+            part = response.candidates[0].content.parts[0]
+
+        run_span["tool_calls"] = tool_calls
+        run_span["total_tokens"] = usage.get("total_tokens", 0)
+
+    return part.text
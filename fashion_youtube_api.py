@@ -1,6 +1,43 @@
-from fastapi import FastAPI
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from fashion_youtube_agent_core import run_fashion_agent
+from admission import CACHED_INFLIGHT, MAX_QUEUED_JOBS, AdmissionController, ClientBuckets, Rejected
+from cache_warmer import AnswerCache, CacheWarmer
+from db_connection import get_pool
+from fashion_youtube_agent_core import ToolResultCache, normalize_style, run_fashion_agent, style_prompt, tool_cache
+from instrumentation import incr, observe, render_prometheus, snapshot, span
+from job_queue import JobQueue
+from profiling import PROFILE_MODES, profiled
+from shared_cache import get_store
+from trend_store import VIDEO_SORTS, load_trend_videos
+from view_trends import load_top_trends, load_trend, trends_version
+
+TRENDS_DB = os.getenv("TRENDS_DB", "youtube_videos.db")
+JOBS_DB = os.getenv("STYLX_JOBS_DB", "jobs.db")
+JOB_WORKERS = int(os.getenv("STYLX_JOB_WORKERS", "4"))
+TRENDS_CACHE_ENTRIES = 1024  # răspunsuri /trends* păstrate per rulare de trenduri (LRU)
+
+# Modul multi-worker (gunicorn_conf.py / `uvicorn --workers`): metricile fiecărui worker sunt
+# publicate în store-ul partajat și /metrics le întoarce pe toate, cu eticheta `worker`
+MULTI_WORKER = int(os.getenv("WEB_CONCURRENCY", "1")) > 1
+WORKER_ID = str(os.getpid())
+METRICS_PUBLISH_SECONDS = 10
+
+# Header-ul X-Profile e onorat doar dacă serverul a fost pornit cu STYLX_PROFILE_REQUESTS=1
+PROFILE_REQUESTS = os.getenv("STYLX_PROFILE_REQUESTS", "").lower() in ("1", "true", "yes")
 
 app = FastAPI(
     title="Fashion & YouTube Trend Agent API",
@@ -8,11 +45,79 @@ app = FastAPI(
     version="1.0.0",
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Template-ul rutei (ex: /trends/{name}), nu path-ul brut, ca să nu explodeze numărul de serii
+    path = getattr(request.scope.get("route"), "path", request.url.path)
+    observe(f"http {request.method} {path}", time.perf_counter() - start)
+    incr("http_requests", method=request.method, path=path, status=response.status_code)
+    return response
+
+# Cererea profilată curentă ({"mode", "name", "output"}); setată de middleware, citită în thread-ul
+# care face munca (endpoint-urile `def` și `_analyze` rulează în threadpool, nu în event loop)
+_profile_target: ContextVar[Optional[Dict]] = ContextVar("profile_target", default=None)
+# cProfile / pyinstrument instalează un singur hook per proces: o singură cerere profilată odată
+_profile_lock = threading.Lock()
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """`X-Profile: cprofile|pyinstrument` profilează cererea; calea output-ului vine în X-Profile-Output."""
+    requested = request.headers.get("x-profile", "").strip().lower()
+    if not PROFILE_REQUESTS or not requested:
+        return await call_next(request)
+    if not _profile_lock.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile-Skipped"] = "another request is being profiled"
+        return response
+
+    target = {
+        "mode": requested if requested in PROFILE_MODES else "cprofile",
+        "name": "api" + request.url.path.replace("/", "_"),
+        "output": None,
+    }
+    token = _profile_target.set(target)
+    try:
+        response = await call_next(request)
+    finally:
+        _profile_target.reset(token)
+        _profile_lock.release()
+    if target["output"]:
+        response.headers["X-Profile-Output"] = target["output"]
+    return response
+
+def profile_in_thread(fn: Callable) -> Callable:
+    """Profilează `fn` în thread-ul în care rulează, dacă cererea curentă are X-Profile."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        target = _profile_target.get()
+        if target is None or target.get("started"):
+            return fn(*args, **kwargs)
+        target["started"] = True
+        info = {}
+        try:
+            with profiled(target["name"], target["mode"], quiet=True) as info:
+                return fn(*args, **kwargs)
+        finally:
+            target["output"] = info.get("output")
+    return wrapper
+
+@app.get("/metrics", response_class=PlainTextResponse)
+@profile_in_thread
+def metrics():
+    """Metrici Prometheus: durate per etapă, apeluri API, cache hits, rânduri procesate."""
+    if not MULTI_WORKER:
+        return render_prometheus()
+    store = get_store()
+    store.publish_metrics(WORKER_ID, snapshot())
+    return render_prometheus(store.worker_metrics(max_age=3 * METRICS_PUBLISH_SECONDS))
+
 @app.get("/")
 async def root():
     return {
         "message": "Fashion & YouTube Trend Agent API este activ.",
-        "usage": "Trimiteți POST la /analyze-fashion cu {'style': 'streetwear'}",
+        "usage": "Trimiteți POST la /analyze-fashion sau /jobs cu {'style': 'streetwear'}",
         "docs": "/docs"
     }
 
@@ -21,12 +126,303 @@ class FashionRequest(BaseModel):
 
 class FashionResponse(BaseModel):
     result: str
+    usage: Optional[Dict[str, int]] = None  # tokeni Gemini + apeluri model pentru cererea curentă
+
+# Warmer-ul precalculează rezultatele de tool (și opțional răspunsurile) pentru top trenduri
+answer_cache = AnswerCache()
+cache_warmer = CacheWarmer(TRENDS_DB, answer_cache)
+
+@app.on_event("startup")
+def start_cache_warmer():
+    cache_warmer.start()
+
+@app.on_event("shutdown")
+def stop_cache_warmer():
+    cache_warmer.stop()
+
+@profile_in_thread
+def _analyze(style: str) -> Dict:
+    cached = answer_cache.get(style)
+    if cached is not None:
+        return {"result": cached, "usage": {"model_calls": 0}}
+    usage = {}
+    result = run_fashion_agent(style_prompt(style), style=style, usage=usage)
+    return {"result": result, "usage": usage}
+
+# ================== ADMISSION CONTROL ==================
+
+# Per worker: cu gunicorn, fiecare proces are propriile limite și bucket-uri
+admission = AdmissionController()
+cached_admission = AdmissionController(max_inflight=CACHED_INFLIGHT)  # bandă pentru rezultate de tool în cache
+client_buckets = ClientBuckets()
+
+def _client_id(request: Request) -> str:
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "unknown")
+
+def _rejected(exc: Rejected) -> HTTPException:
+    return HTTPException(status_code=exc.status, detail=exc.reason, headers={"Retry-After": str(exc.retry_after)})
 
 @app.post("/analyze-fashion", response_model=FashionResponse)
-async def analyze_fashion(req: FashionRequest):
-    query = (
-        f"Analizează trendurile pentru stilul '{req.style}' "
-        f"și generează idei de outfit + videouri YouTube."
+async def analyze_fashion(req: FashionRequest, request: Request):
+    try:
+        client_buckets.take(_client_id(request))
+        if answer_cache.contains(req.style):
+            # Răspuns precalculat: fără apeluri externe, nu ocupă un loc din limită
+            return FashionResponse(**await run_in_threadpool(_analyze, req.style))
+        # Rezultat YouTube proaspăt (ex. încălzit): tot apeluri Gemini, dar pe banda lui, limitată
+        lane = cached_admission if tool_cache.fresh(ToolResultCache.key(req.style)) else admission
+        async with lane.admit("analyze_cached" if lane is cached_admission else "analyze"):
+            return FashionResponse(**await run_in_threadpool(_analyze, req.style))
+    except Rejected as exc:
+        raise _rejected(exc)
+
+@app.get("/admission/stats")
+async def admission_stats():
+    return {**admission.stats(), "cached_lane": cached_admission.stats()}
+
+# ================== JOBS ==================
+
+# Analizele lungi rulează în workeri; clientul face polling în loc să țină conexiunea deschisă
+jobs = JobQueue(JOBS_DB, handlers={"analyze": lambda payload: _analyze(payload["style"])}, workers=JOB_WORKERS)
+
+@app.on_event("startup")
+def start_job_workers():
+    jobs.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    jobs.stop()
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    deduplicated: bool = False
+    result: Optional[FashionResponse] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+def _job_response(job: Dict, deduplicated: bool = False) -> JobResponse:
+    return JobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        deduplicated=deduplicated,
+        result=job["result"],
+        error=job["error"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
     )
-    result = run_fashion_agent(query)
-    return FashionResponse(result=result)
\ No newline at end of file
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+@profile_in_thread
+def create_job(req: FashionRequest, request: Request, response: Response):
+    """Pune analiza în coadă; o cerere identică aflată încă în lucru primește același job."""
+    try:
+        client_buckets.take(_client_id(request))
+    except Rejected as exc:
+        raise _rejected(exc)
+    backlog = jobs.backlog()
+    if backlog >= MAX_QUEUED_JOBS:
+        incr("requests_shed", reason="job_backlog", route="jobs")
+        retry_after = max(1, int(backlog / max(JOB_WORKERS, 1) * admission.avg_seconds))
+        raise HTTPException(status_code=503, detail="Job queue full", headers={"Retry-After": str(retry_after)})
+    dedup_key = "analyze:" + normalize_style(req.style)
+    job, created = jobs.submit("analyze", {"style": req.style}, dedup_key=dedup_key)
+    response.headers["Location"] = f"/jobs/{job['job_id']}"
+    return _job_response(job, deduplicated=not created)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+@profile_in_thread
+def get_job(job_id: str, response: Response):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if job["status"] in ("queued", "running"):
+        response.headers["Retry-After"] = "2"
+    return _job_response(job)
+
+@app.get("/cache/stats")
+@profile_in_thread
+def cache_stats():
+    """Ultima rulare a warmer-ului și rata de warm hits (per worker) pentru cache-ul de tool / răspunsuri."""
+    return {"worker": WORKER_ID, **cache_warmer.stats()}
+
+# ================== TRENDS (read-only) ==================
+
+class TrendsCache:
+    """
+    Răspunsuri /trends serializate, valabile cât timp rularea de trenduri (detected_at) nu se schimbă.
+    404-urile nu se păstrează (nume arbitrare ar umple memoria), iar intrările sunt limitate (LRU).
+    """
+
+    def __init__(self, max_entries: int = TRENDS_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, version, key, loader):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = OrderedDict()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                incr("cache_hits", cache="trends")
+                return self._entries[key]
+        incr("cache_misses", cache="trends")
+        value = loader()
+        if value is None:
+            return None
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+trends_cache = TrendsCache()
+
+@contextmanager
+def _trends_snapshot():
+    """Conexiune din pool cu o tranzacție de citire, ca versiunea și datele să vină din același snapshot."""
+    try:
+        with get_pool(TRENDS_DB).connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+    except sqlite3.OperationalError as exc:
+        raise HTTPException(status_code=503, detail=f"Trends database unavailable: {exc}")
+
+def _etag(version, key) -> str:
+    return '"' + hashlib.sha1(f"{version}|{key}".encode("utf-8")).hexdigest()[:20] + '"'
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def _cached_json(request: Request, version, key, loader) -> Response:
+    """304 dacă ETag-ul clientului e la zi; altfel JSON-ul din cache (loader-ul rulează o dată per versiune)."""
+    etag = _etag(version, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        incr("not_modified", cache="trends")
+        return Response(status_code=304, headers=headers)
+
+    def load():
+        data = loader()
+        return None if data is None else json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    body = trends_cache.get(version, key, load)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/trends")
+@profile_in_thread
+def list_trends(request: Request, top: int = Query(20, ge=1, le=500)):
+    """Top N trenduri după score; suportă If-None-Match (304)."""
+    with _trends_snapshot() as conn:
+        version = trends_version(conn)
+        detected_at = version.split("|")[0] if version else None
+        return _cached_json(
+            request,
+            version,
+            f"top={top}",
+            lambda: {"detected_at": detected_at, "trends": load_top_trends(conn, top) if version else []},
+        )
+
+@app.get("/trends/{name}")
+@profile_in_thread
+def get_trend(request: Request, name: str):
+    """Detaliile unui trend; 404 dacă nu există în rularea curentă."""
+    with _trends_snapshot() as conn:
+        version = trends_version(conn)
+        if version is None:
+            raise HTTPException(status_code=404, detail=f"Trend '{name}' not found")
+        return _cached_json(request, version, f"trend={name.lower()}", lambda: load_trend(conn, name))
+
+@app.get("/trends/{name}/videos")
+@profile_in_thread
+def get_trend_videos(
+    request: Request,
+    name: str,
+    limit: int = Query(10, ge=1, le=200),
+    sort: str = Query("views", pattern="^(" + "|".join(VIDEO_SORTS) + ")$"),
+):
+    """Videourile care contribuie cel mai mult la un trend (după views sau recență)."""
+    with _trends_snapshot() as conn:
+        version = trends_version(conn)
+        if version is None:
+            raise HTTPException(status_code=404, detail=f"Trend '{name}' not found")
+
+        def load():
+            if load_trend(conn, name) is None:
+                return None
+            return {"trend": name.lower(), "sort": sort, "videos": load_trend_videos(conn, name, limit, sort)}
+
+        return _cached_json(request, version, f"videos={name.lower()}|{sort}|{limit}", load)
+
+# ================== WARM-UP ==================
+
+# Rulează la pornirea fiecărui worker, înainte de primele cereri; `@warmup_hook` adaugă altele
+WARMUP_HOOKS: List[Callable[[], None]] = []
+
+def warmup_hook(fn: Callable[[], None]) -> Callable[[], None]:
+    WARMUP_HOOKS.append(fn)
+    return fn
+
+@warmup_hook
+def warm_connections():
+    """Deschide din timp conexiunile: pool-ul de trenduri și store-ul partajat."""
+    with get_pool(TRENDS_DB).connection():
+        pass
+    get_store().purge_expired()
+
+@warmup_hook
+def warm_trends_cache():
+    """Pre-serializează răspunsul implicit `/trends?top=20`, cel mai cerut de dashboard."""
+    with _trends_snapshot() as conn:
+        version = trends_version(conn)
+        if version is not None:
+            detected_at = version.split("|")[0]
+            trends_cache.get(
+                version,
+                "top=20",
+                lambda: json.dumps(
+                    {"detected_at": detected_at, "trends": load_top_trends(conn, 20)}, ensure_ascii=False
+                ).encode("utf-8"),
+            )
+
+@app.on_event("startup")
+def run_warmup_hooks():
+    for hook in WARMUP_HOOKS:
+        try:
+            with span("warmup", hook=hook.__name__):
+                hook()
+        except Exception as exc:  # un hook eșuat nu blochează pornirea workerului
+            incr("warmup_errors", hook=hook.__name__)
+            print(f"[WARN] Warm-up hook {hook.__name__}: {exc}")
+
+def _publish_worker_metrics():
+    while True:
+        time.sleep(METRICS_PUBLISH_SECONDS)
+        try:
+            get_store().publish_metrics(WORKER_ID, snapshot())
+        except sqlite3.Error as exc:
+            print(f"[WARN] Worker metrics: {exc}")
+
+@app.on_event("startup")
+def start_metrics_publisher():
+    if MULTI_WORKER:
+        threading.Thread(target=_publish_worker_metrics, name="metrics-publisher", daemon=True).start()
+
+@app.on_event("shutdown")
+def remove_worker_metrics():
+    if MULTI_WORKER:
+        get_store().remove_worker(WORKER_ID)
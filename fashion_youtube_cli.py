@@ -19,10 +19,16 @@ def main():
     )
 
     print("🔍 Analizăm trendurile... așteaptă...\n")
-    answer = run_fashion_agent(style_query)
+    usage = {}
+    answer = run_fashion_agent(style_query, style=args.style, usage=usage)
     print("========== REZULTAT ==========\n")
     print(answer)
     print("\n===============================\n")
+    print(
+        f"Tokeni: {usage.get('prompt_tokens', 0)} prompt + {usage.get('output_tokens', 0)} output "
+        f"({usage.get('cached_tokens', 0)} din cache) în {usage.get('model_calls', 0)} apeluri Gemini; "
+        f"rezultat tool ~{usage.get('tool_payload_tokens', 0)} tokeni"
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Client REST minimal pentru Gemini (generateContent / streamGenerateContent), fără SDK:
+conexiuni HTTP keep-alive refolosite dintr-un pool, retry cu backoff pe 429/5xx și
+erori de rețea, streaming SSE.
+
+    client = GeminiClient(api_key)
+    text = client.generate(prompt, model="gemini-2.5-flash", system="...", on_chunk=print)
+
+Fără `base_url`, clientul folosește GEMINI_API_BASE_URL (ex: `http_standin.py`) sau API-ul real.
+
+Pool-ul are aceeași formă ca `db_connection.ConnectionPool`: conexiuni create leneș
+până la `size`, refolosite LIFO, thread-safe.
+"""
+import http.client
+import json
+import math
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHARS_PER_TOKEN = 4  # estimare grosieră, suficientă pentru bugetul de prompt
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class GeminiError(RuntimeError):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class HTTPConnectionPool:
+    """Conexiuni keep-alive către un singur host."""
+
+    def __init__(self, base_url: str, size: int = 4, timeout: float = 60):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self, timeout: float = None) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._new_connection()
+        return self._idle.get(timeout=timeout)
+
+    def release(self, conn: http.client.HTTPConnection):
+        self._idle.put(conn)
+
+    def discard(self, conn: http.client.HTTPConnection):
+        """Închide o conexiune stricată; locul ei în pool se eliberează."""
+        conn.close()
+        with self._lock:
+            self._created -= 1
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = None,
+        pool_size: int = 4,
+        timeout: float = 60,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        self.api_key = api_key
+        base_url = base_url or os.getenv("GEMINI_API_BASE_URL") or DEFAULT_BASE_URL
+        self.pool = HTTPConnectionPool(base_url, size=pool_size, timeout=timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _payload(self, prompt: str, system: Optional[str]) -> Dict:
+        parts = ([{"text": system}] if system else []) + [{"text": prompt}]
+        return {"contents": [{"role": "user", "parts": parts}]}
+
+    def _open(self, path: str, body: bytes):
+        """
+        POST cu retry; întoarce (conexiune, răspuns 200) cu body-ul încă necitit.
+        Retry-After (429/503) are prioritate față de backoff-ul exponențial.
+        """
+        url = f"{self.pool.base_path}{path}"
+        headers = {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+        for attempt in range(self.max_retries + 1):
+            conn = self.pool.acquire()
+            delay = self.backoff * (2 ** attempt)
+            try:
+                conn.request("POST", url, body=body, headers=headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException) as exc:
+                self.pool.discard(conn)
+                if attempt == self.max_retries:
+                    raise GeminiError(f"Gemini request failed: {exc}") from exc
+                time.sleep(delay)
+                continue
+
+            if response.status == 200:
+                return conn, response
+            try:
+                detail = response.read().decode("utf-8", "replace")
+            except (OSError, http.client.HTTPException) as exc:
+                # Body-ul erorii nu a putut fi citit: conexiunea e într-o stare necunoscută
+                self.pool.discard(conn)
+                if attempt == self.max_retries:
+                    raise GeminiError(
+                        f"Gemini HTTP {response.status} (body unreadable: {exc})", status=response.status
+                    ) from exc
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+            self.pool.release(conn)
+            if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                raise GeminiError(f"Gemini HTTP {response.status}: {detail[:500]}", status=response.status)
+            retry_after = response.getheader("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _text(result: Dict) -> str:
+        parts = result.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+    def _stream_events(self, response) -> Iterator[Dict]:
+        for raw in response:
+            line = raw.decode("utf-8").strip()
+            if line.startswith("data:"):
+                yield json.loads(line[5:])
+
+    def generate(
+        self,
+        prompt: str,
+        model: str,
+        system: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Textul generat. Cu `on_chunk`, folosește streamGenerateContent (SSE) și apelează
+        callback-ul pentru fiecare fragment pe măsură ce sosește.
+        """
+        body = json.dumps(self._payload(prompt, system)).encode("utf-8")
+        if on_chunk is None:
+            conn, response = self._open(f"/models/{model}:generateContent", body)
+            try:
+                raw = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                self.pool.discard(conn)
+                raise GeminiError(f"Gemini response interrupted: {exc}") from exc
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+            self.pool.release(conn)
+            try:
+                result = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                raise GeminiError(f"Invalid JSON response: {exc}\n{raw[:500]!r}") from exc
+            text = self._text(result)
+            if not text.strip():
+                raise GeminiError(f"Gemini response missing content: {result}")
+            return text
+
+        conn, response = self._open(f"/models/{model}:streamGenerateContent?alt=sse", body)
+        chunks = []
+        try:
+            for event in self._stream_events(response):
+                chunk = self._text(event)
+                if chunk:
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+        except (OSError, http.client.HTTPException, json.JSONDecodeError) as exc:
+            self.pool.discard(conn)
+            raise GeminiError(f"Gemini stream interrupted: {exc}") from exc
+        self.pool.release(conn)
+        text = "".join(chunks)
+        if not text.strip():
+            raise GeminiError("Gemini stream returned no content")
+        return text
+
+    def close(self):
+        self.pool.close()
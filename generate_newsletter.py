@@ -1,107 +1,383 @@
 #!/usr/bin/env python3
-"""Generate a fresh STYLX newsletter using the latest Stats.md table."""
+"""Generate a fresh STYLX newsletter straight from the trends table (or a Stats.md table).
+
+The default source is the `trends` table of `--db`: the top trends and their most viewed
+videos are packed into a token-budgeted prompt, streamed from Gemini over pooled
+keep-alive connections (with retries) and written to Newsletter.md atomically.
+
+Gemini is only called when the prompt inputs (trend data, prompt template, model) changed
+since the last generated newsletter; otherwise the stored output is reused. Every run is
+recorded in the `newsletter_runs` table of `--db`.
+
+Usage examples:
+  python generate_newsletter.py
+  python generate_newsletter.py --top 8 --videos-per-trend 2 --token-budget 1200
+  python generate_newsletter.py --source stats     # legacy: read the Stats.md table
+  python generate_newsletter.py --locales ro,en,fr --max-in-flight 3
+  python generate_newsletter.py --force            # ignore the cache
+  python generate_newsletter.py --history 10       # last 10 runs
+"""
 from __future__ import annotations
 
-import json
+import argparse
 import os
+import sqlite3
 import sys
-import urllib.request
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from db_connection import connect_reader, connect_writer
+from gemini_client import GeminiClient, estimate_tokens
+from instrumentation import incr, span
+from newsletter_store import cached_output, init_newsletter_table, input_hash, record_run, run_history
+from profiling import add_profile_args, profiled
+from trend_store import load_trend_videos
+from view_trends import has_trends_table, load_top_trends
+
 PROJECT_ROOT = Path(__file__).resolve().parent
 STATS_PATH = PROJECT_ROOT / "Stats.md"
 NEWSLETTER_PATH = PROJECT_ROOT / "Newsletter.md"
+DEFAULT_DB = PROJECT_ROOT / "youtube_videos.db"
 DEFAULT_MODEL = "gemini-2.5-flash"
-GEMINI_ENDPOINT_TEMPLATE = (
-    "https://generativelanguage.googleapis.com/v1/models/{model}:generateContent?key={key}"
-)
+DEFAULT_TOP = 10
+DEFAULT_VIDEOS_PER_TREND = 3
+DEFAULT_TOKEN_BUDGET = 1500  # doar pentru secțiunea de date; template-ul e fix
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_LOCALE = "ro"
+LOCALE_LANGUAGES = {
+    "ro": "limba română",
+    "en": "limba engleză",
+    "fr": "limba franceză",
+    "de": "limba germană",
+    "es": "limba spaniolă",
+    "it": "limba italiană",
+    "pt": "limba portugheză",
+    "pl": "limba poloneză",
+    "hu": "limba maghiară",
+    "nl": "limba olandeză",
+}
+MAX_TITLE_CHARS = 90
+SYSTEM_INSTRUCTION = "You are STYLX, un consultant dedicat exclusiv modei și stylingului."
 
 load_dotenv(PROJECT_ROOT / ".env")
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-if not GOOGLE_API_KEY:
-    print("ERROR: GOOGLE_API_KEY missing. Add it to .env or the environment.")
-    sys.exit(1)
 
-if not STATS_PATH.exists():
-    print(f"ERROR: Stats file not found at {STATS_PATH}.")
-    sys.exit(1)
+def load_stats(path: Path) -> str:
+    if not path.exists():
+        print(f"ERROR: Stats file not found at {path}.")
+        sys.exit(1)
+    stats_markdown = path.read_text(encoding="utf-8").strip()
+    if not stats_markdown:
+        print(f"ERROR: {path.name} is empty. Run view_trends.py first.")
+        sys.exit(1)
+    return stats_markdown
+
+
+def require_api_key() -> str:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("ERROR: GOOGLE_API_KEY missing. Add it to .env or the environment.")
+        sys.exit(1)
+    return api_key
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def build_trends_context(
+    conn: sqlite3.Connection,
+    top: int = DEFAULT_TOP,
+    videos_per_trend: int = DEFAULT_VIDEOS_PER_TREND,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> tuple[str, int]:
+    """
+    Tabel Markdown cu trendurile + top videouri per trend, în limita `token_budget`.
+    Trendurile intră în ordinea scorului; când bugetul nu mai ajunge, un trend intră fără
+    videouri, iar dacă nici rândul din tabel nu mai încape, lista se oprește.
+    Întoarce (markdown, număr de trenduri incluse).
+    """
+    header = [
+        "| Trend | Score | Videos | Total views | Avg views/clip | First seen | Last seen |",
+        "| --- | ---: | ---: | ---: | ---: | --- | --- |",
+    ]
+    rows: list[str] = []
+    video_blocks: list[str] = []
+    used = estimate_tokens("\n".join(header)) + estimate_tokens("### Top videos per trend")
+
+    for trend in load_top_trends(conn, top):
+        row = (
+            f"| {trend['name'].title()} | {trend['score']:.2f} | {trend['num_videos']} "
+            f"| {trend['total_views']:,} | {trend['avg_views']:,.0f} "
+            f"| {(trend['first_seen_at'] or '')[:10]} | {(trend['last_seen_at'] or '')[:10]} |"
+        )
+        videos = load_trend_videos(conn, trend["name"], limit=videos_per_trend) if videos_per_trend > 0 else []
+        block = "\n".join(
+            [f"**{trend['name'].title()}**"]
+            + [
+                f"- \"{_truncate(v['title'], MAX_TITLE_CHARS)}\" — {v['channel'] or 'n/a'}, "
+                f"{v['view_count'] or 0:,} views, {(v['publish_date'] or '')[:10]}"
+                for v in videos
+            ]
+        ) if videos else ""
+
+        row_cost = estimate_tokens(row)
+        block_cost = estimate_tokens(block) if block else 0
+        if used + row_cost > token_budget:
+            break
+        rows.append(row)
+        used += row_cost
+        if block and used + block_cost <= token_budget:
+            video_blocks.append(block)
+            used += block_cost
+
+    parts = ["\n".join(header + rows)]
+    if video_blocks:
+        parts.append("### Top videos per trend\n\n" + "\n\n".join(video_blocks))
+    return "\n\n".join(parts), len(rows)
 
-stats_markdown = STATS_PATH.read_text(encoding="utf-8").strip()
-if not stats_markdown:
-    print("ERROR: Stats.md is empty. Run view_trends.py first.")
-    sys.exit(1)
 
-def build_prompt(table_markdown: str) -> str:
+def load_trends_context(db_path: str, top: int, videos_per_trend: int, token_budget: int) -> str:
+    try:
+        conn = connect_reader(db_path, row_factory=sqlite3.Row)
+    except sqlite3.OperationalError as exc:
+        print(f"ERROR: Cannot open database {db_path}: {exc}")
+        sys.exit(1)
+    try:
+        if not has_trends_table(conn):
+            print(f"ERROR: Table 'trends' not found in {db_path}. Run calculate_trends_simple.py first.")
+            sys.exit(1)
+        conn.execute("BEGIN")  # trends și trend_videos din același snapshot
+        context, included = build_trends_context(conn, top, videos_per_trend, token_budget)
+    finally:
+        conn.close()
+    if not included:
+        print(f"ERROR: No trends in {db_path} (or --token-budget too small).")
+        sys.exit(1)
+    print(f"Prompt data: {included} trends, ~{estimate_tokens(context)} tokens")
+    return context
+
+
+def build_prompt(table_markdown: str, locale: str = DEFAULT_LOCALE) -> str:
+    language = LOCALE_LANGUAGES.get(locale, f"limba corespunzătoare codului de localizare '{locale}'")
     return "\n\n".join(
         [
             "Ai următoarele date despre trendurile actuale din fashion:",
             table_markdown,
             (
-                "Compune în limba română un newsletter premium intitulat \"STYLX Fashion Pulse\". "
+                f"Compune în {language} un newsletter premium intitulat \"STYLX Fashion Pulse\". "
                 "Include o introducere scurtă, 3-4 insight-uri bullet, un plan de acțiune "
                 "(bullet numerotate) și un îndemn final. Folosește cifrele exacte din tabel, "
                 "păstrând un ton profesionist și orientat spre modă."
             ),
+            (
+                "Unde sunt listate videouri pentru un trend, poți cita 1-2 titluri ca exemple concrete."
+            ),
             "Nu menționa în text sursa datelor sau faptul că provin dintr-un fișier.",
             "Nu folosi cuvântul 'copilot' în conținut sau semnături.",
         ]
     )
 
-def call_gemini(prompt: str, model: str = DEFAULT_MODEL) -> str:
-    endpoint = GEMINI_ENDPOINT_TEMPLATE.format(model=model, key=GOOGLE_API_KEY)
-    payload = {
-        "contents": [
-            {
-                "role": "user",
-                "parts": [
-                    {"text": "You are STYLX, un consultant dedicat exclusiv modei și stylingului."},
-                    {"text": prompt},
-                ],
-            }
-        ]
-    }
+def prompt_hash(prompt: str, model: str) -> str:
+    """Cheia de cache: prompt-ul complet (tabel + template), instrucțiunea de sistem și modelul."""
+    return input_hash(system=SYSTEM_INSTRUCTION, prompt=prompt, model=model)
 
-    data = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(endpoint, data=data, headers={"Content-Type": "application/json"})
-    with urllib.request.urlopen(request, timeout=45) as response:
-        body = response.read().decode("utf-8")
+_clients: dict[str, GeminiClient] = {}
 
-    try:
-        result = json.loads(body)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Invalid JSON response: {exc}\n{body}") from exc
-
-    parts = (
-        result.get("candidates", [{}])[0]
-        .get("content", {})
-        .get("parts", [])
+
+def gemini_client(api_key: str, pool_size: int = DEFAULT_MAX_IN_FLIGHT) -> GeminiClient:
+    """Un client (deci un pool de conexiuni keep-alive) per proces."""
+    client = _clients.get(api_key)
+    if client is None:
+        client = _clients[api_key] = GeminiClient(api_key, pool_size=pool_size)
+    return client
+
+
+def call_gemini(prompt: str, model: str = DEFAULT_MODEL, api_key: str | None = None, on_chunk=None) -> str:
+    """Apel Gemini cu retry; cu `on_chunk` răspunsul vine în streaming."""
+    return gemini_client(api_key or require_api_key()).generate(
+        prompt, model, system=SYSTEM_INSTRUCTION, on_chunk=on_chunk
     )
-    text = "\n".join(part.get("text", "").strip() for part in parts if part.get("text"))
-    if not text:
-        raise RuntimeError(f"Gemini response missing content: {result}")
-    return text
 
 
-def main() -> None:
-    prompt = build_prompt(stats_markdown)
-    print("Generating newsletter via Gemini...", end=" ")
-    try:
-        generated_text = call_gemini(prompt)
-    except Exception as exc:  # noqa: BLE001 – surface exact failure reason
-        print("FAILED")
-        print(exc)
-        sys.exit(1)
+def newsletter_path(locale: str) -> Path:
+    """Newsletter.md pentru ediția implicită (ro), Newsletter.<locale>.md pentru celelalte."""
+    if locale == DEFAULT_LOCALE:
+        return NEWSLETTER_PATH
+    return NEWSLETTER_PATH.with_name(f"{NEWSLETTER_PATH.stem}.{locale}{NEWSLETTER_PATH.suffix}")
+
 
+def current_newsletter_body(path: Path) -> str | None:
+    """Textul newsletter-ului fără header-ul cu data, dacă fișierul există."""
+    if not path.exists():
+        return None
+    content = path.read_text(encoding="utf-8")
+    if content.startswith("## STYLX Fashion Pulse"):
+        content = content.split("\n\n", 1)[-1]
+    return content.strip()
+
+
+def write_newsletter(newsletter_body: str, path: Path) -> None:
+    """Scriere atomică (tmp + rename): server.js nu citește niciodată un fișier pe jumătate scris."""
     today = datetime.now().strftime("%d %B %Y")
     header = f"## STYLX Fashion Pulse — {today}\n\n"
-    newsletter_body = generated_text.strip()
-    NEWSLETTER_PATH.write_text(header + newsletter_body + "\n", encoding="utf-8")
-    print("DONE")
-    print(f"Newsletter updated at {NEWSLETTER_PATH}")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(header + newsletter_body + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def print_history(db_path: str, limit: int) -> None:
+    conn = connect_writer(db_path)
+    init_newsletter_table(conn)
+    runs = run_history(conn, limit)
+    conn.close()
+    if not runs:
+        print("No newsletter runs recorded yet.")
+        return
+    print("| # | Date | Input hash | Model | Locale | Status | Duration |")
+    print("| ---: | --- | --- | --- | --- | --- | ---: |")
+    for run in runs:
+        status = run["status"] + (f" ({run['error'][:60]})" if run["error"] else "")
+        print(
+            f"| {run['id']} | {run['created_at'][:19]} | {run['input_hash']} | {run['model']} "
+            f"| {run['locale'] or DEFAULT_LOCALE} | {status} | {run['duration_ms'] or 0} ms |"
+        )
+
+
+def parse_locales(value: str) -> list[str]:
+    locales = list(dict.fromkeys(code.strip().lower() for code in value.split(",") if code.strip()))
+    if not locales:
+        raise argparse.ArgumentTypeError("expected a comma separated list, e.g. ro,en,fr")
+    return locales
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the STYLX newsletter from the trends table via Gemini")
+    parser.add_argument(
+        "--source", choices=("db", "stats"), default="db", help="Trends table of --db (default) or the --stats file"
+    )
+    parser.add_argument("--stats", default=str(STATS_PATH), help="Stats table in Markdown for --source stats")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="SQLite database with trends and the newsletter cache")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Trends in the prompt (default: {DEFAULT_TOP})")
+    parser.add_argument(
+        "--videos-per-trend", type=int, default=DEFAULT_VIDEOS_PER_TREND,
+        help=f"Top videos listed per trend (default: {DEFAULT_VIDEOS_PER_TREND})",
+    )
+    parser.add_argument(
+        "--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET,
+        help=f"Approximate token budget for the trend data (default: {DEFAULT_TOKEN_BUDGET})",
+    )
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the full response instead of streaming it")
+    parser.add_argument(
+        "--locales", type=parse_locales, default=[DEFAULT_LOCALE],
+        help="Comma separated editions, e.g. ro,en,fr (default: ro); ro -> Newsletter.md, xx -> Newsletter.xx.md",
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+        help=f"Concurrent Gemini requests with --locales (default: {DEFAULT_MAX_IN_FLIGHT})",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL, help=f"Gemini model (default: {DEFAULT_MODEL})")
+    parser.add_argument("--force", action="store_true", help="Call Gemini even if the inputs did not change")
+    parser.add_argument("--history", type=int, metavar="N", help="Show the last N newsletter runs and exit")
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def _generate(prompt: str, model: str, api_key: str, locale: str, on_chunk=None) -> tuple[str, int]:
+    """Rulează într-un thread din pool: (text, durată ms)."""
+    start = time.perf_counter()
+    with span("newsletter.gemini_api", model=model, locale=locale, stream=on_chunk is not None):
+        incr("api_calls", api="gemini", endpoint="generate_content")
+        try:
+            text = call_gemini(prompt, model, api_key, on_chunk=on_chunk)
+        except Exception:
+            incr("api_errors", api="gemini", endpoint="generate_content")
+            raise
+    return text, int((time.perf_counter() - start) * 1000)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.history:
+        print_history(args.db, args.history)
+        return
+
+    with profiled("generate_newsletter", args.profile, args.profile_dir):
+        # Datele și prompt-ul se pregătesc o singură dată; doar limba diferă între ediții
+        if args.source == "stats":
+            data_markdown = load_stats(Path(args.stats))
+        else:
+            data_markdown = load_trends_context(args.db, args.top, args.videos_per_trend, args.token_budget)
+        conn = connect_writer(args.db)
+        init_newsletter_table(conn)
+        conn.commit()
+        created_at = datetime.now().isoformat()
+
+        pending = []
+        for locale in args.locales:
+            prompt = build_prompt(data_markdown, locale)
+            digest = prompt_hash(prompt, args.model)
+            path = newsletter_path(locale)
+            start = time.perf_counter()
+            cached = None if args.force else cached_output(conn, digest)
+            if cached is None:
+                incr("cache_misses", cache="newsletter")
+                pending.append((locale, prompt, digest, path))
+                continue
+            incr("cache_hits", cache="newsletter")
+            record_run(
+                conn, created_at, digest, args.model, "cached",
+                int((time.perf_counter() - start) * 1000), locale=locale,
+            )
+            if current_newsletter_body(path) == cached:
+                print(f"[{locale}] Inputs unchanged (hash {digest[:12]}); {path.name} is up to date, Gemini not called.")
+            else:
+                write_newsletter(cached, path)
+                print(f"[{locale}] Inputs unchanged (hash {digest[:12]}); restored cached newsletter at {path}")
+
+        if not pending:
+            conn.close()
+            return
+
+        api_key = require_api_key()
+        gemini_client(api_key, pool_size=args.max_in_flight)
+        # Streaming-ul în terminal are sens doar pentru o singură ediție
+        stream = not args.no_stream and len(pending) == 1
+        on_chunk = (lambda chunk: print(chunk, end="", flush=True)) if stream else None
+        labels = ", ".join(locale for locale, *_ in pending)
+        print(f"Generating newsletter via Gemini ({labels})...", flush=True)
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(args.max_in_flight, len(pending)))) as pool:
+            futures = {
+                pool.submit(_generate, prompt, args.model, api_key, locale, on_chunk): (locale, digest, path)
+                for locale, prompt, digest, path in pending
+            }
+            for future in as_completed(futures):
+                locale, digest, path = futures[future]
+                try:
+                    generated_text, duration_ms = future.result()
+                except Exception as exc:  # noqa: BLE001 – surface exact failure reason
+                    failed += 1
+                    record_run(conn, created_at, digest, args.model, "failed", None, error=str(exc), locale=locale)
+                    print(f"[{locale}] FAILED: {exc}")
+                    continue
+                newsletter_body = generated_text.strip()
+                record_run(
+                    conn, created_at, digest, args.model, "generated", duration_ms,
+                    output=newsletter_body, locale=locale,
+                )
+                write_newsletter(newsletter_body, path)
+                if stream:
+                    print("\n")
+                print(f"[{locale}] DONE in {duration_ms / 1000:.1f}s -> {path}")
+        conn.close()
+        if failed:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
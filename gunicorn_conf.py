@@ -0,0 +1,34 @@
+"""
+Configurare gunicorn pentru modul multi-worker al API-ului:
+
+    gunicorn -c gunicorn_conf.py fashion_youtube_api:app
+
+Un proces uvicorn per core (`WEB_CONCURRENCY` îl suprascrie). Workerii împart prin SQLite WAL
+cache-ul de tool / răspunsuri (`STYLX_CACHE_DB`), coada de job-uri (`STYLX_JOBS_DB`) și
+metricile, deci scalarea pe core-uri nu dublează apelurile către YouTube / Gemini.
+Limitele din `admission.py` sunt per worker (totalul = workeri x STYLX_MAX_INFLIGHT).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+# Moștenit de workeri: fashion_youtube_api activează metricile per worker
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+# Fără preload: conexiunile SQLite (job-uri, cache) se deschid în fiecare worker, nu se moștenesc prin fork
+preload_app = False
+timeout = 120  # /analyze-fashion sincron poate dura zeci de secunde (agent multi-turn)
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    server.log.info("Worker %s started", worker.pid)
+
+
+def child_exit(server, worker):
+    # Metricile unui worker oprit nu mai apar în /metrics
+    from shared_cache import CACHE_DB, SharedCache
+
+    SharedCache(CACHE_DB).remove_worker(str(worker.pid))
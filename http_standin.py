@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Stand-in HTTP local pentru YouTube Data API v3 și Gemini REST: înregistrare și redare.
+
+  record  - proxy către API-urile reale; fiecare răspuns e salvat în `--cassettes` ca un
+            fișier JSON, cu cheia = hash(metodă, path, parametri, body) fără cheile de API
+  replay  - servește răspunsurile salvate, cu latență (`--latency-ms`, `--jitter-ms`) și
+            erori injectate (`--error-rate`, `--error-status`, cu Retry-After) și o capacitate
+            limitată a upstream-ului (`--capacity`, pentru teste de suprasarcină). Cu
+            `--synthetic`, cererile fără cassette primesc răspunsuri sintetice deterministe,
+            deci benchmark-urile pot rula fără nicio înregistrare și fără chei.
+
+Clienții se îndreaptă spre stand-in prin variabile de mediu:
+  YOUTUBE_API_ROOT=http://127.0.0.1:8765        youtube_to_sqlite.py, get_fashion_youtube_trends
+  GEMINI_API_BASE_URL=http://127.0.0.1:8765/v1  generate_newsletter.call_gemini (GeminiClient)
+
+Usage:
+  python http_standin.py record --cassettes cassettes/
+  python http_standin.py replay --cassettes cassettes/ --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+  python http_standin.py replay --synthetic --port 8765
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_PORT = 8765
+# Primul segment din path alege API-ul real (același path ca la Google)
+UPSTREAMS = {
+    "youtube": "https://www.googleapis.com",
+    "v1": "https://generativelanguage.googleapis.com",
+    "v1beta": "https://generativelanguage.googleapis.com",
+}
+SECRET_PARAMS = {"key"}
+FORWARD_HEADERS = {"content-type", "accept", "x-goog-api-key", "authorization"}
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def cassette_key(method: str, path: str, params: List[Tuple[str, str]], body: bytes) -> str:
+    """Cheie stabilă a unei cereri: fără cheile de API, parametrii sortați."""
+    public = sorted((k, v) for k, v in params if k not in SECRET_PARAMS)
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}?{json.dumps(public)}\n".encode("utf-8"))
+    digest.update(body or b"")
+    return digest.hexdigest()[:24]
+
+
+# ================== RĂSPUNSURI SINTETICE ==================
+
+_STYLES = ["streetwear", "quiet luxury", "y2k", "gorpcore", "cottagecore", "office siren", "boho chic", "old money"]
+_FORMATS = ["{} outfit ideas", "how to style {}", "{} haul", "{} lookbook", "my {} era", "{} capsule wardrobe"]
+
+
+def _h(*parts) -> int:
+    return int(hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=8).hexdigest(), 16)
+
+
+def _video_id(*parts) -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    n = _h(*parts)
+    return "".join(alphabet[(n >> (6 * i)) & 63] for i in range(11))
+
+
+def _published(n: int) -> str:
+    day = 1 + n % 28
+    month = 1 + (n >> 8) % 11
+    return f"2025-{month:02d}-{day:02d}T{(n >> 16) % 24:02d}:00:00Z"
+
+
+def _synthetic_video(vid: str) -> Dict:
+    n = _h(vid)
+    style = _STYLES[n % len(_STYLES)]
+    title = _FORMATS[(n >> 4) % len(_FORMATS)].format(style)
+    return {
+        "kind": "youtube#video",
+        "id": vid,
+        "snippet": {
+            "title": title.title(),
+            "description": f"{title}. Outfit inspiration and styling tips.",
+            "channelTitle": f"Style Channel {(n >> 12) % 200}",
+            "publishedAt": _published(n),
+            "tags": [style, "fashion", "outfit ideas", f"{style} outfits"],
+        },
+        "statistics": {"viewCount": str(1000 + (n >> 20) % 2_000_000), "likeCount": str((n >> 40) % 50_000)},
+    }
+
+
+def _youtube_synthetic(resource: str, params: Dict[str, str]) -> Optional[Dict]:
+    page = int(params.get("pageToken") or 0)
+    size = min(50, int(params.get("maxResults") or 5))
+    if resource == "search":
+        q = params.get("q") or params.get("channelId") or ""
+        items = []
+        for i in range(size):
+            vid = _video_id("search", q, page, i)
+            item = {"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": vid}}
+            if "snippet" in params.get("part", ""):
+                item["snippet"] = _synthetic_video(vid)["snippet"]
+            items.append(item)
+        body = {"kind": "youtube#searchListResponse", "items": items}
+        if page < 4:
+            body["nextPageToken"] = str(page + 1)
+        return body
+    if resource == "videos":
+        ids = [v for v in params.get("id", "").split(",") if v]
+        return {"kind": "youtube#videoListResponse", "items": [_synthetic_video(v) for v in ids]}
+    if resource == "channels":
+        ids = [v for v in (params.get("id") or params.get("forHandle") or "").split(",") if v]
+        items = [
+            {"id": ch, "contentDetails": {"relatedPlaylists": {"uploads": "UU" + ch[2:]}}}
+            for ch in ids
+        ]
+        return {"kind": "youtube#channelListResponse", "items": items}
+    if resource == "playlistItems":
+        playlist = params.get("playlistId", "")
+        items = []
+        for i in range(size):
+            vid = _video_id("uploads", playlist, page, i)
+            published = f"2025-11-{28 - min(27, page * 2 + i // 25):02d}T00:00:00Z"
+            items.append({"contentDetails": {"videoId": vid, "videoPublishedAt": published}})
+        body = {"kind": "youtube#playlistItemListResponse", "items": items}
+        if page < 2:
+            body["nextPageToken"] = str(page + 1)
+        return body
+    return None
+
+
+def _gemini_text(request_body: bytes) -> str:
+    try:
+        payload = json.loads(request_body or b"{}")
+        prompt = " ".join(p.get("text", "") for c in payload.get("contents", []) for p in c.get("parts", []))
+    except ValueError:
+        prompt = ""
+    n = _h(prompt)
+    picks = [_STYLES[(n >> (3 * i)) % len(_STYLES)] for i in range(4)]
+    lines = ["# Newsletter (synthetic)", ""]
+    lines += [f"- **{style.title()}**: outfit ideas and styling notes." for style in picks]
+    return "\n".join(lines) + "\n"
+
+
+def _synthetic(method: str, path: str, params: Dict[str, str], body: bytes) -> Optional[Response]:
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 3 and parts[0] == "youtube":
+        data = _youtube_synthetic(parts[2], params)
+        if data is not None:
+            return 200, {"Content-Type": "application/json; charset=UTF-8"}, json.dumps(data).encode("utf-8")
+    if parts and parts[0] in ("v1", "v1beta") and path.endswith(":generateContent"):
+        data = {"candidates": [{"content": {"role": "model", "parts": [{"text": _gemini_text(body)}]}}]}
+        return 200, {"Content-Type": "application/json; charset=UTF-8"}, json.dumps(data).encode("utf-8")
+    if parts and parts[0] in ("v1", "v1beta") and path.endswith(":streamGenerateContent"):
+        text = _gemini_text(body)
+        lines = text.splitlines(keepends=True)
+        events = [
+            "data: " + json.dumps({"candidates": [{"content": {"role": "model", "parts": [{"text": chunk}]}}]}) + "\r\n\r\n"
+            for chunk in lines
+        ]
+        return 200, {"Content-Type": "text/event-stream"}, "".join(events).encode("utf-8")
+    return None
+
+
+# ================== STAND-IN ==================
+
+
+class StandIn:
+    """Logica de record / replay, independentă de serverul HTTP (refolosită de benchmark-uri)."""
+
+    def __init__(
+        self,
+        mode: str,
+        cassette_dir: str = "cassettes",
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        synthetic: bool = False,
+        seed: int = 0,
+        capacity: int = 0,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.synthetic = synthetic
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # capacity > 0: cel mult atâtea răspunsuri "procesate" simultan, restul așteaptă (upstream saturat)
+        self._capacity = threading.BoundedSemaphore(capacity) if capacity > 0 else None
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cassette_dir, f"{key}.json")
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _record(self, method: str, path: str, query: str, headers: Dict[str, str], body: bytes, key: str) -> Response:
+        root = UPSTREAMS.get(path.strip("/").split("/")[0])
+        if root is None:
+            return 404, {"Content-Type": "application/json"}, b'{"error": "no upstream for this path"}'
+        url = root + path + (f"?{query}" if query else "")
+        forward = {k: v for k, v in headers.items() if k.lower() in FORWARD_HEADERS}
+        request = urllib.request.Request(url, data=body or None, headers=forward, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=120) as resp:
+                status, resp_headers, data = resp.status, dict(resp.headers), resp.read()
+        except urllib.error.HTTPError as exc:
+            status, resp_headers, data = exc.code, dict(exc.headers), exc.read()
+        except (urllib.error.URLError, OSError) as exc:
+            # Upstream inaccesibil / timeout: răspuns 502 pentru client, fără cassette (nu e un răspuns al API-ului)
+            self._count("upstream_errors")
+            reason = getattr(exc, "reason", exc)
+            error = {"error": {"code": 502, "message": f"Upstream unreachable: {reason}", "status": "BAD_GATEWAY"}}
+            return 502, {"Content-Type": "application/json"}, json.dumps(error).encode()
+        content_type = resp_headers.get("Content-Type", "application/json")
+        cassette = {
+            "request": {"method": method, "path": path, "params": sorted(
+                (k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in SECRET_PARAMS
+            )},
+            "status": status,
+            "content_type": content_type,
+            "body": data.decode("utf-8", "replace"),
+        }
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._path(key))
+        self._count("recorded")
+        return status, {"Content-Type": content_type}, data
+
+    def _replay(self, method: str, path: str, params: List[Tuple[str, str]], body: bytes, key: str) -> Response:
+        """Cu `capacity`, tot răspunsul (latență, erori, citirea cassette-ului) ocupă un loc."""
+        if self._capacity is None:
+            return self._replay_response(method, path, params, body, key)
+        with self._capacity:
+            return self._replay_response(method, path, params, body, key)
+
+    def _replay_response(self, method: str, path: str, params: List[Tuple[str, str]], body: bytes, key: str) -> Response:
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            time.sleep(delay)
+        with self._lock:
+            inject = self.error_rate and self._rng.random() < self.error_rate
+        if inject:
+            self._count("injected_errors")
+            error = {"error": {"code": self.error_status, "message": "Injected by http_standin", "status": "UNAVAILABLE"}}
+            return self.error_status, {"Content-Type": "application/json", "Retry-After": "1"}, json.dumps(error).encode()
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                cassette = json.load(f)
+            self._count("hits")
+            return cassette["status"], {"Content-Type": cassette["content_type"]}, cassette["body"].encode("utf-8")
+        except FileNotFoundError:
+            pass
+        if self.synthetic:
+            response = _synthetic(method, path, dict(params), body)
+            if response is not None:
+                self._count("synthetic")
+                return response
+        self._count("misses")
+        error = {"error": {"code": 404, "message": f"No cassette for {method} {path}", "status": "NOT_FOUND"}}
+        return 404, {"Content-Type": "application/json"}, json.dumps(error).encode()
+
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Response:
+        parts = urlsplit(target)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        key = cassette_key(method, parts.path, params, body)
+        self._count(f"{method} {parts.path.rsplit('/', 1)[-1].split(':')[-1]}")
+        if self.mode == "record":
+            return self._record(method, parts.path, parts.query, headers, body, key)
+        return self._replay(method, parts.path, params, body, key)
+
+
+def make_server(standin: StandIn, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, ca API-urile reale
+
+        def setup(self):
+            super().setup()
+            # Headers și body pleacă în write-uri separate; fără NODELAY, Nagle + delayed ACK adaugă ~40 ms
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, headers, data = standin.handle(self.command, self.path, dict(self.headers), body)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # clientul a închis conexiunea (ex. a citit stream-ul până la ultimul chunk)
+
+        do_GET = do_POST = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256  # backlog-ul implicit (5) pierde conexiuni la teste de suprasarcină
+
+    return Server((host, port), Handler)
+
+
+def serve_in_thread(standin: StandIn, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Pornește serverul într-un thread daemon; întoarce (server, URL de bază). `port=0` = port liber."""
+    server = make_server(standin, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Record/replay stand-in for the YouTube Data API and Gemini REST")
+    p.add_argument("mode", choices=["record", "replay"])
+    p.add_argument("--cassettes", default="cassettes", help="Cassette directory (default: cassettes)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    p.add_argument("--latency-ms", type=float, default=0, help="Replay: fixed latency added to every response")
+    p.add_argument("--jitter-ms", type=float, default=0, help="Replay: extra uniform random latency")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Replay: fraction of requests answered with an error")
+    p.add_argument("--error-status", type=int, default=503, help="Replay: injected error status (default: 503)")
+    p.add_argument("--synthetic", action="store_true", help="Replay: synthesize responses for requests without a cassette")
+    p.add_argument("--seed", type=int, default=0, help="Seed for latency / error injection")
+    p.add_argument(
+        "--capacity", type=int, default=0, help="Replay: max responses in progress at once; extra requests wait (0 = unlimited)"
+    )
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    standin = StandIn(
+        args.mode,
+        cassette_dir=args.cassettes,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        synthetic=args.synthetic,
+        seed=args.seed,
+        capacity=args.capacity,
+    )
+    server = make_server(standin, args.host, args.port)
+    base = f"http://{args.host}:{server.server_address[1]}"
+    print(f"http_standin ({args.mode}) on {base}")
+    print(f"  YOUTUBE_API_ROOT={base}")
+    print(f"  GEMINI_API_BASE_URL={base}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(standin.stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Instrumentare ușoară pentru pipeline: span-uri cronometrate, countere, log-uri JSON
+și export în format Prometheus.
+
+    from instrumentation import span, incr
+
+    with span("ingest.search", query=q):
+        ...
+    incr("api_calls", endpoint="search")
+
+Log-urile JSON (o linie per eveniment, pe stderr) se activează cu STYLX_JSON_LOGS=1
+sau `configure(json_logs=True)`. Registrul e per proces și thread-safe.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+METRIC_PREFIX = "stylx"
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_durations: Dict[str, Dict[str, float]] = {}
+_json_logs = os.getenv("STYLX_JSON_LOGS", "").lower() in ("1", "true", "yes")
+
+
+def configure(json_logs: bool = None):
+    """Activează / dezactivează log-urile JSON structurate."""
+    global _json_logs
+    if json_logs is not None:
+        _json_logs = json_logs
+
+
+def log_event(event: str, **fields):
+    """Scrie un eveniment JSON pe stderr (doar dacă log-urile JSON sunt active)."""
+    if not _json_logs:
+        return
+    record = {"ts": time.time(), "event": event}
+    record.update(fields)
+    sys.stderr.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def incr(name: str, value: float = 1, **labels):
+    """Incrementează un counter (ex: api_calls, rows_processed, cache_hits)."""
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(stage: str, seconds: float):
+    """Înregistrează durata unei etape."""
+    with _lock:
+        d = _durations.setdefault(stage, {"count": 0, "sum": 0.0, "max": 0.0})
+        d["count"] += 1
+        d["sum"] += seconds
+        d["max"] = max(d["max"], seconds)
+
+
+@contextmanager
+def span(stage: str, **fields):
+    """
+    Cronometrează un bloc. Câmpurile extra ajung în log-ul JSON; blocul poate adăuga
+    câmpuri prin dict-ul returnat (ex: `s["rows"] = n`).
+    """
+    extra = dict(fields)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield extra
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(stage, elapsed)
+        log_event("span", stage=stage, duration_ms=round(elapsed * 1000, 3), status=status, **extra)
+
+
+def snapshot() -> Dict:
+    """Copie a metricilor curente (pentru sumar / debugging)."""
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        durations = {stage: dict(d) for stage, d in sorted(_durations.items())}
+    return {"counters": counters, "durations": durations}
+
+
+def log_summary(run: str):
+    """Emite toate metricile procesului ca un singur eveniment JSON (la finalul unui script)."""
+    log_event("summary", run=run, **snapshot())
+
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in sorted(labels.items())
+    )
+    return "{" + inner + "}"
+
+
+def _format_value(value) -> str:
+    """Valoare de counter fără pierdere de precizie: întregi ca int, restul cu repr(float)."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus(snapshots: Dict[str, Dict] = None) -> str:
+    """
+    Formatează metricile în text exposition format (pentru endpoint-ul /metrics).
+    `snapshots` = {worker: snapshot()} în modul multi-worker: fiecare serie primește
+    eticheta `worker`; implicit, doar metricile procesului curent, fără etichetă.
+    """
+    if snapshots is None:
+        snapshots = {None: snapshot()}
+
+    def labels_for(worker, labels: Dict) -> Dict:
+        return labels if worker is None else {**labels, "worker": worker}
+
+    lines = []
+    stage_metric = f"{METRIC_PREFIX}_stage_duration_seconds"
+    lines.append(f"# TYPE {stage_metric} summary")
+    for worker, snap in snapshots.items():
+        for stage, d in snap["durations"].items():
+            labels = _format_labels(labels_for(worker, {"stage": stage}))
+            lines.append(f"{stage_metric}_count{labels} {d['count']}")
+            lines.append(f"{stage_metric}_sum{labels} {d['sum']:.6f}")
+    lines.append(f"# TYPE {stage_metric}_max gauge")
+    for worker, snap in snapshots.items():
+        for stage, d in snap["durations"].items():
+            lines.append(f"{stage_metric}_max{_format_labels(labels_for(worker, {'stage': stage}))} {d['max']:.6f}")
+
+    # Tipul unui counter trebuie să apară o singură dată, înaintea tuturor seriilor lui
+    series: Dict[str, List[str]] = {}
+    for worker, snap in snapshots.items():
+        for c in snap["counters"]:
+            metric = f"{METRIC_PREFIX}_{c['name']}_total"
+            series.setdefault(metric, []).append(
+                f"{metric}{_format_labels(labels_for(worker, c['labels']))} {_format_value(c['value'])}"
+            )
+    for metric, metric_lines in series.items():
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(metric_lines)
+
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Golește registrul (util în benchmark-uri)."""
+    with _lock:
+        _counters.clear()
+        _durations.clear()
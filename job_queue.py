@@ -0,0 +1,286 @@
+"""
+Coadă persistentă de job-uri (SQLite) cu un pool limitat de workeri, pentru analizele lungi
+ale agentului (`POST /jobs`, `GET /jobs/{id}` în `fashion_youtube_api`).
+
+    jobs = JobQueue("jobs.db", handlers={"analyze": analyze}, workers=4)
+    jobs.start()
+    job, created = jobs.submit("analyze", {"style": "gorpcore"}, dedup_key="analyze:gorpcore")
+    jobs.get(job["job_id"])     # queued -> running -> done / failed
+
+- Cererile identice aflate încă în lucru (queued / running, același `dedup_key`) primesc
+  același job: un index UNIQUE parțial pe dedup_key face colapsarea atomică și între procese.
+- Job-urile sunt în SQLite înainte ca HTTP-ul să răspundă, deci un client care a dat timeout
+  își poate lua rezultatul mai târziu.
+- Un job revendicat primește proprietarul (procesul) și un lease de LEASE_SECONDS, reînnoit
+  de un thread heartbeat cât timp handler-ul rulează. Doar job-urile `running` cu lease-ul
+  expirat (proces oprit / blocat) sunt repuse în coadă (maxim MAX_ATTEMPTS încercări), deci
+  job-urile altor procese vii nu sunt rulate de două ori.
+- Workerii sunt thread-uri (apelurile agentului sunt I/O: YouTube + Gemini); revendicarea
+  unui job se face într-o tranzacție BEGIN IMMEDIATE, deci mai multe procese pot împărți coada.
+"""
+import datetime
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from db_connection import connect_writer
+from instrumentation import incr, observe, span
+
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 1.0  # secunde; coada e verificată și fără notificare (job-uri din alte procese)
+RETENTION_DAYS = 7  # job-urile terminate mai vechi se șterg la pornire
+LEASE_SECONDS = 60  # un job `running` fără heartbeat de atâta timp e considerat abandonat
+HEARTBEAT_SECONDS = 15
+
+
+def init_jobs_table(conn: sqlite3.Connection):
+    """Creează tabelul jobs (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            dedup_key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',   -- queued | running | done | failed
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            owner TEXT,
+            lease_expires_at TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_inflight
+            ON jobs(dedup_key) WHERE status IN ('queued', 'running');
+        CREATE INDEX IF NOT EXISTS idx_jobs_queued
+            ON jobs(created_at) WHERE status = 'queued';
+        """
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column in ("owner", "lease_expires_at"):
+        if column not in columns:  # tabele create înainte de lease-uri
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(lease_expires_at) WHERE status = 'running'"
+    )
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat()
+
+
+def _lease_expiry() -> str:
+    return (datetime.datetime.utcnow() + datetime.timedelta(seconds=LEASE_SECONDS)).isoformat()
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    if job["result"] is not None:
+        job["result"] = json.loads(job["result"])
+    job.pop("dedup_key", None)
+    job.pop("owner", None)
+    job.pop("lease_expires_at", None)
+    return job
+
+
+def _requeue_expired(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """Job-urile `running` cu lease expirat (sau fără lease): eșuate după MAX_ATTEMPTS, altfel repuse în coadă."""
+    now = _now()
+    expired = "status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+    failed = conn.execute(
+        f"""
+        UPDATE jobs SET status = 'failed', error = 'Interrupted too many times', finished_at = ?,
+                        lease_expires_at = NULL
+        WHERE {expired} AND attempts >= ?
+        """,
+        (now, now, MAX_ATTEMPTS),
+    ).rowcount
+    requeued = conn.execute(
+        f"UPDATE jobs SET status = 'queued', owner = NULL, lease_expires_at = NULL WHERE {expired}", (now,)
+    ).rowcount
+    return requeued, failed
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_path: str,
+        handlers: Dict[str, Callable[[Dict[str, Any]], Any]],
+        workers: int = 4,
+    ):
+        self.db_path = db_path
+        self.handlers = handlers
+        self.workers = workers
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+
+        conn = self._conn()
+        init_jobs_table(conn)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """O conexiune per thread (workerii și thread-urile API-ului scriu în paralel)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect_writer(self.db_path, row_factory=sqlite3.Row)
+        return conn
+
+    # ---------------- API ----------------
+
+    def submit(self, kind: str, payload: Dict[str, Any], dedup_key: Optional[str] = None) -> Tuple[Dict, bool]:
+        """Pune un job în coadă; întoarce (job, created). created=False = job identic deja în lucru."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if dedup_key is None:
+            body = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+            dedup_key = f"{kind}:" + hashlib.sha1(body.encode("utf-8")).hexdigest()
+        conn = self._conn()
+        job_id = uuid.uuid4().hex
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, dedup_key, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, kind, dedup_key, json.dumps(payload, ensure_ascii=False), _now()),
+                )
+        except sqlite3.IntegrityError:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')", (dedup_key,)
+            ).fetchone()
+            if row is not None:
+                incr("jobs_deduplicated", kind=kind)
+                return _row_to_job(row), False
+            return self.submit(kind, payload, dedup_key)  # job-ul s-a terminat între timp
+        incr("jobs_submitted", kind=kind)
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.get(job_id), True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def backlog(self) -> int:
+        """Job-uri care așteaptă un worker (index parțial pe status = 'queued')."""
+        return self._conn().execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    # ---------------- workers ----------------
+
+    def start(self):
+        if self._threads:
+            return
+        self._recover()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _recover(self):
+        """La pornire: job-urile cu lease expirat revin în coadă; curăță job-urile vechi."""
+        conn = self._conn()
+        cutoff = (datetime.datetime.utcnow() - datetime.timedelta(days=RETENTION_DAYS)).isoformat()
+        with conn:
+            requeued, failed = _requeue_expired(conn)
+            conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,))
+        if requeued or failed:
+            print(f"[JOBS] Recovered {requeued} interrupted jobs ({failed} failed after {MAX_ATTEMPTS} attempts)")
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Și în timpul rulării: job-urile unui proces oprit nu așteaptă următorul restart
+            _requeue_expired(conn)
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1,
+                                    owner = ?, lease_expires_at = ?
+                    WHERE job_id = ?
+                    """,
+                    (_now(), self.owner, _lease_expiry(), row["job_id"]),
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return row
+
+    def _finish(self, job_id: str, result: Any = None, error: Optional[str] = None):
+        """Doar cât job-ul e încă al acestui proces (un lease pierdut înseamnă că a fost repus în coadă)."""
+        with self._conn() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_expires_at = NULL
+                WHERE job_id = ? AND status = 'running' AND owner = ?
+                """,
+                (
+                    "failed" if error else "done",
+                    None if error else json.dumps(result, ensure_ascii=False),
+                    error,
+                    _now(),
+                    job_id,
+                    self.owner,
+                ),
+            )
+
+    def _heartbeat(self):
+        """Reînnoiește lease-ul job-urilor `running` ale acestui proces cât timp handler-ele rulează."""
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                with self._conn() as conn:
+                    conn.execute(
+                        "UPDATE jobs SET lease_expires_at = ? WHERE status = 'running' AND owner = ?",
+                        (_lease_expiry(), self.owner),
+                    )
+            except sqlite3.OperationalError as exc:
+                print(f"[WARN] Job queue heartbeat: {exc}")
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.OperationalError as exc:
+                print(f"[WARN] Job queue: {exc}")
+                row = None
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(POLL_INTERVAL)
+                continue
+
+            kind = row["kind"]
+            created = datetime.datetime.fromisoformat(row["created_at"])
+            observe(f"job.wait {kind}", (datetime.datetime.utcnow() - created).total_seconds())
+            try:
+                with span("job.run", kind=kind):
+                    result = self.handlers[kind](json.loads(row["payload"]))
+            except Exception as exc:
+                incr("jobs_failed", kind=kind)
+                self._finish(row["job_id"], error=f"{type(exc).__name__}: {exc}")
+            else:
+                incr("jobs_done", kind=kind)
+                self._finish(row["job_id"], result=result)
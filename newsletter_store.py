@@ -0,0 +1,85 @@
+"""
+Cache + istoric pentru generarea newsletter-ului, în același SQLite ca videourile/trendurile.
+
+Fiecare rulare e o linie în `newsletter_runs`, cu hash-ul input-urilor prompt-ului
+(tabel de statistici, template, model). O rulare nouă cu același hash refolosește
+ultimul output generat în loc să apeleze Gemini.
+"""
+import hashlib
+import json
+import sqlite3
+from typing import Dict, List, Optional
+
+
+def init_newsletter_table(conn: sqlite3.Connection):
+    """Creează tabelul newsletter_runs (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS newsletter_runs (
+            id INTEGER PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            input_hash TEXT NOT NULL,
+            model TEXT,
+            locale TEXT,
+            status TEXT NOT NULL,       -- generated | cached | failed
+            duration_ms INTEGER,
+            output TEXT,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_newsletter_runs_hash ON newsletter_runs(input_hash, status);
+        """
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(newsletter_runs)")}
+    if "locale" not in columns:  # tabele create înainte de --locales
+        conn.execute("ALTER TABLE newsletter_runs ADD COLUMN locale TEXT")
+
+
+def input_hash(**inputs) -> str:
+    """Hash stabil al input-urilor (ordinea argumentelor nu contează)."""
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cached_output(conn: sqlite3.Connection, digest: str) -> Optional[str]:
+    """Ultimul newsletter generat pentru același hash de input, dacă există."""
+    row = conn.execute(
+        "SELECT output FROM newsletter_runs WHERE input_hash = ? AND status = 'generated' ORDER BY id DESC LIMIT 1",
+        (digest,),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def record_run(
+    conn: sqlite3.Connection,
+    created_at: str,
+    digest: str,
+    model: str,
+    status: str,
+    duration_ms: int,
+    output: str = None,
+    error: str = None,
+    locale: str = None,
+):
+    """Adaugă o rulare în istoric (output-ul se păstrează doar pentru status='generated')."""
+    conn.execute(
+        """
+        INSERT INTO newsletter_runs (created_at, input_hash, model, locale, status, duration_ms, output, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (created_at, digest, model, locale, status, duration_ms, output if status == "generated" else None, error),
+    )
+    conn.commit()
+
+
+def run_history(conn: sqlite3.Connection, limit: int = 20) -> List[Dict]:
+    rows = conn.execute(
+        """
+        SELECT id, created_at, substr(input_hash, 1, 12), model, locale, status, duration_ms, error
+        FROM newsletter_runs
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (limit,),
+    )
+    columns = ["id", "created_at", "input_hash", "model", "locale", "status", "duration_ms", "error"]
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Descoperire lexicală de termeni noi (fără AI, fără embeddings): n-grame din titluri și
+tags numărate cu count-min sketch, comparate între fereastra recentă și o fereastră de bază.
+
+- Fereastra e glisantă, ancorată pe cel mai nou video din DB (sau `--now`):
+    [now - recent_days, now]                         -> sketch "recent"
+    [now - recent_days - baseline_days, now - recent_days) -> sketch "baseline"
+- Fiecare video contribuie o singură dată per n-gram (frecvență pe documente), cu
+  n-grame de 1..MAX_N cuvinte din titlu și tag-urile scurte ca fraze întregi.
+- Memoria e fixă: două sketch-uri depth x width contoare uint32, plus o listă limitată
+  de candidați (n-gramele care au atins `min_count` în fereastra recentă).
+- Un n-gram e semnalat când numărul recent depășește semnificativ valoarea așteptată
+  din baseline (scalată la volumul ferestrei recente): z = (r - e) / sqrt(e + 1).
+
+Usage:
+  python ngram_discovery.py --db youtube_videos.db
+  python ngram_discovery.py --db youtube_videos.db --recent-days 3 --baseline-days 21 --top 50
+  python calculate_trends_simple.py --db youtube_videos.db --discover   # termenii intră în trenduri
+"""
+import argparse
+import datetime
+import json
+import math
+import re
+import sqlite3
+import zlib
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set
+
+from db_connection import connect_reader
+from instrumentation import incr, span
+from video_archive import window_rows
+from video_storage import hydrate_videos
+
+MAX_N = 3
+DEFAULT_RECENT_DAYS = 7
+DEFAULT_BASELINE_DAYS = 28
+DEFAULT_MIN_COUNT = 5
+DEFAULT_Z = 4.0
+DEFAULT_MIN_RATIO = 2.0
+SKETCH_WIDTH = 1 << 17
+SKETCH_DEPTH = 4
+MAX_CANDIDATES = 50_000
+BATCH_SIZE = 5_000
+
+STOPWORDS = {
+    # engleză
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "get", "how", "i", "in",
+    "is", "it", "its", "me", "my", "new", "of", "on", "or", "our", "so", "that", "the", "this", "to",
+    "vs", "we", "what", "who", "why", "with", "you", "your", "all", "best", "most", "more", "part",
+    # română
+    "si", "și", "cu", "de", "la", "in", "în", "pe", "din", "care", "ce", "un", "o", "mai", "ca", "să",
+    "sa", "nu", "am", "are", "eu", "tu", "al", "ale", "lui", "pentru", "cum",
+    # formatul YouTube, nu conținutul
+    "video", "videos", "shorts", "short", "vlog", "official", "episode", "full", "live", "channel",
+    "subscribe", "youtube", "tiktok", "edition",
+}
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Cuvinte lowercase (doar litere; cifrele și punctuația separă tokenii)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def video_ngrams(title: str, tags: Iterable[str], max_n: int = MAX_N) -> Set[str]:
+    """
+    N-gramele distincte ale unui video: 1..max_n cuvinte consecutive din titlu care nu
+    încep / nu se termină cu stopword, plus tag-urile de cel mult max_n cuvinte.
+    """
+    grams: Set[str] = set()
+    tokens = tokenize(title or "")
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            first, last = tokens[i], tokens[i + n - 1]
+            if first in STOPWORDS or last in STOPWORDS:
+                continue
+            if n == 1 and len(first) < 3:
+                continue
+            grams.add(" ".join(tokens[i : i + n]))
+    for tag in tags or ():
+        words = tokenize(tag)
+        if 1 <= len(words) <= max_n and words[0] not in STOPWORDS and words[-1] not in STOPWORDS:
+            if len(words) > 1 or len(words[0]) >= 3:
+                grams.add(" ".join(words))
+    return grams
+
+
+class CountMinSketch:
+    """
+    Count-min cu update conservator: estimarea nu subestimează niciodată, iar eroarea
+    e de ordinul e/width * total. Indexurile vin din double hashing pe două CRC-uri
+    (stabile între procese, spre deosebire de hash()).
+    """
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, item: str) -> List[int]:
+        data = item.encode("utf-8")
+        h1 = zlib.crc32(data)
+        h2 = zlib.crc32(data, 0x9E3779B9) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Adaugă `count` și întoarce noua estimare pentru `item`."""
+        indexes = self._indexes(item)
+        rows = self.rows
+        estimate = min(rows[i][j] for i, j in enumerate(indexes)) + count
+        for i, j in enumerate(indexes):
+            if rows[i][j] < estimate:
+                rows[i][j] = estimate
+        self.total += count
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(self.rows[i][j] for i, j in enumerate(self._indexes(item)))
+
+    def memory_bytes(self) -> int:
+        return self.depth * self.width * 4
+
+
+def _iso(dt: datetime.datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _latest_publish_date(conn: sqlite3.Connection) -> Optional[datetime.datetime]:
+    row = conn.execute("SELECT MAX(publish_date) FROM videos").fetchone()
+    if not row or not row[0]:
+        return None
+    return datetime.datetime.fromisoformat(row[0].replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def _suppress_overlaps(flagged: List[Dict], overlap: float = 0.8) -> List[Dict]:
+    """
+    Păstrează o singură formă per termen: scoate n-gramele conținute într-unul mai lung
+    care le acoperă aproape toate aparițiile ("siren" când "office siren" are >= 80% din
+    numărul lui) și extensiile rare ale unui termen mai scurt ("office siren makeup").
+    """
+    kept = []
+    for item in flagged:
+        padded = f" {item['term']} "
+        redundant = False
+        for other in flagged:
+            if other["n"] > item["n"] and padded in f" {other['term']} ":
+                redundant = other["recent"] >= overlap * item["recent"]
+            elif other["n"] < item["n"] and f" {other['term']} " in padded:
+                redundant = item["recent"] < overlap * other["recent"]
+            if redundant:
+                break
+        if not redundant:
+            kept.append(item)
+    return kept
+
+
+def discover_terms(
+    conn: sqlite3.Connection,
+    now: datetime.datetime = None,
+    recent_days: int = DEFAULT_RECENT_DAYS,
+    baseline_days: int = DEFAULT_BASELINE_DAYS,
+    min_count: int = DEFAULT_MIN_COUNT,
+    z_threshold: float = DEFAULT_Z,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    width: int = SKETCH_WIDTH,
+    depth: int = SKETCH_DEPTH,
+) -> List[Dict]:
+    """
+    N-gramele în creștere bruscă, sortate după z descrescător. Fiecare rezultat are
+    term, n, recent, baseline, expected, ratio, z. `now` implicit = cel mai nou video.
+    """
+    now = now or _latest_publish_date(conn)
+    if now is None:
+        return []
+    recent_start = _iso(now - datetime.timedelta(days=recent_days))
+    baseline_start = _iso(now - datetime.timedelta(days=recent_days + baseline_days))
+
+    recent = CountMinSketch(width, depth)
+    baseline = CountMinSketch(width, depth)
+    recent_docs = baseline_docs = 0
+    candidates: Dict[str, int] = {}
+
+    with span("discover.count", recent_days=recent_days, baseline_days=baseline_days) as s:
+        columns = ("video_id", "title", "tags", "publish_date")
+        rows = window_rows(conn, columns, baseline_start, _iso(now))
+        while True:
+            batch = [dict(zip(columns, row)) for row in islice(rows, BATCH_SIZE)]
+            if not batch:
+                break
+            for video in hydrate_videos(conn, batch, with_descriptions=False):
+                grams = video_ngrams(video["title"], video["tags"])
+                if video["publish_date"] >= recent_start:
+                    recent_docs += 1
+                    for gram in grams:
+                        if recent.add(gram) >= min_count:
+                            candidates[gram] = 1
+                else:
+                    baseline_docs += 1
+                    for gram in grams:
+                        baseline.add(gram)
+            if len(candidates) > MAX_CANDIDATES:
+                # Memorie limitată: păstrează jumătatea cu cele mai mari estimări recente
+                ranked = sorted(candidates, key=recent.estimate, reverse=True)
+                candidates = dict.fromkeys(ranked[: MAX_CANDIDATES // 2], 1)
+        s["videos"] = recent_docs + baseline_docs
+        s["candidates"] = len(candidates)
+        s["sketch_bytes"] = recent.memory_bytes() + baseline.memory_bytes()
+    incr("rows_processed", stage="discover.count", value=recent_docs + baseline_docs)
+
+    if not recent_docs or not baseline_docs:
+        # Fără baseline, valoarea așteptată ar fi 0 și orice n-gram cu min_count ar părea „în creștere”
+        return []
+    # Baseline-ul e scalat la volumul ferestrei recente (mai multe videouri colectate != trend)
+    scale = recent_docs / baseline_docs
+    flagged = []
+    for gram in candidates:
+        r = recent.estimate(gram)
+        b = baseline.estimate(gram)
+        expected = b * scale
+        z = (r - expected) / math.sqrt(expected + 1)
+        ratio = r / (expected + 1)
+        if r >= min_count and z >= z_threshold and ratio >= min_ratio:
+            flagged.append({
+                "term": gram,
+                "n": gram.count(" ") + 1,
+                "recent": r,
+                "baseline": b,
+                "expected": round(expected, 2),
+                "ratio": round(ratio, 2),
+                "z": round(z, 2),
+            })
+    flagged.sort(key=lambda t: (-t["z"], t["term"]))
+    return _suppress_overlaps(flagged)
+
+
+def discover_from_db(db_path: str, top: int = 30, **kwargs) -> List[Dict]:
+    """Deschide o conexiune read-only și întoarce primii `top` termeni descoperiți."""
+    conn = connect_reader(db_path)
+    try:
+        return discover_terms(conn, **kwargs)[:top]
+    finally:
+        conn.close()
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Discover emerging title/tag n-grams with count-min sketches (no AI)")
+    p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
+    p.add_argument("--now", default=None, help="Window anchor, ISO date (default: newest video in the DB)")
+    p.add_argument("--recent-days", type=int, default=DEFAULT_RECENT_DAYS, help=f"Recent window (default: {DEFAULT_RECENT_DAYS})")
+    p.add_argument("--baseline-days", type=int, default=DEFAULT_BASELINE_DAYS, help=f"Baseline window before it (default: {DEFAULT_BASELINE_DAYS})")
+    p.add_argument("--min-count", type=int, default=DEFAULT_MIN_COUNT, help=f"Minimum recent videos per n-gram (default: {DEFAULT_MIN_COUNT})")
+    p.add_argument("--z", type=float, default=DEFAULT_Z, help=f"Burst z-score threshold (default: {DEFAULT_Z})")
+    p.add_argument("--min-ratio", type=float, default=DEFAULT_MIN_RATIO, help=f"Minimum recent/expected ratio (default: {DEFAULT_MIN_RATIO})")
+    p.add_argument("--width", type=int, default=SKETCH_WIDTH, help=f"Count-min sketch width (default: {SKETCH_WIDTH})")
+    p.add_argument("--top", type=int, default=30, help="Terms to show (default: 30)")
+    p.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    now = datetime.datetime.fromisoformat(args.now.replace("Z", "+00:00")).replace(tzinfo=None) if args.now else None
+    terms = discover_from_db(
+        args.db,
+        top=args.top,
+        now=now,
+        recent_days=args.recent_days,
+        baseline_days=args.baseline_days,
+        min_count=args.min_count,
+        z_threshold=args.z,
+        min_ratio=args.min_ratio,
+        width=args.width,
+    )
+    if args.json:
+        print(json.dumps(terms, ensure_ascii=False, indent=2))
+        return
+    if not terms:
+        print("No bursting n-grams found. Try --min-count 3 or a longer --recent-days window")
+        print("(nothing is reported when the baseline window has no videos; see --baseline-days).")
+        return
+    print(f"{'Term':<40} {'Recent':>7} {'Base':>7} {'Expected':>9} {'Ratio':>7} {'z':>7}")
+    print("-" * 82)
+    for t in terms:
+        print(f"{t['term'][:40]:<40} {t['recent']:>7} {t['baseline']:>7} {t['expected']:>9.1f} {t['ratio']:>7.1f} {t['z']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
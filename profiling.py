@@ -0,0 +1,117 @@
+"""
+Hook opțional de profiling (cProfile / pyinstrument) comun pentru toate entry point-urile.
+
+Activare:
+  python calculate_trends_simple.py --profile                 # cProfile
+  python calculate_trends_simple.py --profile pyinstrument    # dacă pyinstrument e instalat
+  STYLX_PROFILE=cprofile python view_trends.py                # fără flag, prin env
+
+Output în `--profile-dir` / STYLX_PROFILE_DIR (default: profiles/):
+  cProfile     -> <nume>-<timestamp>.prof (pstats, pentru snakeviz/flameprof) + .txt sortat după cumtime
+  pyinstrument -> <nume>-<timestamp>.html + .speedscope.json (flamegraph)
+"""
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cprofile", "pyinstrument")
+DEFAULT_PROFILE_DIR = "profiles"
+
+
+def add_profile_args(parser):
+    """Adaugă `--profile [MODE]` și `--profile-dir` la un ArgumentParser."""
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile this run (cprofile or pyinstrument; default env STYLX_PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help=f"Where profile output is written (default env STYLX_PROFILE_DIR or '{DEFAULT_PROFILE_DIR}')",
+    )
+
+
+def resolve_mode(mode: str = None) -> str:
+    """Flag-ul are prioritate; altfel STYLX_PROFILE (1/true = cprofile). None = dezactivat."""
+    if mode:
+        return mode
+    env = os.getenv("STYLX_PROFILE", "").strip().lower()
+    if env in ("", "0", "false", "no"):
+        return None
+    if env in ("1", "true", "yes"):
+        return "cprofile"
+    return env if env in PROFILE_MODES else "cprofile"
+
+
+def _output_base(name: str, out_dir: str = None) -> str:
+    out_dir = out_dir or os.getenv("STYLX_PROFILE_DIR") or DEFAULT_PROFILE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(out_dir, f"{name}-{stamp}")
+
+
+def _write_cprofile(profiler: cProfile.Profile, base: str) -> str:
+    profiler.dump_stats(base + ".prof")
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(50)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(buf.getvalue())
+    return base + ".prof"
+
+
+def _write_pyinstrument(profiler, base: str) -> str:
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    with open(base + ".html", "w", encoding="utf-8") as f:
+        f.write(profiler.output_html())
+    with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+    return base + ".html"
+
+
+@contextmanager
+def profiled(name: str, mode: str = None, out_dir: str = None, quiet: bool = False):
+    """
+    Profilează blocul dacă profiling-ul e activ (flag sau env); altfel nu face nimic.
+    Dict-ul returnat primește cheia "output" cu calea fișierului scris.
+    """
+    info = {"mode": resolve_mode(mode), "output": None}
+    if not info["mode"]:
+        yield info
+        return
+
+    if info["mode"] == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("[PROFILE] pyinstrument is not installed, falling back to cProfile", file=sys.stderr)
+            info["mode"] = "cprofile"
+
+    if info["mode"] == "pyinstrument":
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            yield info
+        finally:
+            profiler.stop()
+            info["output"] = _write_pyinstrument(profiler, _output_base(name, out_dir))
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield info
+        finally:
+            profiler.disable()
+            info["output"] = _write_cprofile(profiler, _output_base(name, out_dir))
+
+    if not quiet:
+        # stderr, ca să nu stricăm output-ul --json redirecționat
+        print(f"[PROFILE] {info['mode']} output written to {info['output']}", file=sys.stderr)
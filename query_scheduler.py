@@ -0,0 +1,132 @@
+"""
+Programare adaptivă a query-urilor de search după randament (videouri noi per unitate de quota).
+
+Fiecare rulare salvează în `query_stats`, per query, quota consumată și câte ID-uri
+necunoscute în DB a adus, ca sume cu decay (rulările recente contează mai mult). Cu un
+buget de quota, `QueryScheduler.plan` împarte paginile de search (100 unități fiecare)
+ca un bandit UCB:
+
+- valoarea unei pagini = randamentul mediu al query-ului + bonus de explorare, care
+  crește cu cât query-ul n-a mai fost rulat de multe rulări (deci revine periodic);
+- paginile mai adânci ale aceluiași query valorează mai puțin (DEPTH_DECAY);
+- query-urile noi sunt optimiste: primesc o pagină înaintea celor cunoscute;
+- paginile se alocă greedy, cea mai valoroasă pagină rămasă întâi, până se termină bugetul.
+
+Query-urile care aduc mai ales videouri deja cunoscute primesc mai puține pagini sau
+sunt sărite la unele rulări, iar quota merge spre cele cu videouri proaspete.
+"""
+import datetime
+import heapq
+import math
+import sqlite3
+from typing import Dict, List
+
+from crawl_planner import QUOTA_COST, VIDEOS_BATCH
+
+DECAY = 0.8  # ponderea istoricului la fiecare rulare nouă a query-ului
+DEPTH_DECAY = 0.7  # valoarea paginii k+1 față de pagina k
+EXPLORATION = 1.0
+# O pagină de search costă search + (în cel mai rău caz) un lot videos.list pentru ID-urile ei
+PAGE_COST = QUOTA_COST["search"] + QUOTA_COST["videos"]
+
+
+def init_query_stats_table(conn: sqlite3.Connection):
+    """Creează tabelul query_stats (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS query_stats (
+            query TEXT PRIMARY KEY,
+            runs INTEGER NOT NULL DEFAULT 0,
+            quota REAL NOT NULL DEFAULT 0,      -- sumă cu decay
+            new_ids REAL NOT NULL DEFAULT 0,    -- sumă cu decay
+            last_pages INTEGER,
+            last_new_ids INTEGER,
+            last_run_at TEXT,
+            last_round INTEGER                  -- numărul rulării globale la ultima programare
+        ) WITHOUT ROWID
+        """
+    )
+
+
+class QueryScheduler:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        init_query_stats_table(conn)
+        conn.commit()
+        row = conn.execute("SELECT COALESCE(MAX(last_round), 0) FROM query_stats").fetchone()
+        self.round = row[0] + 1
+
+    def _stats(self, queries: List[str]) -> Dict[str, tuple]:
+        stats = {}
+        for i in range(0, len(queries), 500):
+            chunk = queries[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for q, runs, quota, new_ids, last_round in self.conn.execute(
+                f"SELECT query, runs, quota, new_ids, last_round FROM query_stats WHERE query IN ({placeholders})",
+                chunk,
+            ):
+                stats[q] = (runs, quota, new_ids, last_round)
+        return stats
+
+    def scores(self, queries: List[str]) -> Dict[str, float]:
+        """Valoarea (ID-uri noi per unitate de quota + bonus UCB) a primei pagini a fiecărui query."""
+        stats = self._stats(queries)
+        yields = {q: new_ids / quota for q, (runs, quota, new_ids, _) in stats.items() if quota > 0}
+        scale = sum(yields.values()) / len(yields) if yields else 1.0 / PAGE_COST
+        result = {}
+        for q in queries:
+            if q not in yields:
+                continue
+            runs, _, _, last_round = stats[q]
+            idle = self.round - (last_round or 0)  # rulări de când n-a mai fost programat
+            bonus = EXPLORATION * scale * math.sqrt(math.log(self.round + idle) / max(runs, 1))
+            result[q] = yields[q] + bonus
+        optimistic = max(result.values(), default=scale) * 2
+        for q in queries:
+            result.setdefault(q, optimistic)
+        return result
+
+    def plan(self, queries: List[str], quota_budget: int, max_pages: int) -> Dict[str, int]:
+        """Query -> pagini de search pentru rularea curentă (0 = sărit), în limita bugetului."""
+        queries = list(dict.fromkeys(queries))
+        scores = self.scores(queries)
+        pages = {q: 0 for q in queries}
+        heap = [(-scores[q], i, q) for i, q in enumerate(queries)]
+        heapq.heapify(heap)
+        remaining = quota_budget
+        while heap and remaining >= PAGE_COST:
+            neg_value, i, q = heapq.heappop(heap)
+            pages[q] += 1
+            remaining -= PAGE_COST
+            if pages[q] < max_pages:
+                heapq.heappush(heap, (neg_value * DEPTH_DECAY, i, q))
+        return pages
+
+    def record(self, query: str, pages: int, new_ids: int):
+        """Salvează rezultatul unei rulări (quota efectiv consumată pe search și ID-uri noi)."""
+        quota = pages * QUOTA_COST["search"] + math.ceil(new_ids / VIDEOS_BATCH) * QUOTA_COST["videos"]
+        self.conn.execute(
+            """
+            INSERT INTO query_stats (query, runs, quota, new_ids, last_pages, last_new_ids, last_run_at, last_round)
+            VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(query) DO UPDATE SET
+                runs = runs + 1,
+                quota = quota * ? + excluded.quota,
+                new_ids = new_ids * ? + excluded.new_ids,
+                last_pages = excluded.last_pages,
+                last_new_ids = excluded.last_new_ids,
+                last_run_at = excluded.last_run_at,
+                last_round = excluded.last_round
+            """,
+            (query, quota, new_ids, pages, new_ids, datetime.datetime.utcnow().isoformat(), self.round, DECAY, DECAY),
+        )
+
+    def report(self, pages: Dict[str, int]) -> str:
+        scores = self.scores(list(pages))
+        stats = self._stats(list(pages))
+        lines = [f"{'Query':<40} {'Runs':>5} {'New/100u':>9} {'Pages':>6}"]
+        for q in sorted(pages, key=lambda q: (-pages[q], -scores[q], q)):
+            runs, quota, new_ids, _ = stats.get(q, (0, 0, 0, None))
+            observed = f"{100 * new_ids / quota:.1f}" if quota else "new"
+            lines.append(f"{q[:40]:<40} {runs:>5} {observed:>9} {pages[q] or 'skip':>6}")
+        return "\n".join(lines)
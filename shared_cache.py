@@ -0,0 +1,191 @@
+"""
+Cache partajat pe disc (SQLite WAL) pentru toate procesele API-ului: rezultate de tool,
+răspunsuri ale agentului, marcajele warmer-ului și metricile per worker.
+
+Cu mai mulți workeri (gunicorn / `uvicorn --workers`), un cache în memorie ar fi fost
+împărțit pe procese: fiecare worker ar fi cerut aceleași date de la YouTube / Gemini.
+Aici toate procesele citesc același fișier (`STYLX_CACHE_DB`, default `cache.db`), iar
+`single_flight` garantează că o valoare lipsă e calculată de un singur proces / thread,
+ceilalți așteptând rezultatul.
+
+    store = get_store()
+    hit = store.get("tool", key)                 # (valoare, warmed) sau None
+    with store.single_flight("tool", key) as leader:
+        if leader:
+            store.put("tool", key, compute(), ttl=3600)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from db_connection import connect_writer
+
+CACHE_DB = os.getenv("STYLX_CACHE_DB", "cache.db")
+LEASE_SECONDS = 60.0  # după atât, un calcul neterminat (proces mort) poate fi preluat
+POLL_SECONDS = 0.05
+
+
+def init_cache_tables(conn: sqlite3.Connection):
+    """Creează tabelele cache_entries, cache_leases și worker_metrics (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,          -- JSON
+            warmed INTEGER NOT NULL DEFAULT 0,
+            expires_at REAL NOT NULL,     -- epoch
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS cache_leases (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS worker_metrics (
+            worker TEXT PRIMARY KEY,
+            snapshot TEXT NOT NULL,       -- JSON (instrumentation.snapshot)
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+class SharedCache:
+    def __init__(self, db_path: str = CACHE_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        init_cache_tables(conn)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """O conexiune per thread; WAL permite cititori în paralel cu un scriitor."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect_writer(self.db_path, check_same_thread=False)
+        return conn
+
+    # ---------------- valori ----------------
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, bool]]:
+        row = self._conn().execute(
+            "SELECT value, warmed FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at >= ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return None if row is None else (json.loads(row[0]), bool(row[1]))
+
+    def put(self, namespace: str, key: str, value: Any, ttl: float, warmed: bool = False):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, warmed, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), int(warmed), time.time() + ttl),
+            )
+
+    def clear(self, namespace: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def purge_expired(self) -> int:
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),)).rowcount
+
+    # ---------------- single flight ----------------
+
+    @staticmethod
+    def _owner() -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _try_lease(self, namespace: str, key: str, owner: str, lease: float) -> bool:
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM cache_leases WHERE namespace = ? AND key = ? AND expires_at < ?", (namespace, key, now)
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO cache_leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, owner, now + lease),
+            )
+            return cursor.rowcount == 1
+
+    def renew_lease(self, namespace: str, key: str, lease: float = LEASE_SECONDS) -> bool:
+        """Prelungește lease-ul ținut de thread-ul curent; False dacă l-a pierdut (expirat și preluat)."""
+        with self._conn() as conn:
+            cursor = conn.execute(
+                "UPDATE cache_leases SET expires_at = ? WHERE namespace = ? AND key = ? AND owner = ?",
+                (time.time() + lease, namespace, key, self._owner()),
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def single_flight(self, namespace: str, key: str, wait: float = LEASE_SECONDS, lease: float = LEASE_SECONDS):
+        """
+        Yield True dacă procesul / thread-ul curent trebuie să calculeze valoarea (are lease-ul,
+        valabil `lease` secunde; calculele lungi îl prelungesc cu `renew_lease`).
+        Altfel așteaptă până când valoarea apare sau lease-ul dispare și yield False; apelantul
+        verifică din nou cache-ul (și calculează singur dacă lease-ul a expirat fără rezultat).
+        """
+        owner = self._owner()
+        if self._try_lease(namespace, key, owner, lease):
+            try:
+                yield True
+            finally:
+                with self._conn() as conn:
+                    conn.execute(
+                        "DELETE FROM cache_leases WHERE namespace = ? AND key = ? AND owner = ?", (namespace, key, owner)
+                    )
+            return
+
+        deadline = time.monotonic() + wait
+        conn = self._conn()
+        while time.monotonic() < deadline:
+            if self.get(namespace, key) is not None:
+                break
+            held = conn.execute(
+                "SELECT 1 FROM cache_leases WHERE namespace = ? AND key = ? AND expires_at >= ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+            if held is None:
+                break
+            time.sleep(POLL_SECONDS)
+        yield False
+
+    # ---------------- metrici per worker ----------------
+
+    def publish_metrics(self, worker: str, snapshot: Dict):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO worker_metrics (worker, snapshot, updated_at) VALUES (?, ?, ?)",
+                (worker, json.dumps(snapshot), time.time()),
+            )
+
+    def worker_metrics(self, max_age: float) -> Dict[str, Dict]:
+        """Snapshot-urile workerilor care au publicat în ultimele `max_age` secunde."""
+        rows = self._conn().execute(
+            "SELECT worker, snapshot FROM worker_metrics WHERE updated_at >= ? ORDER BY worker",
+            (time.time() - max_age,),
+        )
+        return {worker: json.loads(snapshot) for worker, snapshot in rows}
+
+    def remove_worker(self, worker: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM worker_metrics WHERE worker = ?", (worker,))
+
+
+_store: Optional[SharedCache] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SharedCache:
+    """Store-ul partajat al procesului curent (creat leneș, după fork-ul workerului)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedCache(CACHE_DB)
+        return _store
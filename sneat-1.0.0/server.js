@@ -14,6 +14,9 @@ const DB_PATH = path.join(DATA_DIR, 'app.db');
 const UPLOAD_DIR = path.join(DATA_DIR, 'uploads');
 const STATS_FILE_PATH = path.join(APP_ROOT, '..', 'Stats.md');
 const NEWSLETTER_FILE_PATH = path.join(APP_ROOT, '..', 'Newsletter.md');
+const EXPORTS_DIR = process.env.STYLX_EXPORT_DIR
+  ? path.resolve(APP_ROOT, '..', process.env.STYLX_EXPORT_DIR)
+  : path.join(APP_ROOT, '..', 'exports');
 
 dotenv.config({ path: path.join(APP_ROOT, '..', '.env') });
 
@@ -633,6 +636,23 @@ app.use('/fonts', express.static(path.join(APP_ROOT, 'fonts')));
 app.use('/uploads', express.static(UPLOAD_DIR));
 app.use('/html', express.static(path.join(APP_ROOT, 'html'), staticOptions));
 app.use('/tasks', express.static(path.join(APP_ROOT, 'tasks')));
+// Trend snapshots written by trend_export.py: hashed files never change, only manifest.json does
+app.use(
+  '/exports',
+  express.static(EXPORTS_DIR, {
+    setHeaders: (res, filePath) => {
+      if (filePath.endsWith('.json.gz')) {
+        res.setHeader('Content-Type', 'application/json; charset=utf-8');
+        res.setHeader('Content-Encoding', 'gzip');
+        res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+      } else if (filePath.endsWith('.parquet')) {
+        res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+      } else {
+        res.setHeader('Cache-Control', 'no-cache');
+      }
+    }
+  })
+);
 app.use(express.static(path.join(APP_ROOT, 'html'), staticOptions));
 
 app.get('/', (_req, res) => {
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modulele proiectului sunt la rădăcina repo-ului (fără pachet instalabil)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,92 @@
+"""Cititorii (`connect_reader`) nu se blochează pe scriitorul WAL, iar pool-ul rămâne în `size`."""
+import queue
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db_connection import ConnectionPool, connect_reader, connect_writer
+
+READERS = 4
+DURATION_SECONDS = 1.5
+WRITE_HOLD_SECONDS = 0.6
+MAX_READ_SECONDS = 0.3  # fără WAL, o citire ar aștepta scriitorul cât ține tranzacția
+
+
+def _create_db(path):
+    conn = connect_writer(str(path))
+    conn.execute("CREATE TABLE videos (video_id TEXT PRIMARY KEY, title TEXT, publish_date TEXT, view_count INTEGER)")
+    conn.commit()
+    conn.close()
+
+
+def test_readers_never_block_on_writer(tmp_path):
+    db = tmp_path / "videos.db"
+    _create_db(db)
+    stop = threading.Event()
+    errors = []
+    latencies = []
+    written = [0]
+
+    def writer():
+        conn = connect_writer(str(db))
+        n = 0
+        while not stop.is_set():
+            # Lock exclusiv ținut WRITE_HOLD_SECONDS: cu rollback journal cititorii ar aștepta tot atât
+            conn.execute("BEGIN EXCLUSIVE")
+            conn.executemany(
+                "INSERT INTO videos VALUES (?, ?, ?, ?)",
+                [(f"v{n + i}", "title", "2025-11-01", i) for i in range(500)],
+            )
+            time.sleep(WRITE_HOLD_SECONDS)
+            conn.commit()
+            n += 500
+            written[0] = n
+        conn.close()
+
+    def reader():
+        conn = connect_reader(str(db))
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn.execute("SELECT COUNT(*), MAX(view_count) FROM videos").fetchone()
+            except sqlite3.OperationalError as exc:
+                errors.append(str(exc))
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert written[0] > 0
+    assert latencies
+    assert not [e for e in errors if "locked" in e], errors
+    assert not errors
+    assert max(latencies) < MAX_READ_SECONDS
+
+
+def test_pool_close_keeps_size(tmp_path):
+    db = tmp_path / "videos.db"
+    _create_db(db)
+    pool = ConnectionPool(str(db), size=2)
+    borrowed = pool.acquire()
+    pool.release(pool.acquire())
+    pool.close()
+
+    fresh = pool.acquire()
+    with pytest.raises(queue.Empty):  # locul lui `borrowed` e încă ocupat: maxim `size` conexiuni vii
+        pool.acquire(timeout=0.2)
+    pool.release(borrowed)  # împrumutată înainte de close(): se închide, nu revine în pool
+    with pytest.raises(sqlite3.ProgrammingError):
+        borrowed.execute("SELECT 1")
+    second = pool.acquire(timeout=1)
+    pool.release(fresh)
+    pool.release(second)
+    assert pool._created == 2
+    assert pool._idle.qsize() == 2
@@ -0,0 +1,183 @@
+"""
+Gruparea variantelor de nume de trend ("oversized blazer trend", "oversized blazers") sub
+un nume canonic, cu MinHash pe shingle-uri de caractere + LSH (banding).
+
+- Fiecare nume brut primește o cheie (lowercase, fără cuvinte generice ca "trend"/"style",
+  plural simplu -> singular) și o semnătură MinHash de NUM_PERM valori.
+- Semnătura e tăiată în BANDS benzi; două nume sunt candidate doar dacă au cel puțin o
+  bandă identică, deci nu se compară toate perechile.
+- Numele se procesează de la cel mai frecvent: fiecare se atașează canonicului candidat
+  cu cel mai mare Jaccard exact pe shingle-uri (>= threshold) sau devine el însuși canonic.
+  Comparația e doar cu canonicele, deci nu apar lanțuri A~B~C care unesc trenduri diferite.
+
+Rezultatul e salvat în tabelul `trend_aliases` (alias -> canonical + benzile LSH), deci la
+rulările următoare doar numele noi sunt hash-uite, iar canonicele vechi rămân stabile.
+"""
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS  # prag LSH ~ (1/16)^(1/4) ~ 0.5
+DEFAULT_THRESHOLD = 0.7
+MAX_CANDIDATES = 200  # per nume, ca bucket-urile foarte populate să nu devină pătratice
+
+GENERIC_WORDS = {
+    "trend", "trends", "trending", "style", "styles", "look", "looks",
+    "vibe", "vibes", "aesthetic", "aesthetics", "the", "a", "an",
+}
+
+_PRIME = 4294967311  # > 2^32
+_rng = random.Random(1234)  # permutări fixe: benzile salvate rămân valide între rulări
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_BANDS_FORMAT = f"<{BANDS}q"
+
+
+def _singular(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def alias_key(name: str) -> str:
+    """Forma pe care se compară numele: fără cuvinte generice, tokeni la singular."""
+    tokens = re.findall(r"\w+", name.lower())
+    kept = [t for t in tokens if t not in GENERIC_WORDS] or tokens
+    return " ".join(_singular(t) for t in kept)
+
+
+def shingles(key: str) -> Set[str]:
+    padded = f" {key} "
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i : i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _permuted(shingle: str) -> tuple:
+    h = zlib.crc32(shingle.encode("utf-8"))
+    return tuple((a * h + b) % _PRIME for a, b in _PERMS)
+
+
+def minhash(shingle_set: Iterable[str], cache: Dict[str, tuple] = None) -> List[int]:
+    """
+    Semnătura = minimul pe fiecare permutare. Valorile permutate se calculează o singură
+    dată per shingle distinct (`cache`), iar minimul pe coloane rulează în C (zip + map).
+    """
+    if cache is None:
+        cache = {}
+    rows = []
+    for s in shingle_set:
+        values = cache.get(s)
+        if values is None:
+            values = cache[s] = _permuted(s)
+        rows.append(values)
+    return list(map(min, zip(*rows)))
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    """Câte o cheie de 64 biți per bandă (stabilă între procese, spre deosebire de hash())."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS_PER_BAND}Q", *chunk), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def init_aliases_table(conn: sqlite3.Connection):
+    """Creează tabelul trend_aliases (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS trend_aliases (
+            alias TEXT PRIMARY KEY,
+            canonical TEXT NOT NULL,
+            bands BLOB NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def resolve_aliases(
+    conn: sqlite3.Connection,
+    mention_counts: Dict[str, int],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, str]:
+    """
+    Nume brut -> nume canonic pentru toate cheile din `mention_counts` (nume -> număr de
+    mențiuni). Numele deja în cache își păstrează canonicul; cele noi se leagă de cel mai
+    apropiat canonic existent sau devin canonice. Salvează aliasurile noi (fără commit).
+    """
+    init_aliases_table(conn)
+    names = list(mention_counts)
+    cached: Dict[str, str] = {}
+    for i in range(0, len(names), 500):
+        chunk = names[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        cached.update(
+            conn.execute(f"SELECT alias, canonical FROM trend_aliases WHERE alias IN ({placeholders})", chunk)
+        )
+    # Cele mai frecvente nume devin canonice primele (clustering "leader", fără lanțuri A~B~C)
+    new_names = sorted(
+        (n for n in names if n not in cached), key=lambda n: (-mention_counts[n], len(n), n)
+    )
+    result = {n: cached[n] for n in names if n in cached}
+    if not new_names:
+        return result
+
+    # Variantele care diferă doar prin cuvinte generice / plural au aceeași cheie: o singură semnătură
+    keys = {n: alias_key(n) for n in new_names}
+    key_shingles = {k: shingles(k) for k in set(keys.values())}
+    permuted: Dict[str, tuple] = {}
+    key_bands = {k: band_keys(minhash(sh, permuted)) for k, sh in key_shingles.items()}
+    touched = {(band, key) for bands in key_bands.values() for band, key in enumerate(bands)}
+
+    # Bucket-urile conțin doar canonice; cele din cache intră doar dacă ating un nume nou
+    buckets: Dict[tuple, List[str]] = defaultdict(list)
+    for canonical, blob in conn.execute("SELECT alias, bands FROM trend_aliases WHERE alias = canonical"):
+        for band, key in enumerate(struct.unpack(_BANDS_FORMAT, blob)):
+            if (band, key) in touched:
+                buckets[(band, key)].append(canonical)
+
+    leader_shingles: Dict[str, Set[str]] = {}
+    key_leader: Dict[str, str] = {}
+    rows = []
+    for name in new_names:
+        key = keys[name]
+        bands = key_bands[key]
+        best = key_leader.get(key)
+        if best is None:
+            candidates: Set[str] = set()
+            for band, band_key in enumerate(bands):
+                candidates.update(buckets.get((band, band_key), ()))
+                if len(candidates) > MAX_CANDIDATES:
+                    break
+            best_score = threshold
+            for leader in candidates:
+                if leader not in leader_shingles:
+                    leader_shingles[leader] = shingles(alias_key(leader))
+                score = jaccard(key_shingles[key], leader_shingles[leader])
+                if score >= best_score:
+                    best, best_score = leader, score
+            if best is None:
+                best = name
+                for band, band_key in enumerate(bands):
+                    buckets[(band, band_key)].append(name)
+            key_leader[key] = best
+        result[name] = best
+        rows.append((name, best, struct.pack(_BANDS_FORMAT, *bands)))
+
+    conn.executemany("INSERT OR REPLACE INTO trend_aliases (alias, canonical, bands) VALUES (?, ?, ?)", rows)
+    return result
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Export static al trendurilor pentru dashboard-ul Sneat (ApexCharts), rulat după fiecare
+calcul de trenduri.
+
+Output în `--export-dir` (default: exports/):
+  trends.<hash>.json.gz      - top N trenduri + serie zilnică (videouri, views) per trend
+  trends.<hash>.parquet      - (opțional, --parquet, necesită pyarrow) trendurile, coloane
+  series.<hash>.parquet      - (opțional) seriile zilnice în format lung: trend, date, videos, views
+  manifest.json              - singurul fișier ne-versionat: indică fișierele curente
+
+Numele conțin hash-ul conținutului, deci pot fi servite cu `Cache-Control: immutable`;
+doar manifest.json trebuie revalidat. Același conținut produce exact aceiași bytes
+(gzip fără mtime), deci o rulare fără schimbări nu invalidează cache-ul clienților.
+
+Usage (export manual dintr-un DB existent):
+  python trend_export.py --db youtube_videos.db
+  python trend_export.py --db youtube_videos.db --export-top 20 --parquet
+"""
+import argparse
+import datetime
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from db_connection import connect_reader
+from instrumentation import span
+from view_trends import has_trends_table, load_top_trends
+
+DEFAULT_EXPORT_DIR = "exports"
+DEFAULT_EXPORT_TOP = 50
+KEEP_VERSIONS = 5  # câte seturi vechi rămân pe disc pentru clienții cu manifest vechi
+MANIFEST = "manifest.json"
+
+
+def add_export_args(parser, stage: bool = True):
+    """Adaugă `--export-dir`, `--export-top`, `--parquet` (și `--no-export` pentru scripturile de trenduri)."""
+    parser.add_argument(
+        "--export-dir",
+        default=None,
+        help=f"Where dashboard snapshots are written (default env STYLX_EXPORT_DIR or '{DEFAULT_EXPORT_DIR}')",
+    )
+    parser.add_argument(
+        "--export-top", type=int, default=DEFAULT_EXPORT_TOP, help=f"Trends in the snapshot (default: {DEFAULT_EXPORT_TOP})"
+    )
+    parser.add_argument("--parquet", action="store_true", help="Also write columnar Parquet files (requires pyarrow)")
+    if stage:
+        parser.add_argument("--no-export", action="store_true", help="Skip the dashboard export stage")
+
+
+def load_daily_series(conn: sqlite3.Connection, trend_names: List[str]) -> Dict[str, Dict[str, list]]:
+    """
+    Serie zilnică per trend din `trend_videos`: {"dates": [...], "videos": [...], "views": [...]}.
+    Coloane paralele, direct utilizabile ca `categories` / `series[].data` în ApexCharts.
+    """
+    series = {name: {"dates": [], "videos": [], "views": []} for name in trend_names}
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='trend_videos'"
+    ).fetchone()
+    if not exists or not trend_names:
+        return series
+    placeholders = ",".join("?" * len(trend_names))
+    rows = conn.execute(
+        f"""
+        SELECT trend_name, substr(publish_date, 1, 10) AS day, COUNT(*), COALESCE(SUM(view_count), 0)
+        FROM trend_videos
+        WHERE trend_name IN ({placeholders}) AND publish_date IS NOT NULL
+        GROUP BY trend_name, day
+        ORDER BY trend_name, day
+        """,
+        trend_names,
+    )
+    for name, day, videos, views in rows:
+        s = series[name]
+        s["dates"].append(day)
+        s["videos"].append(videos)
+        s["views"].append(views)
+    return series
+
+
+def build_snapshot(conn: sqlite3.Connection, top: int) -> Optional[Dict]:
+    """
+    Top N trenduri + serii zilnice; None dacă nu există încă tabelul `trends`.
+    `detected_at` merge doar în manifest, ca payload-ul (și hash-ul) să nu se schimbe între
+    rulări cu aceleași rezultate.
+    """
+    if not has_trends_table(conn):
+        return None
+    trends = load_top_trends(conn, top)
+    series = load_daily_series(conn, [t["name"] for t in trends])
+    detected_at = max((t["detected_at"] for t in trends if t["detected_at"]), default=None)
+    for trend in trends:
+        trend.pop("detected_at", None)
+        trend["series"] = series[trend["name"]]
+    return {"detected_at": detected_at, "payload": {"trends": trends}}
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_parquet(payload: Dict, out_dir: str, digest: str) -> Dict[str, str]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("--parquet requires pyarrow (pip install pyarrow)")
+
+    trends = payload["trends"]
+    columns = ["name", "score", "num_videos", "total_views", "avg_views", "first_seen_at", "last_seen_at"]
+    trends_table = pa.table({col: [t[col] for t in trends] for col in columns})
+    long_rows = [
+        (t["name"], day, videos, views)
+        for t in trends
+        for day, videos, views in zip(t["series"]["dates"], t["series"]["videos"], t["series"]["views"])
+    ]
+    series_table = pa.table({
+        "trend": [r[0] for r in long_rows],
+        "date": [r[1] for r in long_rows],
+        "videos": [r[2] for r in long_rows],
+        "views": [r[3] for r in long_rows],
+    })
+
+    files = {"trends_parquet": f"trends.{digest}.parquet", "series_parquet": f"series.{digest}.parquet"}
+    for table, name in ((trends_table, files["trends_parquet"]), (series_table, files["series_parquet"])):
+        tmp = os.path.join(out_dir, name + ".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, os.path.join(out_dir, name))
+    return files
+
+
+def _prune(out_dir: str, keep: List[str]):
+    """Șterge seturile vechi, păstrând ultimele KEEP_VERSIONS hash-uri (după mtime)."""
+    paths = [
+        p for pattern in ("trends.*.json.gz", "trends.*.parquet", "series.*.parquet")
+        for p in glob.glob(os.path.join(out_dir, pattern))
+    ]
+    by_hash: Dict[str, List[str]] = {}
+    for path in paths:
+        by_hash.setdefault(os.path.basename(path).split(".")[1], []).append(path)
+    ordered = sorted(by_hash, key=lambda h: max(os.path.getmtime(p) for p in by_hash[h]), reverse=True)
+    for digest in ordered[KEEP_VERSIONS:]:
+        for path in by_hash[digest]:
+            if os.path.basename(path) not in keep:
+                os.remove(path)
+
+
+def export_snapshot(
+    db_path: str,
+    out_dir: str = None,
+    top: int = DEFAULT_EXPORT_TOP,
+    parquet: bool = False,
+) -> Optional[Dict]:
+    """Scrie snapshot-ul versionat + manifest.json; întoarce manifestul (None dacă nu sunt trenduri)."""
+    out_dir = out_dir or os.getenv("STYLX_EXPORT_DIR") or DEFAULT_EXPORT_DIR
+    with span("export", top=top) as s:
+        conn = connect_reader(db_path, row_factory=sqlite3.Row)
+        try:
+            conn.execute("BEGIN")  # trends și trend_videos din același snapshot
+            snapshot = build_snapshot(conn, top)
+        finally:
+            conn.close()
+        if snapshot is None:
+            return None
+
+        os.makedirs(out_dir, exist_ok=True)
+        payload = snapshot["payload"]
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = _content_hash(raw)
+        files = {"trends": f"trends.{digest}.json.gz"}
+        if parquet:
+            files.update(_write_parquet(payload, out_dir, digest))
+        json_path = os.path.join(out_dir, files["trends"])
+        if not os.path.exists(json_path):
+            _write_atomic(json_path, gzip.compress(raw, compresslevel=9, mtime=0))
+
+        manifest = {
+            "detected_at": snapshot["detected_at"],
+            "generated_at": datetime.datetime.utcnow().isoformat(),
+            "hash": digest,
+            "trends": len(payload["trends"]),
+            "files": files,
+        }
+        _write_atomic(
+            os.path.join(out_dir, MANIFEST),
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+        _prune(out_dir, keep=list(files.values()))
+        s["bytes"] = os.path.getsize(json_path)
+        s["raw_bytes"] = len(raw)
+    return manifest
+
+
+def export_after_run(db_path: str, args):
+    """Etapa de export apelată de scripturile de trenduri după salvare (dacă nu e --no-export)."""
+    if getattr(args, "no_export", False):
+        return None
+    manifest = export_snapshot(db_path, args.export_dir, args.export_top, args.parquet)
+    if manifest:
+        out_dir = args.export_dir or os.getenv("STYLX_EXPORT_DIR") or DEFAULT_EXPORT_DIR
+        print(f"✓ Exported {manifest['trends']} trends for the dashboard: {os.path.join(out_dir, manifest['files']['trends'])}")
+    return manifest
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Export trend snapshots (gzip JSON / Parquet) for the dashboard")
+    p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
+    add_export_args(p, stage=False)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if export_after_run(args.db, args) is None:
+        print(f"No trends table in {args.db}. Run calculate_trends_simple.py or detect_emerging_trends.py first.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Maparea trend -> videouri care îl menționează, salvată la fiecare rulare de trenduri.
+
+Tabelul `trend_videos` conține doar trendurile salvate în `trends` (aceeași rulare), iar
+indexurile (trend_name, view_count) și (trend_name, publish_date) fac ca "top videouri
+după views / cele mai recente" să fie un range scan, fără re-extragere de keywords.
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+VIDEO_SORTS = {
+    "views": "tv.view_count DESC, tv.publish_date DESC",
+    "recent": "tv.publish_date DESC, tv.view_count DESC",
+}
+
+
+def init_trend_videos_table(conn: sqlite3.Connection):
+    """Creează tabelul trend_videos și indexurile (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS trend_videos (
+            trend_name TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            view_count INTEGER,
+            publish_date TEXT,
+            PRIMARY KEY (trend_name, video_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_trend_videos_views ON trend_videos(trend_name, view_count DESC);
+        CREATE INDEX IF NOT EXISTS idx_trend_videos_recent ON trend_videos(trend_name, publish_date DESC);
+        """
+    )
+
+
+def replace_trend_videos(conn: sqlite3.Connection, mapping: Dict[str, Iterable[Tuple[str, int, str]]]):
+    """
+    Înlocuiește maparea cu cea din rularea curentă. `mapping`: trend -> [(video_id, view_count, publish_date)].
+    Nu face commit; se scrie în aceeași tranzacție cu tabelul `trends`.
+    """
+    conn.execute("DELETE FROM trend_videos")
+    conn.executemany(
+        "INSERT OR REPLACE INTO trend_videos (trend_name, video_id, view_count, publish_date) VALUES (?, ?, ?, ?)",
+        (
+            (trend_name, video_id, view_count, publish_date)
+            for trend_name, videos in mapping.items()
+            for video_id, view_count, publish_date in videos
+        ),
+    )
+
+
+def load_trend_videos(conn: sqlite3.Connection, trend_name: str, limit: int = 10, sort: str = "views") -> List[Dict]:
+    """Top videouri pentru un trend, după views sau recență. [] dacă maparea nu există încă."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='trend_videos'"
+    ).fetchone()
+    if not exists:
+        return []
+    rows = conn.execute(
+        f"""
+        SELECT tv.video_id, v.title, v.channel, v.url, tv.view_count, tv.publish_date
+        FROM trend_videos tv
+        LEFT JOIN videos v ON v.video_id = tv.video_id
+        WHERE tv.trend_name = ?
+        ORDER BY {VIDEO_SORTS[sort]}
+        LIMIT ?
+        """,
+        (trend_name.lower(), limit),
+    )
+    columns = ["video_id", "title", "channel", "url", "view_count", "publish_date"]
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Arhivă de videouri partiționată pe luna publicării, în fișiere SQLite separate.
+
+Layout:
+  youtube_videos.db                          - `videos` = partiția activă: ultimele `--keep-months`
+                                               luni + orice upsert nou; plus catalogul
+                                               `archive_shards` și indexul `archive_term_index`
+  youtube_videos_shards/videos_2025_03.db    - o partiție per lună, aceeași schemă `videos`; cu
+                                               stocarea compactă (`video_storage`), și
+                                               `video_tags` / `video_descriptions` ale videourilor
+                                               ei (dicționarul `tags` rămâne în DB-ul principal)
+
+`archive` mută lunile vechi din `videos` în partiții și le sigilează: VACUUM, jurnal DELETE
+(fără -wal / -shm lângă fișier) și fișier read-only. Cititorii trec prin `window_rows`, care
+atașează (ATTACH) doar partițiile ce se suprapun cu fereastra de date cerută, câte
+MAX_ATTACHED odată; fără arhivă, e o simplă interogare pe `videos`. Rândurile din partiții
+cu coloanele `tags` / `description` cerute sunt completate din tabelele compacte ale partiției
+cât timp e atașată (`hydrate_videos(..., schema=alias)`).
+
+Scoring-ul pe fereastră (`calculate_trends_simple`) are nevoie și de răspunsul la „a mai
+apărut termenul înainte de fereastră?”. Pentru partițiile vechi, răspunsul e păstrat în
+`archive_term_index` (termen -> prima apariție, NULL = absent), calculat o singură dată per
+partiție și termen, deci rulările următoare nu mai deschid partițiile vechi.
+
+Un video re-descărcat după arhivare ajunge din nou în `videos`; `window_rows` preferă copia
+din partiția activă, iar următorul `archive` îl mută peste cea veche.
+
+Usage:
+  python video_archive.py --db youtube_videos.db archive --keep-months 2
+  python video_archive.py --db youtube_videos.db status
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import stat
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from db_connection import connect_writer
+from instrumentation import incr, span
+from video_storage import hydrate_videos
+
+KEEP_MONTHS = 2
+MAX_ATTACHED = 8  # limita implicită SQLite e 10 baze atașate per conexiune
+LOOKUP_CHUNK = 500
+SIDE_TABLES = ("video_tags", "video_descriptions")  # tabelele compacte per video, mutate odată cu `videos`
+
+
+def init_archive_tables(conn: sqlite3.Connection):
+    """Catalogul partițiilor, indexul de termeni și indexul pe publish_date (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS archive_shards (
+            month TEXT PRIMARY KEY,          -- YYYY-MM
+            path TEXT NOT NULL,              -- relativ la directorul DB-ului principal
+            rows INTEGER NOT NULL DEFAULT 0,
+            sealed INTEGER NOT NULL DEFAULT 0,
+            size_bytes INTEGER,
+            updated_at TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS archive_term_index (
+            month TEXT NOT NULL,
+            term TEXT NOT NULL,
+            first_seen_at TEXT,              -- NULL = termenul nu apare în partiție
+            PRIMARY KEY (month, term)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_videos_publish_date ON videos(publish_date);
+        """
+    )
+
+
+def has_archive(conn: sqlite3.Connection) -> bool:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='archive_shards'"
+    ).fetchone()
+    return bool(exists and conn.execute("SELECT 1 FROM archive_shards LIMIT 1").fetchone())
+
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+def _shift_month(month: str, delta: int) -> str:
+    index = int(month[:4]) * 12 + int(month[5:7]) - 1 + delta
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class VideoArchive:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        main = next(row for row in conn.execute("PRAGMA database_list") if row[1] == "main")
+        self.db_path = Path(main[2])
+
+    @property
+    def shard_dir(self) -> Path:
+        return self.db_path.with_name(self.db_path.stem + "_shards")
+
+    def _path(self, relative: str) -> Path:
+        return self.db_path.parent / relative
+
+    def shards(self) -> List[Dict]:
+        if not has_archive(self.conn):
+            return []
+        rows = self.conn.execute(
+            "SELECT month, path, rows, sealed, size_bytes, updated_at FROM archive_shards ORDER BY month"
+        )
+        return [dict(zip(("month", "path", "rows", "sealed", "size_bytes", "updated_at"), r)) for r in rows]
+
+    # ---------------- citire ----------------
+
+    @contextmanager
+    def attached(self, months: Sequence[str]):
+        """Atașează partițiile lunilor date (maxim MAX_ATTACHED); yield {lună: alias}."""
+        paths = dict(self.conn.execute("SELECT month, path FROM archive_shards"))
+        aliases = {}
+        if self.conn.in_transaction:
+            self.conn.commit()  # ATTACH nu e permis într-o tranzacție deschisă
+        try:
+            for month in months:
+                alias = "shard_" + month.replace("-", "_")
+                self.conn.execute("ATTACH DATABASE ? AS " + alias, (str(self._path(paths[month])),))
+                aliases[month] = alias
+                incr("archive_attach", month=month)
+            yield aliases
+        finally:
+            for alias in aliases.values():
+                self.conn.execute("DETACH DATABASE " + alias)
+
+    def months_between(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        """Lunile arhivate care se suprapun cu [start, end] (prefix de publish_date)."""
+        query = "SELECT month FROM archive_shards WHERE 1=1"
+        params: List[str] = []
+        if start:
+            query += " AND month >= ?"
+            params.append(start[:7])
+        if end:
+            query += " AND month <= ?"
+            params.append(end[:7])
+        return [r[0] for r in self.conn.execute(query + " ORDER BY month", params)]
+
+    def rows(
+        self, columns: Sequence[str], start: Optional[str] = None, end: Optional[str] = None, end_exclusive: bool = False
+    ) -> Iterator[Tuple]:
+        """
+        Rânduri (tupluri în ordinea `columns`, care trebuie să înceapă cu video_id) cu publish_date
+        în [start, end] (sau [start, end) cu `end_exclusive`), din partiția activă și din partițiile
+        care se suprapun cu intervalul. Dubluri video_id: câștigă partiția activă.
+        """
+        if columns[0] != "video_id":
+            raise ValueError("columns must start with video_id")
+        where, params = ["1=1"], []
+        if start:
+            where.append("publish_date >= ?")
+            params.append(start)
+        if end:
+            where.append("publish_date < ?" if end_exclusive else "publish_date <= ?")
+            params.append(end)
+        select = f"SELECT {', '.join(columns)} FROM {{table}} WHERE {' AND '.join(where)}"
+
+        hot_ids = set()
+        for row in self.conn.execute(select.format(table="main.videos"), params):
+            hot_ids.add(row[0])
+            yield tuple(row)
+        hydrate = "tags" in columns or "description" in columns
+        months = self.months_between(start, end)
+        for i in range(0, len(months), MAX_ATTACHED):
+            with self.attached(months[i : i + MAX_ATTACHED]) as aliases:
+                for alias in aliases.values():
+                    rows = (
+                        tuple(row)
+                        for row in self.conn.execute(select.format(table=f"{alias}.videos"), params)
+                        if row[0] not in hot_ids
+                    )
+                    if hydrate and self._has_side_tables(alias):
+                        rows = self._hydrated(rows, columns, alias)
+                    yield from rows
+
+    def _has_side_tables(self, alias: str) -> bool:
+        """Partițiile create înainte de mutarea tabelelor compacte le au încă în main (hidratate de apelant)."""
+        names = {r[0] for r in self.conn.execute(f"SELECT name FROM {alias}.sqlite_master WHERE type = 'table'")}
+        return all(table in names for table in SIDE_TABLES)
+
+    def _hydrated(self, rows: Iterator[Tuple], columns: Sequence[str], alias: str) -> Iterator[Tuple]:
+        """Completează tags / description din tabelele compacte ale partiției atașate, pe loturi."""
+        while True:
+            batch = [dict(zip(columns, row)) for row in islice(rows, LOOKUP_CHUNK)]
+            if not batch:
+                return
+            hydrate_videos(self.conn, batch, with_descriptions="description" in columns, schema=alias)
+            for video in batch:
+                yield tuple(video[column] for column in columns)
+
+    def known_ids(self, video_ids: Iterable[str]) -> set:
+        """ID-urile care există în partițiile arhivate (lookup pe cheia primară)."""
+        ids = list(video_ids)
+        known = set()
+        months = self.months_between(None, None)
+        for i in range(0, len(months), MAX_ATTACHED):
+            with self.attached(months[i : i + MAX_ATTACHED]) as aliases:
+                for alias in aliases.values():
+                    for j in range(0, len(ids), LOOKUP_CHUNK):
+                        batch = ids[j : j + LOOKUP_CHUNK]
+                        placeholders = ",".join("?" * len(batch))
+                        known.update(
+                            r[0]
+                            for r in self.conn.execute(
+                                f"SELECT video_id FROM {alias}.videos WHERE video_id IN ({placeholders})", batch
+                            )
+                        )
+        return known
+
+    def first_seen_before(
+        self,
+        terms: Iterable[str],
+        before: str,
+        columns: Sequence[str],
+        first_seen: Callable[[Iterable[Tuple]], Dict[str, str]],
+        vocabulary: Iterable[str] = (),
+    ) -> Dict[str, str]:
+        """
+        Prima apariție (< `before`) a fiecărui termen, în toată arhiva. `first_seen(rows)` calculează
+        {termen: prima apariție} pentru un set de rânduri (aceeași extragere ca scoring-ul);
+        `vocabulary` = toți termenii pe care îi poate extrage, indexați la prima scanare a unei
+        partiții ca să nu fie redeschisă când un termen din listă apare prima dată în fereastră.
+
+        Partițiile lunilor de dinainte de `before` răspund din `archive_term_index`; sunt deschise
+        doar pentru termenii pe care nu i-au mai văzut, iar rezultatul (și absența) se salvează.
+        Partiția activă și luna lui `before` se citesc direct, doar până la `before`.
+        """
+        terms = set(terms)
+        vocabulary = set(vocabulary) | terms
+        result: Dict[str, str] = {}
+
+        def merge(found: Dict[str, str]):
+            for term, seen in found.items():
+                if term in terms and seen and (term not in result or seen < result[term]):
+                    result[term] = seen
+
+        boundary = before[:7]
+        hot = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM main.videos WHERE publish_date < ?", (before,)
+        )
+        merge(first_seen(hot))
+        if not has_archive(self.conn):
+            return result
+
+        for month in self.months_between(None, boundary):
+            if month == boundary:
+                with self.attached([month]) as aliases:
+                    rows = self.conn.execute(
+                        f"SELECT {', '.join(columns)} FROM {aliases[month]}.videos WHERE publish_date < ?", (before,)
+                    )
+                    merge(first_seen(rows))
+                continue
+            cached = dict(
+                self.conn.execute(
+                    f"SELECT term, first_seen_at FROM archive_term_index WHERE month = ? AND term IN "
+                    f"({','.join('?' * len(terms))})",
+                    [month, *terms],
+                )
+            ) if terms else {}
+            missing = terms - cached.keys()
+            if missing:
+                with self.attached([month]) as aliases:
+                    found = first_seen(self.conn.execute(f"SELECT {', '.join(columns)} FROM {aliases[month]}.videos"))
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO archive_term_index (month, term, first_seen_at) VALUES (?, ?, ?)",
+                        [(month, term, found.get(term)) for term in set(found) | missing | vocabulary],
+                    )
+                cached.update({term: found.get(term) for term in missing})
+                incr("archive_term_index_builds", month=month)
+            merge({term: seen for term, seen in cached.items() if seen})
+        return result
+
+    # ---------------- scriere ----------------
+
+    def _side_tables(self) -> List[str]:
+        """Tabelele compacte prezente în DB-ul principal (niciuna în formatul clasic JSON)."""
+        names = {r[0] for r in self.conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+        return [table for table in SIDE_TABLES if table in names]
+
+    def _shard_schema(self) -> List[str]:
+        schema = []
+        for name in ("videos", *self._side_tables()):
+            table = self.conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type='table' AND name = ?", (name,)
+            ).fetchone()[0]
+            schema.append(table.replace(f"CREATE TABLE {name}", f"CREATE TABLE IF NOT EXISTS {name}", 1))
+        schema.append("CREATE INDEX IF NOT EXISTS idx_videos_publish_date ON videos(publish_date)")
+        return schema
+
+    def _open_shard(self, month: str) -> str:
+        """Creează (sau redeschide pentru scriere) partiția lunii; întoarce calea relativă."""
+        row = self.conn.execute("SELECT path, sealed FROM archive_shards WHERE month = ?", (month,)).fetchone()
+        relative = row[0] if row else os.path.relpath(
+            self.shard_dir / f"videos_{month.replace('-', '_')}.db", self.db_path.parent
+        )
+        path = self._path(relative)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if row and row[1]:
+            os.chmod(path, stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH)
+        shard = connect_writer(str(path))
+        for sql in self._shard_schema():
+            shard.execute(sql)
+        shard.commit()
+        shard.close()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO archive_shards (month, path, sealed, updated_at) VALUES (?, ?, 0, ?)
+                ON CONFLICT(month) DO UPDATE SET sealed = 0, updated_at = excluded.updated_at
+                """,
+                (month, relative, datetime.datetime.utcnow().isoformat()),
+            )
+        return relative
+
+    def seal(self, month: str):
+        """Compactează partiția (VACUUM, jurnal DELETE) și o face read-only."""
+        relative = self.conn.execute("SELECT path FROM archive_shards WHERE month = ?", (month,)).fetchone()[0]
+        path = self._path(relative)
+        shard = sqlite3.connect(str(path))
+        rows = shard.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        shard.execute("PRAGMA journal_mode = DELETE")
+        shard.execute("VACUUM")
+        shard.close()
+        os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE archive_shards SET sealed = 1, rows = ?, size_bytes = ?, updated_at = ? WHERE month = ?",
+                (rows, path.stat().st_size, datetime.datetime.utcnow().isoformat(), month),
+            )
+
+    def archive(self, keep_months: int = KEEP_MONTHS, now: Optional[datetime.datetime] = None) -> Dict:
+        """
+        Mută din `videos` lunile mai vechi decât ultimele `keep_months` (relativ la `now`) în
+        partiții, împreună cu rândurile lor din `video_tags` / `video_descriptions`, și sigilează
+        partițiile atinse. Rândurile fără publish_date rămân în `videos`.
+        """
+        if keep_months < 2:
+            raise ValueError("keep_months must be >= 2 (trend windows and trend_videos read the active partition)")
+        init_archive_tables(self.conn)
+        now = now or datetime.datetime.utcnow()
+        cutoff = _shift_month(now.strftime("%Y-%m"), -(keep_months - 1))
+        months = [
+            r[0]
+            for r in self.conn.execute(
+                "SELECT DISTINCT substr(publish_date, 1, 7) FROM videos WHERE publish_date < ? AND publish_date >= '0000'",
+                (cutoff,),
+            )
+        ]
+        side_tables = self._side_tables()
+        month_ids = "SELECT video_id FROM main.videos WHERE publish_date >= ? AND publish_date < ?"
+        moved = 0
+        with span("archive.move", months=len(months)) as s:
+            for month in sorted(months):
+                relative = self._open_shard(month)
+                bounds = (month, _next_month(month))
+                with self.attached([month]) as aliases:
+                    alias = aliases[month]
+                    # Întâi copia în partiție, apoi ștergerea din `videos`: un crash între ele lasă
+                    # doar un duplicat, pe care cititorii îl ignoră și următorul archive îl curăță
+                    with self.conn:
+                        self.conn.execute(
+                            f"INSERT OR REPLACE INTO {alias}.videos SELECT * FROM main.videos "
+                            "WHERE publish_date >= ? AND publish_date < ?",
+                            bounds,
+                        )
+                        for table in side_tables:
+                            # Copia din partiție a unui video re-descărcat e înlocuită complet (tags șterse)
+                            self.conn.execute(f"DELETE FROM {alias}.{table} WHERE video_id IN ({month_ids})", bounds)
+                            self.conn.execute(
+                                f"INSERT INTO {alias}.{table} SELECT * FROM main.{table} WHERE video_id IN ({month_ids})",
+                                bounds,
+                            )
+                    with self.conn:
+                        for table in side_tables:
+                            self.conn.execute(f"DELETE FROM main.{table} WHERE video_id IN ({month_ids})", bounds)
+                        count = self.conn.execute(
+                            "DELETE FROM main.videos WHERE publish_date >= ? AND publish_date < ?", bounds
+                        ).rowcount
+                        self.conn.execute("DELETE FROM archive_term_index WHERE month = ?", (month,))
+                moved += count
+                print(f"  {month}: {count:,} videos -> {relative}")
+                self.seal(month)
+            s["rows"] = moved
+        incr("rows_processed", stage="archive.move", value=moved)
+        return {"months": len(months), "moved": moved, "cutoff": cutoff}
+
+
+def window_rows(
+    conn: sqlite3.Connection,
+    columns: Sequence[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    end_exclusive: bool = False,
+) -> Iterator[Tuple]:
+    """`VideoArchive.rows` dacă DB-ul are partiții arhivate, altfel aceeași interogare direct pe `videos`."""
+    if has_archive(conn):
+        yield from VideoArchive(conn).rows(columns, start, end, end_exclusive)
+        return
+    where, params = ["1=1"], []
+    if start:
+        where.append("publish_date >= ?")
+        params.append(start)
+    if end:
+        where.append("publish_date < ?" if end_exclusive else "publish_date <= ?")
+        params.append(end)
+    for row in conn.execute(f"SELECT {', '.join(columns)} FROM videos WHERE {' AND '.join(where)}", params):
+        yield tuple(row)
+
+
+def print_status(conn: sqlite3.Connection):
+    archive = VideoArchive(conn)
+    hot = conn.execute("SELECT COUNT(*), MIN(publish_date), MAX(publish_date) FROM videos").fetchone()
+    print(f"Active partition: {hot[0]:,} videos ({hot[1] or '-'} .. {hot[2] or '-'})")
+    shards = archive.shards()
+    if not shards:
+        print("No archived shards.")
+        return
+    total_rows = sum(s["rows"] for s in shards)
+    total_bytes = sum(s["size_bytes"] or 0 for s in shards)
+    print(f"{len(shards)} shards, {total_rows:,} videos, {total_bytes / 1e6:.1f} MB in {archive.shard_dir}")
+    for s in shards:
+        state = "sealed" if s["sealed"] else "open"
+        print(f"  {s['month']}  {s['rows']:>9,} videos  {(s['size_bytes'] or 0) / 1e6:>8.1f} MB  {state}")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Partition the video archive into monthly SQLite shards")
+    p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
+    sub = p.add_subparsers(dest="command", required=True)
+    a = sub.add_parser("archive", help="Move old months out of `videos` into sealed monthly shards")
+    a.add_argument(
+        "--keep-months", type=int, default=KEEP_MONTHS, help=f"Months kept in the active partition (default: {KEEP_MONTHS})"
+    )
+    sub.add_parser("status", help="Show the active partition and the archived shards")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    conn = connect_writer(args.db)
+    try:
+        if args.command == "archive":
+            result = VideoArchive(conn).archive(args.keep_months)
+            print(f"✓ Archived {result['moved']:,} videos from {result['months']} months (before {result['cutoff']})")
+        print_status(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Stocare compactă pentru `videos`: tags normalizate într-un dicționar + tabel de legătură,
+descrieri comprimate zlib într-un tabel separat.
+
+Schema compactă:
+  tags(tag_id, name)                         - fiecare tag o singură dată
+  video_tags(video_id, tag_id, position)     - ordinea originală a tag-urilor păstrată
+  video_descriptions(video_id, description)  - BLOB zlib (opțional)
+  storage_settings(key, value)               - ce mod e activ pe DB
+
+După migrare, `videos.tags` / `videos.description` rămân NULL pentru rândurile compacte;
+cititorii folosesc `hydrate_videos` care acceptă și rânduri vechi (JSON) și rânduri compacte.
+
+Usage (migrare DB existent):
+  python video_storage.py --db youtube_videos.db
+  python video_storage.py --db youtube_videos.db --compress-descriptions
+"""
+import argparse
+import json
+import os
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from db_connection import connect_writer
+
+ZLIB_LEVEL = 6
+
+
+def init_compact_schema(conn: sqlite3.Connection):
+    """Creează tabelele compacte (idempotent)."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS storage_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tags (
+            tag_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS video_tags (
+            video_id TEXT NOT NULL,
+            tag_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (video_id, tag_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_video_tags_tag ON video_tags(tag_id, video_id);
+        CREATE TABLE IF NOT EXISTS video_descriptions (
+            video_id TEXT PRIMARY KEY,
+            description BLOB
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _settings(conn: sqlite3.Connection) -> Dict[str, str]:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='storage_settings'"
+    ).fetchone()
+    if not exists:
+        return {}
+    return dict(conn.execute("SELECT key, value FROM storage_settings").fetchall())
+
+
+def compress_description(text: Optional[str]) -> Optional[bytes]:
+    if text is None:
+        return None
+    if not text:
+        return b""
+    return zlib.compress(text.encode("utf-8"), ZLIB_LEVEL)
+
+
+def decompress_description(blob: Optional[bytes]) -> Optional[str]:
+    if blob is None:
+        return None
+    if not blob:
+        return ""
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class CompactStorage:
+    """Scrie tags / descrieri în formatul compact; cache-uiește id-urile de tag în proces."""
+
+    def __init__(self, conn: sqlite3.Connection, compress_descriptions: bool = False):
+        self.conn = conn
+        self.compress_descriptions = compress_descriptions
+        self._tag_ids: Dict[str, int] = {}
+
+    def tag_ids(self, names: Iterable[str]) -> List[int]:
+        ids = []
+        for name in names:
+            tag_id = self._tag_ids.get(name)
+            if tag_id is None:
+                self.conn.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (name,))
+                tag_id = self.conn.execute("SELECT tag_id FROM tags WHERE name = ?", (name,)).fetchone()[0]
+                self._tag_ids[name] = tag_id
+            ids.append(tag_id)
+        return ids
+
+    def write_tags(self, video_id: str, tags: Optional[List[str]]):
+        # Deduplicare păstrând prima apariție (PRIMARY KEY video_id, tag_id)
+        names = list(dict.fromkeys(t.strip() for t in (tags or []) if t and t.strip()))
+        self.conn.execute("DELETE FROM video_tags WHERE video_id = ?", (video_id,))
+        self.conn.executemany(
+            "INSERT INTO video_tags (video_id, tag_id, position) VALUES (?, ?, ?)",
+            [(video_id, tag_id, pos) for pos, tag_id in enumerate(self.tag_ids(names))],
+        )
+
+    def write_description(self, video_id: str, text: Optional[str]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO video_descriptions (video_id, description) VALUES (?, ?)",
+            (video_id, compress_description(text)),
+        )
+
+
+def open_storage(conn: sqlite3.Connection) -> Optional[CompactStorage]:
+    """CompactStorage dacă DB-ul a fost migrat, altfel None (format clasic JSON)."""
+    settings = _settings(conn)
+    if settings.get("tags") != "normalized":
+        return None
+    return CompactStorage(conn, compress_descriptions=settings.get("descriptions") == "zlib")
+
+
+def load_tags(conn: sqlite3.Connection, video_ids: List[str], schema: str = "main") -> Dict[str, List[str]]:
+    """
+    Tags pentru fiecare video (ordinea originală), din tabelele normalizate. `schema` = baza
+    în care e `video_tags` (ex. o partiție atașată de `video_archive`); dicționarul `tags` e în main.
+    """
+    result: Dict[str, List[str]] = {vid: [] for vid in video_ids}
+    for i in range(0, len(video_ids), 500):
+        chunk = video_ids[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"""
+            SELECT vt.video_id, t.name
+            FROM {schema}.video_tags vt JOIN main.tags t ON t.tag_id = vt.tag_id
+            WHERE vt.video_id IN ({placeholders})
+            ORDER BY vt.video_id, vt.position
+            """,
+            chunk,
+        )
+        for video_id, name in rows:
+            result[video_id].append(name)
+    return result
+
+
+def load_descriptions(conn: sqlite3.Connection, video_ids: List[str], schema: str = "main") -> Dict[str, Optional[str]]:
+    result: Dict[str, Optional[str]] = {}
+    for i in range(0, len(video_ids), 500):
+        chunk = video_ids[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT video_id, description FROM {schema}.video_descriptions WHERE video_id IN ({placeholders})", chunk
+        )
+        for video_id, blob in rows:
+            result[video_id] = decompress_description(blob)
+    return result
+
+
+def hydrate_videos(
+    conn: sqlite3.Connection, videos: List[Dict], with_descriptions: bool = True, schema: str = "main"
+) -> List[Dict]:
+    """
+    Completează `tags` (listă) și `description` pentru rânduri citite din `videos`,
+    indiferent dacă sunt în formatul clasic (JSON) sau compact. Cu `with_descriptions=False`
+    se completează doar tags (fără decomprimarea descrierilor). `schema` = baza din care
+    au fost citite rândurile (partițiile arhivate își au propriile `video_tags` / `video_descriptions`).
+    Rândurile deja completate sunt lăsate neschimbate.
+    """
+    settings = _settings(conn)
+    compact_ids = [v["video_id"] for v in videos if v.get("tags") is None]
+    tags = load_tags(conn, compact_ids, schema) if compact_ids and settings.get("tags") == "normalized" else {}
+    missing_desc = [v["video_id"] for v in videos if with_descriptions and v.get("description") is None]
+    descriptions = (
+        load_descriptions(conn, missing_desc, schema)
+        if missing_desc and settings.get("descriptions") == "zlib"
+        else {}
+    )
+
+    for v in videos:
+        raw = v.get("tags")
+        if raw is None:
+            v["tags"] = tags.get(v["video_id"], [])
+        elif isinstance(raw, str):
+            try:
+                v["tags"] = json.loads(raw)
+            except ValueError:
+                v["tags"] = []
+        if v.get("description") is None and v["video_id"] in descriptions:
+            v["description"] = descriptions[v["video_id"]]
+    return videos
+
+
+def videos_with_tag(conn: sqlite3.Connection, tag: str) -> List[str]:
+    """Lookup indexat: id-urile videourilor care au tag-ul exact."""
+    rows = conn.execute(
+        "SELECT vt.video_id FROM tags t JOIN video_tags vt ON vt.tag_id = t.tag_id WHERE t.name = ?",
+        (tag,),
+    )
+    return [r[0] for r in rows]
+
+
+def migrate(db_path: str, compress_descriptions: bool = False, vacuum: bool = True, batch_size: int = 10000):
+    """Convertește un DB existent la formatul compact (reluabil: procesează doar rândurile rămase)."""
+    conn = connect_writer(db_path)
+    init_compact_schema(conn)
+    conn.execute("INSERT OR REPLACE INTO storage_settings (key, value) VALUES ('tags', 'normalized')")
+    if compress_descriptions:
+        conn.execute("INSERT OR REPLACE INTO storage_settings (key, value) VALUES ('descriptions', 'zlib')")
+    conn.commit()
+
+    storage = CompactStorage(conn, compress_descriptions=compress_descriptions)
+    desc_filter = " OR description IS NOT NULL" if compress_descriptions else ""
+    migrated = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT video_id, tags, description FROM videos WHERE tags IS NOT NULL{desc_filter} LIMIT ?",
+            (batch_size,),
+        ).fetchall()
+        if not rows:
+            break
+        for video_id, tags_json, description in rows:
+            if tags_json is not None:
+                try:
+                    tags = json.loads(tags_json)
+                except ValueError:
+                    tags = []
+                storage.write_tags(video_id, tags)
+            if compress_descriptions and description is not None:
+                storage.write_description(video_id, description)
+        conn.executemany(
+            "UPDATE videos SET tags = NULL" + (", description = NULL" if compress_descriptions else "")
+            + " WHERE video_id = ?",
+            [(r[0],) for r in rows],
+        )
+        conn.commit()
+        migrated += len(rows)
+        print(f"  migrated {migrated:,} videos...")
+
+    if vacuum:
+        # VACUUM nu poate rula în WAL fără checkpoint; eliberează paginile rămase goale
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    conn.close()
+    return migrated
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Migrate a videos DB to normalized tags / compressed descriptions")
+    p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
+    p.add_argument("--compress-descriptions", action="store_true", help="Move descriptions to a zlib side table")
+    p.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after migrating")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    before = os.path.getsize(args.db)
+    migrated = migrate(args.db, compress_descriptions=args.compress_descriptions, vacuum=not args.no_vacuum)
+    after = os.path.getsize(args.db)
+    print(f"✓ Migrated {migrated:,} videos in {args.db}")
+    print(f"  Size: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,18 @@ Usage:
     python view_trends.py --db youtube_videos.db
     python view_trends.py --db youtube_videos.db --top 10
     python view_trends.py --db youtube_videos.db --json
+    python view_trends.py --db youtube_videos.db --trend "old money" --videos 5 --sort recent
 
 Implicit, rezultatele sunt afișate în format Markdown ușor de citit.
 """
 import sqlite3
 import argparse
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from db_connection import connect_reader
+from profiling import add_profile_args, profiled
+from trend_store import VIDEO_SORTS, load_trend_videos
 
 def _format_trends_as_markdown(trends: List[Dict], top: int) -> str:
     """Generează un tabel Markdown cu trendurile detectate."""
@@ -52,22 +57,45 @@ def _format_trend_details_as_markdown(trend: Dict) -> str:
 
     return "\n".join(lines)
 
-def view_trends(db_path: str, top: int = 20, output_format: str = "markdown"):
-    """Afișează trendurile emergente din baza de date."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    
-    # Verifică dacă există tabelul trends
-    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='trends'")
-    if not cur.fetchone():
-        print(f"ERROR: Table 'trends' not found in {db_path}")
-        print("Run detect_emerging_trends.py first to detect trends.")
-        conn.close()
-        return
-    
-    # Citește trenduri sortate după score
-    cur.execute(
+def _format_trend_videos_as_markdown(videos: List[Dict], sort: str) -> str:
+    """Tabel Markdown cu videourile care contribuie la un trend."""
+    label = "most viewed" if sort == "views" else "most recent"
+    lines = [
+        f"### 🎬 Top {len(videos)} contributing videos ({label})\n",
+        "| Video | Channel | Views | Published |",
+        "| --- | --- | ---: | --- |",
+    ]
+    for video in videos:
+        title = (video["title"] or video["video_id"]).replace("|", "\\|")
+        url = video["url"] or f"https://www.youtube.com/watch?v={video['video_id']}"
+        lines.append(
+            f"| [{title}]({url}) | {video['channel'] or ''} | {video['view_count'] or 0:,} "
+            f"| {(video['publish_date'] or '')[:10]} |"
+        )
+    return "\n".join(lines) + "\n"
+
+def _open_reader(db_path: str):
+    """Conexiune read-only; None (cu mesaj) dacă baza nu există."""
+    try:
+        return connect_reader(db_path, row_factory=sqlite3.Row)
+    except sqlite3.OperationalError as e:
+        print(f"ERROR: Cannot open database {db_path}: {e}")
+        return None
+
+def has_trends_table(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='trends'").fetchone()
+    return row is not None
+
+def trends_version(conn: sqlite3.Connection) -> Optional[str]:
+    """Identifică rularea curentă de trenduri (detected_at + număr rânduri); None dacă nu există."""
+    if not has_trends_table(conn):
+        return None
+    detected_at, count = conn.execute("SELECT MAX(detected_at), COUNT(*) FROM trends").fetchone()
+    return f"{detected_at}|{count}"
+
+def load_top_trends(conn: sqlite3.Connection, top: int) -> List[Dict]:
+    """Trendurile sortate după score (tabelul `trends` trebuie să existe)."""
+    rows = conn.execute(
         """
         SELECT name, score, num_videos, total_views, avg_views, 
                first_seen_at, last_seen_at, detected_at
@@ -77,8 +105,27 @@ def view_trends(db_path: str, top: int = 20, output_format: str = "markdown"):
         """,
         (top,),
     )
+    return [dict(row) for row in rows]
+
+def load_trend(conn: sqlite3.Connection, trend_name: str) -> Optional[Dict]:
+    row = conn.execute("SELECT * FROM trends WHERE name = ?", (trend_name.lower(),)).fetchone()
+    return dict(row) if row else None
+
+def view_trends(db_path: str, top: int = 20, output_format: str = "markdown"):
+    """Afișează trendurile emergente din baza de date."""
+    conn = _open_reader(db_path)
+    if conn is None:
+        return
+    
+    # Verifică dacă există tabelul trends
+    if not has_trends_table(conn):
+        print(f"ERROR: Table 'trends' not found in {db_path}")
+        print("Run detect_emerging_trends.py first to detect trends.")
+        conn.close()
+        return
     
-    trends = [dict(row) for row in cur.fetchall()]
+    # Citește trenduri sortate după score
+    trends = load_top_trends(conn, top)
     conn.close()
     
     if not trends:
@@ -93,43 +140,59 @@ def view_trends(db_path: str, top: int = 20, output_format: str = "markdown"):
     markdown_output = _format_trends_as_markdown(trends, top)
     print(markdown_output)
 
-def view_trend_details(db_path: str, trend_name: str):
+def view_trend_details(
+    db_path: str,
+    trend_name: str,
+    num_videos: int = 10,
+    sort: str = "views",
+    output_format: str = "markdown",
+):
     """Afișează detalii despre un trend specific (videouri care îl menționează)."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    conn = _open_reader(db_path)
+    if conn is None:
+        return
     
     # Verifică dacă trendul există
-    cur.execute("SELECT * FROM trends WHERE name = ?", (trend_name.lower(),))
-    trend = cur.fetchone()
+    trend = load_trend(conn, trend_name) if has_trends_table(conn) else None
     
     if not trend:
         print(f"Trend '{trend_name}' not found in database.")
         conn.close()
         return
     
-    trend = dict(trend)
-    
-    print(_format_trend_details_as_markdown(trend))
-
+    videos = load_trend_videos(conn, trend_name, limit=num_videos, sort=sort) if num_videos > 0 else []
     conn.close()
 
+    if output_format == "json":
+        print(json.dumps(dict(trend, videos=videos), indent=2, ensure_ascii=False))
+        return
+
+    print(_format_trend_details_as_markdown(trend))
+    if videos:
+        print(_format_trend_videos_as_markdown(videos, sort))
+    elif num_videos > 0:
+        print("No video mapping for this trend yet. Re-run the trend detection to build it.")
+
 def parse_args():
     p = argparse.ArgumentParser(description="View emerging fashion trends from database")
     p.add_argument("--db", default="youtube_videos.db", help="SQLite database path")
     p.add_argument("--top", type=int, default=20, help="Number of top trends to display (default: 20)")
     p.add_argument("--json", action="store_true", help="Output as JSON instead of table")
     p.add_argument("--trend", help="Show details for specific trend name")
+    p.add_argument("--videos", type=int, default=10, help="Top contributing videos shown with --trend (default: 10)")
+    p.add_argument("--sort", choices=sorted(VIDEO_SORTS), default="views", help="Order contributing videos by views or recency")
+    add_profile_args(p)
     return p.parse_args()
 
 def main():
     args = parse_args()
     
-    if args.trend:
-        view_trend_details(args.db, args.trend)
-    else:
+    with profiled("view_trends", args.profile, args.profile_dir):
         output_format = "json" if args.json else "markdown"
-        view_trends(args.db, args.top, output_format)
+        if args.trend:
+            view_trend_details(args.db, args.trend, args.videos, args.sort, output_format)
+        else:
+            view_trends(args.db, args.top, output_format)
 
 if __name__ == "__main__":
     main()
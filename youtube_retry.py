@@ -0,0 +1,40 @@
+"""
+Retry pentru cererile googleapiclient către YouTube Data API (search, videos, channels,
+playlistItems), cu aceeași politică ca `gemini_client`: 429 / 5xx se reîncearcă,
+Retry-After are prioritate față de backoff-ul exponențial.
+
+`HttpRequest.execute()` nu reîncearcă implicit (`num_retries=0`), iar `num_retries` din
+googleapiclient ignoră Retry-After, deci un 503 trecător oprea un query sau tot lotul de
+detalii.
+
+    resp = execute_with_retry(youtube.search().list(...), endpoint="search")
+
+Configurare (env): STYLX_YOUTUBE_RETRIES (default 3).
+"""
+import os
+import time
+
+import googleapiclient.errors
+
+from instrumentation import incr
+
+YOUTUBE_RETRIES = int(os.getenv("STYLX_YOUTUBE_RETRIES", "3"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_SECONDS = 1.0
+MAX_DELAY_SECONDS = 60.0
+
+
+def execute_with_retry(request, endpoint: str, retries: int = YOUTUBE_RETRIES):
+    """`request.execute()` cu până la `retries` reîncercări; ultima eroare HttpError e propagată."""
+    for attempt in range(retries + 1):
+        try:
+            return request.execute()
+        except googleapiclient.errors.HttpError as e:
+            status = getattr(e.resp, "status", None)
+            if status not in RETRY_STATUSES or attempt == retries:
+                raise
+            retry_after = str(e.resp.get("retry-after", "")) if hasattr(e.resp, "get") else ""
+            delay = float(retry_after) if retry_after.isdigit() else BACKOFF_SECONDS * (2 ** attempt)
+            incr("api_retries", api="youtube", endpoint=endpoint, status=status)
+            time.sleep(min(delay, MAX_DELAY_SECONDS))
+    raise AssertionError("unreachable")
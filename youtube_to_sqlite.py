@@ -4,20 +4,34 @@
 Usage examples:
   python3 youtube_to_sqlite.py --queries "fashion haul" "streetwear 2025" --max 50
   python3 youtube_to_sqlite.py --queries-file queries.txt --db ./data/videos.db
+  python3 youtube_to_sqlite.py --channels UCxxxxxxxxxxxxxxxxxxxxxx @somefashionchannel --max 200
 
-The script reads `YOUTUBE_API_KEY` from the environment or a .env file.
+The script reads `YOUTUBE_API_KEY` from the environment or a .env file. Set
+`YOUTUBE_API_ROOT` (e.g. http://127.0.0.1:8765 for http_standin.py) to send API
+calls to another server.
 """
 import os
 import sqlite3
 import argparse
 import datetime
 import json
-from typing import List
+import math
+from typing import Callable, List, Optional
 
 from dotenv import load_dotenv, find_dotenv
 import googleapiclient.discovery
 import googleapiclient.errors
 
+from channel_crawler import ChannelCrawler
+from crawl_checkpoints import CrawlCheckpoints
+from crawl_planner import VIDEOS_BATCH, CrawlPlan
+from db_connection import connect_writer
+from instrumentation import incr, log_summary, span
+from profiling import add_profile_args, profiled
+from query_scheduler import QueryScheduler
+from video_storage import CompactStorage, open_storage
+from youtube_retry import execute_with_retry
+
 # load .env if present
 load_dotenv(find_dotenv())
 
@@ -26,8 +40,15 @@ if not API_KEY:
     raise SystemExit("ERROR: set YOUTUBE_API_KEY environment variable (or add to .env)")
 
 
+def build_youtube():
+    """YouTube Data API client; `YOUTUBE_API_ROOT` points it at another server (record/replay stand-in)."""
+    root = os.environ.get("YOUTUBE_API_ROOT")
+    options = {"api_endpoint": root.rstrip("/") + "/"} if root else None
+    return googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY, client_options=options)
+
+
 def init_db(db_path: str):
-    conn = sqlite3.connect(db_path)
+    conn = connect_writer(db_path)
     cur = conn.cursor()
     cur.execute(
         """
@@ -49,7 +70,15 @@ def init_db(db_path: str):
     return conn
 
 
-def upsert_video(conn: sqlite3.Connection, v: dict):
+def upsert_video(conn: sqlite3.Connection, v: dict, storage: Optional[CompactStorage] = None):
+    """Insert or update one video. With `storage` (a migrated DB) tags/description go to the compact tables."""
+    tags_json = json.dumps(v.get("tags") or [])
+    description = v.get("description")
+    if storage is not None:
+        tags_json = None
+        if storage.compress_descriptions:
+            description = None
+
     cur = conn.cursor()
     cur.execute(
         """
@@ -69,21 +98,28 @@ def upsert_video(conn: sqlite3.Connection, v: dict):
         (
             v.get("video_id"),
             v.get("title"),
-            v.get("description"),
+            description,
             v.get("channel"),
             v.get("url"),
             v.get("published_at"),
             v.get("view_count") or 0,
             v.get("like_count") or 0,
-            json.dumps(v.get("tags") or []),
+            tags_json,
             datetime.datetime.utcnow().isoformat(),
         ),
     )
+    if storage is not None:
+        storage.write_tags(v.get("video_id"), v.get("tags"))
+        if storage.compress_descriptions:
+            storage.write_description(v.get("video_id"), v.get("description"))
     conn.commit()
 
 
-def fetch_video_details(youtube, video_ids: List[str]) -> List[dict]:
-    """Return list of video detail dicts for the given ids (uses part=snippet,statistics)."""
+def fetch_video_details(youtube, video_ids: List[str], raise_errors: bool = False) -> List[dict]:
+    """
+    Return list of video detail dicts for the given ids (uses part=snippet,statistics).
+    API errors are printed and the batch skipped, unless `raise_errors` is set.
+    """
     results = []
     if not video_ids:
         return results
@@ -92,12 +128,15 @@ def fetch_video_details(youtube, video_ids: List[str]) -> List[dict]:
     for i in range(0, len(video_ids), 50):
         batch = video_ids[i : i + 50]
         try:
-            resp = (
-                youtube.videos()
-                .list(part="snippet,statistics", id=",".join(batch))
-                .execute()
-            )
+            with span("ingest.videos_api", ids=len(batch)):
+                incr("api_calls", api="youtube", endpoint="videos")
+                resp = execute_with_retry(
+                    youtube.videos().list(part="snippet,statistics", id=",".join(batch)), endpoint="videos"
+                )
         except googleapiclient.errors.HttpError as e:
+            incr("api_errors", api="youtube", endpoint="videos")
+            if raise_errors:
+                raise
             print(f"Videos API error: {e}")
             continue
 
@@ -123,11 +162,26 @@ def fetch_video_details(youtube, video_ids: List[str]) -> List[dict]:
     return results
 
 
-def search_query(youtube, query: str, max_results: int = 20, region: str = None, relevance_language: str = None) -> List[str]:
-    """Search and return list of video IDs for a query (up to max_results)."""
-    video_ids = []
-    next_page_token = None
-    fetched = 0
+def search_query(
+    youtube,
+    query: str,
+    max_results: int = 20,
+    region: str = None,
+    relevance_language: str = None,
+    page_token: str = None,
+    video_ids: List[str] = None,
+    on_page: Callable[[List[str], Optional[str], bool], None] = None,
+) -> List[str]:
+    """
+    Search and return list of video IDs for a query (up to max_results).
+
+    To resume an interrupted search pass the saved `page_token` and the `video_ids`
+    collected so far. `on_page(video_ids, next_page_token, done)` is called after every
+    page that was fetched successfully (used for crawl checkpoints).
+    """
+    video_ids = list(video_ids or [])
+    next_page_token = page_token
+    fetched = len(video_ids)
     while fetched < max_results:
         try:
             req = youtube.search().list(
@@ -143,8 +197,11 @@ def search_query(youtube, query: str, max_results: int = 20, region: str = None,
             if next_page_token:
                 req.pageToken = next_page_token
 
-            resp = req.execute()
+            with span("ingest.search_api", query=query):
+                incr("api_calls", api="youtube", endpoint="search")
+                resp = execute_with_retry(req, endpoint="search")
         except googleapiclient.errors.HttpError as e:
+            incr("api_errors", api="youtube", endpoint="search")
             print(f"Search API error: {e}")
             break
 
@@ -158,56 +215,166 @@ def search_query(youtube, query: str, max_results: int = 20, region: str = None,
                     break
 
         next_page_token = resp.get("nextPageToken")
+        if on_page:
+            on_page(video_ids, next_page_token, not next_page_token or fetched >= max_results)
         if not next_page_token:
             break
 
     return video_ids
 
 
-def run(queries: List[str], channels: List[str], db_path: str, max_per_query: int, region: str = None, lang: str = None):
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+def run(
+    queries: List[str],
+    channels: List[str],
+    db_path: str,
+    max_per_query: int,
+    region: str = None,
+    lang: str = None,
+    refresh_known: bool = False,
+    quota_budget: int = None,
+    resume: bool = False,
+):
+    youtube = build_youtube()
     conn = init_db(db_path)
+    storage = open_storage(conn)
 
     total = 0
-    # Search by query strings
-    for q in queries:
-        print(f"Searching query: {q}")
-        ids = search_query(youtube, q, max_results=max_per_query, region=region, relevance_language=lang)
-        print(f"Found {len(ids)} video ids for query '{q}'")
-        details = fetch_video_details(youtube, ids)
-        for v in details:
-            upsert_video(conn, v)
-            total += 1
-
-    # Search by channel (search endpoint supports channelId filter via 'channelId')
-    for ch in channels:
-        print(f"Searching channel: {ch}")
-        # channel input could be ID or name; we assume ID. For names, user can create queries 'channel:Name' instead.
+    plan = CrawlPlan()
+    scheduler = QueryScheduler(conn)
+    checkpoints = CrawlCheckpoints(conn)
+    if resume and checkpoints.has_crawl():
+        # Continue the saved crawl with its own query list and limits
+        limits = checkpoints.schedule()
+        print(f"Resuming crawl: {len(limits)} queries, {len(checkpoints.pending())} videos pending details")
+    else:
+        if resume:
+            print("No unfinished crawl to resume; starting a new one")
+        elif checkpoints.has_crawl():
+            kept = len(checkpoints.pending())
+            print(f"Discarding unfinished searches (use --resume to continue them); keeping {kept} videos pending details")
+        max_pages = math.ceil(max_per_query / VIDEOS_BATCH)
+        if quota_budget is not None:
+            # Adaptive: split the search quota between queries by their past new-video yield
+            schedule = scheduler.plan(queries, quota_budget, max_pages)
+            print(scheduler.report(schedule))
+        else:
+            schedule = {q: max_pages for q in queries}
+        limits = {q: min(max_per_query, pages * VIDEOS_BATCH) for q, pages in schedule.items() if pages}
+        checkpoints.start(limits)
+
+    with span("ingest.run", db=db_path) as run_span:
+        # 1. Collect IDs from every query and channel before fetching any details, so that
+        #    videos found by several overlapping queries are fetched once. Every search page
+        #    is checkpointed; queries already planned by an interrupted run are skipped.
+        query_ids = {}
+        for q, limit in limits.items():
+            state = checkpoints.get(q)
+            if state["status"] == "planned":
+                continue
+            ids = state["video_ids"]
+            if state["status"] == "searching":
+                print(f"Searching query: {q}" + (f" (resuming at page {state['pages'] + 1})" if state["pages"] else ""))
+                ids = search_query(
+                    youtube,
+                    q,
+                    max_results=limit,
+                    region=region,
+                    relevance_language=lang,
+                    page_token=state["page_token"],
+                    video_ids=ids,
+                    on_page=lambda page_ids, token, done, q=q: checkpoints.save_page(q, page_ids, token, done),
+                )
+            added = plan.add(q, ids)
+            query_ids[q] = ids
+            print(f"Found {len(ids)} video ids for query '{q}' ({added} new in this crawl)")
+
+        # Channels: page through each uploads playlist (1 quota unit per page instead of 100
+        # for search) and stop at the newest video seen on the previous crawl
+        crawler = ChannelCrawler(youtube, conn) if channels else None
+        channel_ids = {}
+        if crawler:
+            for ch, playlist_id in crawler.uploads_playlists(channels).items():
+                print(f"Crawling channel uploads: {ch}")
+                ids = crawler.new_video_ids(ch, max_videos=max_per_query, playlist_id=playlist_id)
+                added = plan.add(ch, ids)
+                print(f"Found {len(ids)} new uploads for channel '{ch}' ({added} new in this crawl)")
+                channel_ids[ch] = ids
+
+        # 2. Skip videos already stored (unless refreshing their stats) and persist the rest
+        #    as pending, together with the yield of every finished query
+        known = plan.find_known(conn)
+        for q, ids in query_ids.items():
+            state = checkpoints.get(q)
+            if state["status"] == "searched":
+                # Yield per query: IDs not in the DB before this crawl (overlaps count for each query)
+                scheduler.record(q, max(1, state["pages"]), len(set(ids) - known))
+        if not refresh_known:
+            plan.skip_known(known)
+        print(plan.report())
+        checkpoints.add_pending(plan.ids)
+
+        # 3. Fetch details in full 50-ID videos.list batches; each batch leaves pending once stored
+        pending = checkpoints.pending()
         try:
-            req = youtube.search().list(part="id", channelId=ch, type="video", maxResults=min(50, max_per_query))
-            resp = req.execute()
+            for i in range(0, len(pending), VIDEOS_BATCH):
+                batch = pending[i : i + VIDEOS_BATCH]
+                details = fetch_video_details(youtube, batch, raise_errors=True)
+                with span("ingest.upsert", rows=len(details)):
+                    for v in details:
+                        upsert_video(conn, v, storage)
+                        total += 1
+                checkpoints.batch_done(batch)
+                incr("rows_processed", stage="ingest", value=len(details))
         except googleapiclient.errors.HttpError as e:
-            print(f"Search API error for channel {ch}: {e}")
-            continue
-        ids = [it.get("id", {}).get("videoId") for it in resp.get("items", []) if it.get("id", {}).get("videoId")]
-        details = fetch_video_details(youtube, ids)
-        for v in details:
-            upsert_video(conn, v)
-            total += 1
+            print(f"Videos API error: {e}")
 
+        # A channel's last-seen marker moves only once none of its uploads is still pending;
+        # otherwise the next crawl walks the same uploads again (crawl_pending keeps the IDs)
+        still_pending = set(checkpoints.pending()) if channel_ids else set()
+        for ch, ids in channel_ids.items():
+            if still_pending.intersection(ids):
+                print(f"Channel '{ch}': uploads still pending details, last-seen marker not advanced")
+                continue
+            crawler.mark_seen(ch)
+
+        stats = plan.stats()
+        incr("quota_saved", value=stats["quota_saved"], api="youtube")
+        run_span["rows"] = total
+        run_span["duplicates"] = stats["duplicates"]
+        run_span["batch_fill"] = round(stats["batch_fill"], 3)
+
+    complete = checkpoints.finish_if_complete()
     conn.close()
     print(f"Stored/updated {total} videos into {db_path}")
+    if not complete:
+        print("Crawl incomplete (API errors or quota). Continue it with --resume.")
+    log_summary("youtube_to_sqlite")
 
 
 def parse_args():
     p = argparse.ArgumentParser(description="Search YouTube and store metadata in a SQLite DB")
     p.add_argument("--queries", "-q", nargs="*", default=[], help="Search queries (space separated)")
     p.add_argument("--queries-file", help="File with one query per line")
-    p.add_argument("--channels", "-c", nargs="*", default=[], help="Channel IDs to fetch videos from")
+    p.add_argument("--channels", "-c", nargs="*", default=[], help="Channel IDs (UC...) or @handles to crawl via their uploads playlist")
     p.add_argument("--db", default="youtube_videos.db", help="SQLite DB path")
-    p.add_argument("--max", type=int, default=20, help="Max videos per query")
+    p.add_argument("--max", type=int, default=20, help="Max videos per query (and per channel on its first crawl)")
     p.add_argument("--region", "-r", default=None, help="Region code (ISO 3166-1 alpha-2)")
     p.add_argument("--lang", "-l", default=None, help="Relevance language (e.g. 'ro')")
+    p.add_argument(
+        "--quota-budget",
+        type=int,
+        default=None,
+        help="Adaptive mode: split this many quota units between queries by their past new-video yield",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last unfinished crawl from its saved page tokens and pending detail batches",
+    )
+    p.add_argument(
+        "--refresh-known", action="store_true", help="Re-fetch videos already in the DB (refreshes view/like counts)"
+    )
+    add_profile_args(p)
     return p.parse_args()
 
 
@@ -221,11 +388,22 @@ def main():
         except Exception as e:
             print(f"Failed to read queries file: {e}")
 
-    if not queries and not args.channels:
+    if not queries and not args.channels and not args.resume:
         print("Nothing to do. Provide --queries or --channels")
         return
 
-    run(queries=queries, channels=args.channels or [], db_path=args.db, max_per_query=args.max, region=args.region, lang=args.lang)
+    with profiled("youtube_to_sqlite", args.profile, args.profile_dir):
+        run(
+            queries=queries,
+            channels=args.channels or [],
+            db_path=args.db,
+            max_per_query=args.max,
+            region=args.region,
+            lang=args.lang,
+            refresh_known=args.refresh_known,
+            quota_budget=args.quota_budget,
+            resume=args.resume,
+        )
 
 
 if __name__ == "__main__":